@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-17 23:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='accounts_us_email_74c8d6_idx',
+        ),
+    ]
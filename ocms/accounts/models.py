@@ -48,6 +48,5 @@ class User(AbstractBaseUser, PermissionsMixin):
     class Meta:
         db_table = 'accounts_user'
         indexes = [
-            models.Index(fields=['email']),
             models.Index(fields=['role']),
         ]
\ No newline at end of file
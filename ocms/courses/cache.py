@@ -0,0 +1,58 @@
+# courses/cache.py
+import hashlib
+import time
+
+from ocms import cache
+
+
+# Public catalog response cache
+#
+# Entries are keyed on the catalog version plus the normalized query string,
+# so a write only has to bump the version: stale pages are never read again
+# and simply age out of the cache. The version and the pages are also held
+# in each worker's L1; bumping the version is broadcast to all of them.
+CATALOG_VERSION_KEY = 'catalog_version'
+CATALOG_CACHE_TIMEOUT = 300
+CATALOG_LOCAL_TIMEOUT = 60
+
+
+def get_catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY, local_timeout=CATALOG_LOCAL_TIMEOUT)
+    if version is None:
+        # Seed from the clock so a lost version key can't resurrect old pages
+        version = int(time.time() * 1000)
+        if not cache.add(CATALOG_VERSION_KEY, version, timeout=None):
+            version = cache.get(CATALOG_VERSION_KEY, version)
+    return version
+
+
+def bump_catalog_version():
+    # A missing key is left alone: the next read seeds a fresh version
+    cache.incr(CATALOG_VERSION_KEY)
+
+
+# Free-text params whose matching ignores case; everything else (cursors,
+# exact-match filters) is passed through as given
+CASE_INSENSITIVE_PARAMS = {'search'}
+
+
+def normalize_query_params(query_params, allowed):
+    """Stable (name, values) tuple for the whitelisted params, empty values dropped"""
+    normalized = []
+    for name in sorted(allowed):
+        values = [v.strip() for v in query_params.getlist(name) if v.strip()]
+        if name in CASE_INSENSITIVE_PARAMS:
+            values = [v.lower() for v in values]
+        if values:
+            normalized.append((name, tuple(sorted(values))))
+    return tuple(normalized)
+
+
+def catalog_cache_key(query_params, allowed, namespace='catalog', origin=''):
+    """
+    `origin` (scheme and validated host) must be passed for bodies holding
+    absolute URLs, e.g. pagination links, so one Host can't serve another's
+    """
+    params = normalize_query_params(query_params, allowed)
+    digest = hashlib.md5(repr((origin, params)).encode()).hexdigest()
+    return f'{namespace}:{get_catalog_version()}:{digest}'
@@ -0,0 +1,95 @@
+# courses/documents.py
+"""
+Pre-rendered course detail documents.
+
+Each published course has one CourseDocument row holding the rendered
+CourseDetailSerializer JSON and its ETag. Writes to a course, its modules
+or lectures, its category or its instructor's profile rebuild just the
+affected courses once per commit (the course_document tag in
+courses/invalidation.py), so the detail endpoint only ever fetches bytes:
+from the L1/Redis cache, else one primary-key row read.
+"""
+import hashlib
+from functools import partial
+
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from ocms import cache
+from .models import Course, CourseDocument
+from .serializers import CourseDetailSerializer
+
+DOCUMENT_CACHE_TIMEOUT = 3600
+DOCUMENT_LOCAL_TIMEOUT = 60
+
+
+def document_cache_key(course_id):
+    return f'course_document_{course_id}'
+
+
+def render_document(course):
+    body = JSONRenderer().render(CourseDetailSerializer(course).data)
+    return body, '"%s"' % hashlib.md5(body).hexdigest()
+
+
+# Never replace a document with one rendered earlier
+_UPSERT_SQL = """
+    INSERT INTO courses_coursedocument (course_id, body, etag, updated_at) VALUES (%s, %s, %s, %s)
+    ON CONFLICT (course_id) DO UPDATE
+    SET body = EXCLUDED.body, etag = EXCLUDED.etag, updated_at = EXCLUDED.updated_at
+    WHERE courses_coursedocument.updated_at <= EXCLUDED.updated_at
+"""
+
+
+@transaction.atomic
+def rebuild_documents(course_ids):
+    """
+    Re-render documents for these courses; drafts and deleted courses lose
+    theirs. Concurrent rebuilds of a course queue on its row lock, so the
+    later one reads the newer state, and the upsert is conditional on the
+    render time as well.
+    """
+    course_ids = set(course_ids)
+    if not course_ids:
+        return []
+    list(Course.objects.select_for_update().filter(pk__in=course_ids).order_by('pk').values_list('pk', flat=True))
+    rendered_at = timezone.now()
+    courses = (Course.objects.filter(pk__in=course_ids, is_published=True)
+               .select_related('instructor', 'category').prefetch_related('modules__lectures'))
+    documents = []
+    for course in courses:
+        body, etag = render_document(course)
+        documents.append(CourseDocument(course=course, body=body, etag=etag, updated_at=rendered_at))
+
+    CourseDocument.objects.filter(course_id__in=course_ids).exclude(
+        course_id__in=[document.course_id for document in documents]
+    ).delete()
+    updated_at = CourseDocument._meta.get_field('updated_at').get_db_prep_value(rendered_at, connection)
+    with connection.cursor() as cursor:
+        cursor.executemany(_UPSERT_SQL, [
+            (document.course_id, document.body, document.etag, updated_at) for document in documents
+        ])
+    transaction.on_commit(partial(cache.delete_many, [document_cache_key(course_id) for course_id in course_ids]))
+    return documents
+
+
+def _load(course_id):
+    row = CourseDocument.objects.filter(course_id=course_id).values_list('etag', 'body').first()
+    if row is not None:
+        return row[0], bytes(row[1])
+    # Published before documents existed or a rebuild was lost: build it now
+    if Course.objects.filter(pk=course_id, is_published=True).exists():
+        # Empty when the course was unpublished or deleted in between
+        documents = rebuild_documents([course_id])
+        if documents:
+            return documents[0].etag, documents[0].body
+    return None
+
+
+def get_document(course_id):
+    """(etag, body bytes) of a published course, or None"""
+    return cache.get_or_compute(
+        document_cache_key(course_id), lambda: _load(course_id),
+        timeout=DOCUMENT_CACHE_TIMEOUT, local_timeout=DOCUMENT_LOCAL_TIMEOUT
+    )
@@ -0,0 +1,58 @@
+# courses/facets.py
+from django.db.models import Count, Q
+
+from .models import Course
+
+# (value, condition) pairs; counted with FILTER clauses in the same query
+PRICE_BUCKETS = (
+    ('free', Q(price=0)),
+    ('under_20', Q(price__gt=0, price__lt=20)),
+    ('20_to_50', Q(price__gte=20, price__lt=50)),
+    ('50_to_100', Q(price__gte=50, price__lt=100)),
+    ('100_plus', Q(price__gte=100)),
+)
+
+RATING_BUCKETS = (
+    ('4_up', Q(review_count__gt=0, average_rating__gte=4)),
+    ('3_up', Q(review_count__gt=0, average_rating__gte=3)),
+    ('2_up', Q(review_count__gt=0, average_rating__gte=2)),
+    ('1_up', Q(review_count__gt=0, average_rating__gte=1)),
+    ('unrated', Q(review_count=0)),
+)
+
+
+def facet_counts(queryset):
+    """
+    Level, category, price and rating counts for a filtered course queryset.
+
+    One GROUP BY category query; the other facets are FILTER-clause counts
+    within each group, summed here.
+    """
+    levels = [value for value, _ in Course.LEVEL_CHOICES]
+    aggregates = {'total': Count('id')}
+    for i, value in enumerate(levels):
+        aggregates[f'level_{i}'] = Count('id', filter=Q(level=value))
+    for i, (_, condition) in enumerate(PRICE_BUCKETS):
+        aggregates[f'price_{i}'] = Count('id', filter=condition)
+    for i, (_, condition) in enumerate(RATING_BUCKETS):
+        aggregates[f'rating_{i}'] = Count('id', filter=condition)
+
+    rows = list(
+        queryset.order_by()
+        .values('category_id', 'category__name')
+        .annotate(**aggregates)
+    )
+
+    def total(name):
+        return sum(row[name] for row in rows)
+
+    categories = sorted(
+        ({'value': row['category_id'], 'label': row['category__name'], 'count': row['total']} for row in rows),
+        key=lambda facet: (-facet['count'], facet['label'] or ''),
+    )
+    return {
+        'level': [{'value': value, 'count': total(f'level_{i}')} for i, value in enumerate(levels)],
+        'category': categories,
+        'price': [{'value': value, 'count': total(f'price_{i}')} for i, (value, _) in enumerate(PRICE_BUCKETS)],
+        'rating': [{'value': value, 'count': total(f'rating_{i}')} for i, (value, _) in enumerate(RATING_BUCKETS)],
+    }
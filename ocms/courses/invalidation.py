@@ -0,0 +1,73 @@
+# courses/invalidation.py
+from accounts.models import User
+from ocms import invalidation
+from ocms.invalidation import Tag, rule
+from .cache import bump_catalog_version
+from .documents import rebuild_documents
+from .models import Category, Course, Module, Lecture
+
+# Every cached catalog page, facet count and category listing (version-keyed)
+CATALOG = 'catalog'
+# Pre-rendered detail documents, argument: course id
+COURSE_DOCUMENT = 'course_document'
+
+invalidation.register_tag(CATALOG, lambda args: bump_catalog_version())
+invalidation.register_tag(COURSE_DOCUMENT, rebuild_documents)
+
+# Course fields shown on catalog cards or matched by catalog search
+CATALOG_COURSE_FIELDS = ('title', 'description', 'price', 'level', 'category_id', 'instructor_id', 'is_published')
+
+
+def _any_published(course_ids):
+    return Course.objects.filter(pk__in=course_ids, is_published=True).exists()
+
+
+@rule(Course, watch=CATALOG_COURSE_FIELDS)
+def course_targets(change):
+    # The document carries updated_at, so every save re-renders it
+    yield Tag(COURSE_DOCUMENT, change.instance.pk)
+    if change.visible('is_published') and change.changed(*CATALOG_COURSE_FIELDS):
+        yield Tag(CATALOG)
+
+
+@rule(Module, watch=('course_id',))
+def module_targets(change):
+    course_ids = {change.instance.course_id, change.before('course_id')}
+    for course_id in course_ids:
+        yield Tag(COURSE_DOCUMENT, course_id)
+    # Catalog cards show module counts; titles and order only appear in the document
+    if change.changed('course_id') and _any_published(course_ids):
+        yield Tag(CATALOG)
+
+
+@rule(Lecture, watch=('module_id', 'title', 'notes', 'duration'))
+def lecture_targets(change):
+    module_ids = {change.instance.module_id, change.before('module_id')}
+    course_ids = set(Module.objects.filter(pk__in=module_ids).values_list('course_id', flat=True))
+    for course_id in course_ids:
+        yield Tag(COURSE_DOCUMENT, course_id)
+    # Cards show lecture counts and duration; search matches lecture titles and notes
+    if change.changed('module_id', 'title', 'notes', 'duration') and _any_published(course_ids):
+        yield Tag(CATALOG)
+
+
+@rule(Category, watch=('name', 'slug'))
+def category_targets(change):
+    if not change.changed('name', 'slug'):
+        return
+    yield Tag(CATALOG)
+    if not change.created:
+        for course_id in change.instance.courses.values_list('id', flat=True):
+            yield Tag(COURSE_DOCUMENT, course_id)
+
+
+@rule(User, watch=('email', 'full_name', 'role'))
+def instructor_profile_targets(change):
+    # Documents embed the instructor's public profile, catalog cards their name
+    if change.created or not change.changed('email', 'full_name', 'role'):
+        return
+    courses = list(change.instance.courses_taught.values_list('id', 'is_published'))
+    for course_id, _ in courses:
+        yield Tag(COURSE_DOCUMENT, course_id)
+    if any(published for _, published in courses):
+        yield Tag(CATALOG)
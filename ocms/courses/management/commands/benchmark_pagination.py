@@ -0,0 +1,85 @@
+# courses/management/commands/benchmark_pagination.py
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from accounts.models import User
+from courses.models import Course
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Compare OFFSET (page number) and keyset pagination latency for the first and a deep '
+            'page of the published catalog. Seeds courses in a rolled-back transaction.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000, help='Published courses to seed')
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--deep-page', type=int, default=10_000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        deep_page = min(options['deep_page'], options['rows'] // page_size)
+        try:
+            with transaction.atomic():
+                self._seed(options['rows'])
+                rows = [
+                    ('offset', 1, self._time(lambda: self._offset_page(1, page_size), options['repeat'])),
+                    ('offset', deep_page, self._time(lambda: self._offset_page(deep_page, page_size), options['repeat'])),
+                    ('keyset', 1, self._time(lambda: self._keyset_page(None, page_size), options['repeat'])),
+                ]
+                # Cursor of the row just before the deep page (setup, not timed)
+                anchor = self._published().order_by('-created_at', '-id')[(deep_page - 1) * page_size - 1]
+                rows.append(('keyset', deep_page, self._time(lambda: self._keyset_page(anchor, page_size), options['repeat'])))
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(f"{'strategy':<8} {'page':>7} {'median ms':>10} {'max ms':>8}")
+        for strategy, page, timings in rows:
+            self.stdout.write(f"{strategy:<8} {page:>7} {statistics.median(timings):>10.2f} {max(timings):>8.2f}")
+
+    def _seed(self, count):
+        instructor = User.objects.create_user(
+            'pagination-bench@example.com', None, full_name='Bench Instructor', role='INSTRUCTOR'
+        )
+        Course.objects.bulk_create(
+            (Course(title=f'Course {i}', description='benchmark', price=i % 200,
+                    instructor=instructor, is_published=True) for i in range(count)),
+            batch_size=5000
+        )
+
+    def _published(self):
+        return Course.objects.filter(is_published=True).select_related('instructor', 'category')
+
+    def _offset_page(self, page, page_size):
+        # What PageNumberPagination does: COUNT(*) then LIMIT/OFFSET
+        queryset = self._published().order_by('-created_at', '-id')
+        queryset.count()
+        offset = (page - 1) * page_size
+        return list(queryset[offset:offset + page_size])
+
+    def _keyset_page(self, anchor, page_size):
+        queryset = self._published()
+        if anchor is not None:
+            # Same predicate as KeysetPagination, including the redundant range bound
+            queryset = queryset.filter(
+                Q(created_at__lte=anchor.created_at),
+                Q(created_at__lt=anchor.created_at) | Q(created_at=anchor.created_at, id__lt=anchor.id)
+            )
+        return list(queryset.order_by('-created_at', '-id')[:page_size + 1])
+
+    def _time(self, fn, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
@@ -0,0 +1,48 @@
+# courses/management/commands/check_query_plans.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from courses import query_plans
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('EXPLAIN the hot endpoint queries on a seeded dataset and fail unless each one is '
+            'answered from its expected index. PostgreSQL only; all data is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--courses', type=int, default=20000, help='Courses to seed (half published)')
+        parser.add_argument('--students', type=int, default=2000, help='Students to seed (20 enrollments each)')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full plan of every query')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Query plan checks need PostgreSQL')
+
+        try:
+            with transaction.atomic():
+                data = query_plans.seed(options['courses'], options['students'])
+                results = [
+                    (name, expected, *query_plans.explain(queryset))
+                    for name, queryset, expected in query_plans.hot_queries(data)
+                ]
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        failures = 0
+        for name, expected, nodes, plan in results:
+            ok = query_plans.uses_index(nodes, expected)
+            failures += not ok
+            used = ', '.join(f'{node} ({index})' if index else node for node, index in nodes)
+            self.stdout.write(f"{'ok  ' if ok else 'FAIL'} {name:<28} expected {expected:<34} got {used}")
+            if options['verbose_plans'] or not ok:
+                self.stdout.write(json.dumps(plan, indent=2))
+
+        if failures:
+            raise CommandError(f'{failures} queries did not use their expected index')
@@ -0,0 +1,30 @@
+# courses/management/commands/rebuild_course_documents.py
+from django.core.management.base import BaseCommand
+
+from courses.documents import rebuild_documents
+from courses.models import Course, CourseDocument
+
+
+class Command(BaseCommand):
+    help = ('Re-render the pre-rendered course detail documents. Signals keep them current; run this '
+            'after deploying serializer changes, raw SQL or bulk imports. Missing documents are also '
+            'built lazily on first read.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', type=int, help='Only these courses (default: all)')
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        if options['course_ids']:
+            course_ids = options['course_ids']
+        else:
+            # Published courses plus any orphaned documents of drafts
+            course_ids = sorted(
+                set(Course.objects.filter(is_published=True).values_list('id', flat=True))
+                | set(CourseDocument.objects.values_list('course_id', flat=True))
+            )
+
+        size = options['batch_size']
+        for start in range(0, len(course_ids), size):
+            rebuild_documents(course_ids[start:start + size])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt documents for {len(course_ids)} courses'))
@@ -0,0 +1,76 @@
+# Generated by Django 6.0.2 on 2026-10-17 22:54
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def _per_course(queryset, group_field, aggregate, output_field=None):
+    grouped = queryset.order_by().values(group_field).annotate(value=aggregate).values('value')
+    return Coalesce(Subquery(grouped[:1]), Value(0), output_field=output_field)
+
+
+def backfill_counters(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    Module = apps.get_model('courses', 'Module')
+    Lecture = apps.get_model('courses', 'Lecture')
+    Enrollment = apps.get_model('enrollments', 'Enrollment')
+    Review = apps.get_model('reviews', 'Review')
+
+    lectures = Lecture.objects.filter(module__course_id=OuterRef('pk'))
+    reviews = Review.objects.filter(course_id=OuterRef('pk'))
+
+    Course.objects.update(
+        module_count=_per_course(Module.objects.filter(course_id=OuterRef('pk')), 'course_id', Count('id')),
+        lecture_count=_per_course(lectures, 'module__course_id', Count('id')),
+        total_duration=_per_course(lectures, 'module__course_id', Sum('duration')),
+        enrollment_count=_per_course(Enrollment.objects.filter(course_id=OuterRef('pk')), 'course_id', Count('id')),
+        review_count=_per_course(reviews, 'course_id', Count('id')),
+        average_rating=_per_course(
+            reviews, 'course_id', Avg('rating'),
+            output_field=models.DecimalField(max_digits=3, decimal_places=2),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        ('enrollments', '0001_initial'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='average_rating',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=3),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='enrollment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='lecture_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='module_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='total_duration',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Total lecture duration in seconds'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
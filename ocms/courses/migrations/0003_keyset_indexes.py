@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-17 23:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['is_published', 'created_at', 'id'], name='courses_cou_is_publ_cb02fe_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['is_published', 'price', 'id'], name='courses_cou_is_publ_9609ae_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['is_published', 'title', 'id'], name='courses_cou_is_publ_2d9b29_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 6.0.2 on 2026-10-17 23:04
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+class PostgresAddIndex(migrations.AddIndex):
+    """GIN indexes only exist on PostgreSQL; other backends keep the state change only"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+# Frozen copy of courses.search._UPDATE_VECTOR_SQL as of this migration
+BACKFILL_SQL = """
+    UPDATE courses_course AS c SET search_vector =
+        setweight(to_tsvector('english', coalesce(c.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(
+            (SELECT cat.name FROM courses_category cat WHERE cat.id = c.category_id), ''
+        )), 'B') ||
+        setweight(to_tsvector('english', coalesce(c.description, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(
+            (SELECT string_agg(coalesce(l.title, '') || ' ' || coalesce(l.notes, ''), ' ')
+             FROM courses_lecture l JOIN courses_module m ON m.id = l.module_id
+             WHERE m.course_id = c.id), ''
+        )), 'D')
+"""
+
+
+def backfill_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(BACKFILL_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        PostgresAddIndex(
+            model_name='course',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='courses_cou_search__e2a3ab_gin'),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
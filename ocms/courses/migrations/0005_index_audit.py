@@ -0,0 +1,67 @@
+# Generated by Django 6.0.2 on 2026-10-17 23:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='category',
+            name='courses_cat_slug_33564e_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='course',
+            name='courses_cou_categor_108713_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='course',
+            name='courses_cou_price_1fbd18_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='course',
+            name='courses_cou_level_bf0a39_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='course',
+            name='courses_cou_instruc_d2e347_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='course',
+            name='courses_cou_is_publ_cb02fe_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='course',
+            name='courses_cou_is_publ_9609ae_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='course',
+            name='courses_cou_is_publ_2d9b29_idx',
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['created_at', 'id'], name='course_pub_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['price', 'id'], name='course_pub_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['title', 'id'], name='course_pub_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['category', 'created_at', 'id'], name='course_pub_cat_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['level', 'created_at', 'id'], name='course_pub_level_created_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-18 09:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_popular_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseDocument',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='document', serialize=False, to='courses.course')),
+                ('body', models.BinaryField()),
+                ('etag', models.CharField(max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'courses_coursedocument',
+            },
+        ),
+    ]
@@ -1,6 +1,9 @@
 # courses/models.py
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 class Category(models.Model):
     id = models.BigAutoField(primary_key=True)
@@ -13,9 +16,6 @@ class Category(models.Model):
     
     class Meta:
         db_table = 'courses_category'
-        indexes = [
-            models.Index(fields=['slug']),
-        ]
 
 class Course(models.Model):
     LEVEL_CHOICES = (
@@ -35,16 +35,35 @@ class Course(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Denormalized counters, maintained by courses/stats.py from the write paths
+    module_count = models.PositiveIntegerField(default=0, editable=False)
+    lecture_count = models.PositiveIntegerField(default=0, editable=False)
+    total_duration = models.PositiveIntegerField(default=0, editable=False, help_text="Total lecture duration in seconds")
+    enrollment_count = models.PositiveIntegerField(default=0, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    average_rating = models.DecimalField(max_digits=3, decimal_places=2, default=0, editable=False)
+    
+    # Weighted full-text document, rebuilt by courses/search.py on writes
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     def __str__(self):
         return self.title
     
     class Meta:
         db_table = 'courses_course'
+        # instructor/category are covered by their FK indexes. The catalog only
+        # ever reads published rows, so its (sort key, id) keyset indexes are
+        # partial on is_published and stay small while drafts pile up.
         indexes = [
-            models.Index(fields=['category']),
-            models.Index(fields=['price']),
-            models.Index(fields=['level']),
-            models.Index(fields=['instructor']),
+            models.Index(fields=['created_at', 'id'], condition=Q(is_published=True), name='course_pub_created_idx'),
+            models.Index(fields=['price', 'id'], condition=Q(is_published=True), name='course_pub_price_idx'),
+            models.Index(fields=['title', 'id'], condition=Q(is_published=True), name='course_pub_title_idx'),
+            # ?category= / ?level= filters under the default ordering
+            models.Index(fields=['category', 'created_at', 'id'], condition=Q(is_published=True), name='course_pub_cat_created_idx'),
+            models.Index(fields=['level', 'created_at', 'id'], condition=Q(is_published=True), name='course_pub_level_created_idx'),
+            # Admin top courses by the enrollment counter
+            models.Index(fields=['enrollment_count', 'id'], condition=Q(is_published=True), name='course_pub_popular_idx'),
+            GinIndex(fields=['search_vector']),
         ]
 
 class Module(models.Model):
@@ -76,4 +95,18 @@ class Lecture(models.Model):
     class Meta:
         db_table = 'courses_lecture'
         unique_together = ['module', 'order']
-        ordering = ['order']
\ No newline at end of file
+        ordering = ['order']
+
+class CourseDocument(models.Model):
+    """
+    Pre-rendered public detail JSON of a published course, rebuilt by
+    courses/documents.py whenever the course, its modules/lectures, its
+    category or its instructor's profile change.
+    """
+    course = models.OneToOneField(Course, on_delete=models.CASCADE, primary_key=True, related_name='document')
+    body = models.BinaryField()
+    etag = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'courses_coursedocument'
@@ -0,0 +1,129 @@
+# courses/query_plans.py
+"""
+EXPLAIN checks for the hot endpoint queries (PostgreSQL only).
+
+`seed()` bulk-loads a dataset big enough that the planner only picks an
+index when it actually pays off, so a dropped or mismatched index shows up
+as a Seq Scan. Used by the check_query_plans command and courses/tests.py.
+"""
+import json
+from urllib.parse import parse_qs, urlsplit
+
+from django.db import connection
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import User
+from .models import Category, Course
+from .views import CourseListView
+from enrollments.models import Enrollment
+from enrollments.views import MyCoursesView
+from reviews.models import Review
+from reviews.views import CourseReviewListView, MyReviewsView
+
+
+def _index_name(model, *fields):
+    """Name of the Meta index on exactly these fields (auto-generated names included)"""
+    return next(index.name for index in model._meta.indexes if tuple(index.fields) == fields)
+
+
+def _list_view(view_class, query=None, user=None, **kwargs):
+    """A list view set up for a GET with these query params, as the URL resolver would"""
+    view = view_class(args=(), kwargs=kwargs, format_kwarg=None)
+    view.request = view.initialize_request(APIRequestFactory().get('/', query or {}))
+    if user is not None:
+        view.request.user = user
+    return view
+
+
+def _page(view):
+    """The (unevaluated) page queryset the view's paginator runs for its request"""
+    return view.paginator.get_page_queryset(view.filter_queryset(view.get_queryset()), view.request, view)
+
+
+def _next_cursor(view):
+    view.paginate_queryset(view.filter_queryset(view.get_queryset()))
+    return parse_qs(urlsplit(view.paginator.get_next_link()).query)['cursor'][0]
+
+
+def seed(courses=20000, students=2000):
+    instructor = User.objects.create_user(
+        'plan-instructor@example.com', None, full_name='Plan Instructor', role='INSTRUCTOR'
+    )
+    categories = Category.objects.bulk_create(
+        Category(name=f'Category {i}', slug=f'plan-category-{i}') for i in range(20)
+    )
+    course_rows = Course.objects.bulk_create(
+        (Course(title=f'Course {i}', description='plan check', price=i % 200, level=Course.LEVEL_CHOICES[i % 3][0],
+                instructor=instructor, category=categories[i % 20], is_published=i % 2 == 0)
+         for i in range(courses)),
+        batch_size=5000
+    )
+    course = course_rows[0]
+    student_rows = User.objects.bulk_create(
+        (User(email=f'plan-student-{i}@example.com', full_name=f'Student {i}', role='STUDENT')
+         for i in range(students)),
+        batch_size=5000
+    )
+    Enrollment.objects.bulk_create(
+        (Enrollment(student=student, course=course_rows[j], status='COMPLETED' if j % 4 == 0 else 'ACTIVE')
+         for i, student in enumerate(student_rows) for j in range(i % 50, i % 50 + 20)),
+        batch_size=5000
+    )
+    Review.objects.bulk_create(
+        (Review(student=student, course=course_rows[j], rating=1 + j % 5, comment='ok')
+         for i, student in enumerate(student_rows) for j in range(i % 50, i % 50 + 5)),
+        batch_size=5000
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return {
+        'course': course,
+        'student': student_rows[0],
+        'category': categories[0],
+    }
+
+
+def hot_queries(data):
+    """(name, queryset, expected index) for each query a list endpoint runs per page"""
+    course, student = data['course'], data['student']
+    by_price = {'ordering': 'price'}
+    cursor = _next_cursor(_list_view(CourseListView, by_price))
+    return [
+        ('catalog newest', _page(_list_view(CourseListView)), 'course_pub_created_idx'),
+        ('catalog by price', _page(_list_view(CourseListView, by_price)), 'course_pub_price_idx'),
+        ('catalog by price, next page', _page(_list_view(CourseListView, {**by_price, 'cursor': cursor})),
+         'course_pub_price_idx'),
+        ('catalog by title', _page(_list_view(CourseListView, {'ordering': 'title'})), 'course_pub_title_idx'),
+        ('catalog by category', _page(_list_view(CourseListView, {'category': data['category'].id})),
+         'course_pub_cat_created_idx'),
+        ('catalog by level', _page(_list_view(CourseListView, {'level': 'Advanced'})),
+         'course_pub_level_created_idx'),
+        ('my courses', _page(_list_view(MyCoursesView, user=student)),
+         _index_name(Enrollment, 'student', 'enrolled_at', 'id')),
+        ('course reviews', _page(_list_view(CourseReviewListView, course_id=course.id)),
+         _index_name(Review, 'course', 'created_at', 'id')),
+        ('my reviews', _page(_list_view(MyReviewsView, user=student)),
+         _index_name(Review, 'student', 'created_at', 'id')),
+    ]
+
+
+def explain(queryset):
+    """([(scan node type, index name)], raw JSON plan)"""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    nodes = []
+    stack = [plan[0]['Plan']]
+    while stack:
+        node = stack.pop()
+        if 'Scan' in node['Node Type']:
+            nodes.append((node['Node Type'], node.get('Index Name')))
+        stack.extend(node.get('Plans', []))
+    return nodes, plan
+
+
+def uses_index(nodes, expected):
+    return any(index == expected for _, index in nodes) and not any(node == 'Seq Scan' for node, _ in nodes)
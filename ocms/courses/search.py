@@ -0,0 +1,85 @@
+# courses/search.py
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Exists, F, FloatField, OuterRef, Q
+from django.db.models.functions import Cast
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Lecture
+
+SEARCH_CONFIG = 'english'
+SEARCH_PARAM = 'search'
+
+# Weighted document: title (A), category (B), description (C), lecture titles and notes (D)
+_UPDATE_VECTOR_SQL = f"""
+    UPDATE courses_course AS c SET search_vector =
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(c.title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+            (SELECT cat.name FROM courses_category cat WHERE cat.id = c.category_id), ''
+        )), 'B') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(c.description, '')), 'C') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+            (SELECT string_agg(coalesce(l.title, '') || ' ' || coalesce(l.notes, ''), ' ')
+             FROM courses_lecture l JOIN courses_module m ON m.id = l.module_id
+             WHERE m.course_id = c.id), ''
+        )), 'D')
+"""
+
+
+def search_enabled():
+    """Full-text search needs PostgreSQL; other backends use the ILIKE fallback"""
+    return connection.vendor == 'postgresql'
+
+
+def update_search_vectors(course_ids=None):
+    """Rebuild the stored tsvector for the given courses (all when None) in one UPDATE"""
+    if not search_enabled():
+        return
+    with connection.cursor() as cursor:
+        if course_ids is None:
+            cursor.execute(_UPDATE_VECTOR_SQL)
+        else:
+            cursor.execute(_UPDATE_VECTOR_SQL + ' WHERE c.id = ANY(%s)', [list(course_ids)])
+
+
+def search_terms(text):
+    return re.findall(r'\w+', text.lower())[:10]
+
+
+def prefix_query(terms):
+    """AND of prefix terms, so 'pyth deco' matches 'python decorators' while typing"""
+    return SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config=SEARCH_CONFIG)
+
+
+class CourseSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search over the maintained Course.search_vector (GIN
+    indexed). Matches are annotated with `search_rank`, which the catalog uses
+    as its default ordering while searching. Without PostgreSQL it falls back
+    to case-insensitive matching on title, description and lecture titles.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = search_terms(request.query_params.get(SEARCH_PARAM, ''))
+        if not terms:
+            return queryset
+
+        if search_enabled():
+            query = prefix_query(terms)
+            return queryset.filter(search_vector=query).annotate(
+                # float8 so rank values round-trip exactly through keyset cursors
+                search_rank=Cast(SearchRank(F('search_vector'), query), FloatField())
+            )
+
+        for term in terms:
+            lectures = Lecture.objects.filter(module__course=OuterRef('pk'), title__icontains=term)
+            queryset = queryset.filter(
+                Q(title__icontains=term) | Q(description__icontains=term) | Exists(lectures)
+            )
+        return queryset
+
+
+def is_searching(request):
+    return search_enabled() and bool(search_terms(request.query_params.get(SEARCH_PARAM, '')))
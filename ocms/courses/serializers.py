@@ -26,26 +26,30 @@ class ModuleSerializer(serializers.ModelSerializer):
 class CourseListSerializer(serializers.ModelSerializer):
     instructor_name = serializers.CharField(source='instructor.full_name', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
-    total_modules = serializers.SerializerMethodField()
-    total_lectures = serializers.SerializerMethodField()
+    # Served from the denormalized counters on Course, no per-row queries
+    total_modules = serializers.IntegerField(source='module_count', read_only=True)
+    total_lectures = serializers.IntegerField(source='lecture_count', read_only=True)
     
     class Meta:
         model = Course
         fields = [
             'id', 'title', 'description', 'price', 'level', 
             'instructor_name', 'category_name', 'is_published',
-            'total_modules', 'total_lectures', 'created_at'
+            'total_modules', 'total_lectures', 'total_duration',
+            'enrollment_count', 'average_rating', 'review_count', 'created_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+
+class CourseListRatingSerializer(CourseListSerializer):
+    """Catalog card with the full rating summary (?include=rating)"""
+    rating = serializers.SerializerMethodField()
     
-    def get_total_modules(self, obj):
-        return obj.modules.count()
+    class Meta(CourseListSerializer.Meta):
+        fields = CourseListSerializer.Meta.fields + ['rating']
     
-    def get_total_lectures(self, obj):
-        total = 0
-        for module in obj.modules.all():
-            total += module.lectures.count()
-        return total
+    def get_rating(self, obj):
+        from reviews.ratings import rating_summary
+        return rating_summary(getattr(obj, 'rating_stats', None))
 
 class CourseDetailSerializer(serializers.ModelSerializer):
     instructor = UserProfileSerializer(read_only=True)
@@ -0,0 +1,58 @@
+# courses/signals.py
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from ocms import invalidation
+from . import suggest
+from .models import Category, Course, Module, Lecture
+from .search import update_search_vectors
+from .stats import refresh_course_structure
+
+# Stored parents come from the invalidation registry's pre_save read
+invalidation.watch(Module, 'course_id')
+invalidation.watch(Lecture, 'module_id')
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, **kwargs):
+    update_search_vectors([instance.pk])
+    transaction.on_commit(partial(suggest.course_changed, instance))
+
+
+@receiver(post_delete, sender=Course)
+def course_deleted(sender, instance, **kwargs):
+    transaction.on_commit(partial(suggest.course_removed, instance.pk))
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, **kwargs):
+    if not created:
+        update_search_vectors(instance.courses.values_list('id', flat=True))
+    transaction.on_commit(partial(suggest.category_changed, instance))
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    transaction.on_commit(partial(suggest.category_removed, instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Module)
+def module_changed(sender, instance, **kwargs):
+    # A module moved to another course changes both courses' counters
+    for course_id in {instance.course_id, invalidation.previous(instance, 'course_id')} - {None}:
+        refresh_course_structure(course_id)
+
+
+@receiver([post_save, post_delete], sender=Lecture)
+def lecture_changed(sender, instance, **kwargs):
+    # Module may already be gone when a course delete cascades; a lecture
+    # moved between modules updates the old module's course as well
+    module_ids = {instance.module_id, invalidation.previous(instance, 'module_id')}
+    course_ids = set(Module.objects.filter(pk__in=module_ids - {None}).values_list('course_id', flat=True))
+    for course_id in course_ids:
+        refresh_course_structure(course_id)
+    if course_ids:
+        update_search_vectors(course_ids)
@@ -0,0 +1,57 @@
+# courses/stats.py
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import Course, Module, Lecture
+
+
+def _per_course(queryset, group_field, aggregate):
+    """Correlated per-course aggregate usable inside an UPDATE"""
+    grouped = queryset.order_by().values(group_field).annotate(value=aggregate).values('value')
+    return Coalesce(Subquery(grouped[:1]), Value(0))
+
+
+def refresh_course_structure(course_id):
+    """
+    Recompute module/lecture counters for one course in a single UPDATE.
+    Structure writes are rare, so recomputing keeps the counters exact.
+    Enrollment status is re-derived from the new lecture count.
+    """
+    from enrollments.services import sync_completion_status
+    
+    modules = Module.objects.filter(course_id=OuterRef('pk'))
+    lectures = Lecture.objects.filter(module__course_id=OuterRef('pk'))
+
+    Course.objects.filter(pk=course_id).update(
+        module_count=_per_course(modules, 'course_id', Count('id')),
+        lecture_count=_per_course(lectures, 'module__course_id', Count('id')),
+        total_duration=_per_course(lectures, 'module__course_id', Sum('duration')),
+    )
+    sync_completion_status([course_id])
+
+
+def refresh_course_counters(course_ids):
+    """
+    Recompute structure and enrollment counters for many courses in one
+    UPDATE, for writers that bypass signals (bulk loads, seeding).
+    """
+    from enrollments.models import Enrollment
+    from enrollments.services import sync_completion_status
+    
+    modules = Module.objects.filter(course_id=OuterRef('pk'))
+    lectures = Lecture.objects.filter(module__course_id=OuterRef('pk'))
+    enrollments = Enrollment.objects.filter(course_id=OuterRef('pk'))
+    
+    Course.objects.filter(pk__in=course_ids).update(
+        module_count=_per_course(modules, 'course_id', Count('id')),
+        lecture_count=_per_course(lectures, 'module__course_id', Count('id')),
+        total_duration=_per_course(lectures, 'module__course_id', Sum('duration')),
+        enrollment_count=_per_course(enrollments, 'course_id', Count('id')),
+    )
+    sync_completion_status(course_ids)
+
+
+def adjust_enrollment_count(course_id, delta):
+    """Shift the enrollment counter in the database (no read-modify-write)"""
+    Course.objects.filter(pk=course_id).update(enrollment_count=F('enrollment_count') + delta)
+
@@ -0,0 +1,147 @@
+# courses/suggest.py
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+
+from .cache import get_catalog_version
+from .models import Category, Course
+
+SUGGEST_LIMIT = 10
+SUGGEST_MAX_LIMIT = 20
+# How often a worker compares its index against the shared catalog version
+SUGGEST_CHECK_INTERVAL = 5
+# Upper bound on index entries scanned per lookup, keeps short prefixes cheap
+SUGGEST_SCAN_LIMIT = 500
+
+COURSE = 'course'
+CATEGORY = 'category'
+
+
+def tokenize(text):
+    return re.findall(r'\w+', (text or '').lower())
+
+
+class SuggestIndex:
+    """
+    In-process prefix index of published course titles and category names.
+
+    Every word of every label is one `(word, kind, id)` entry in a sorted
+    list, so a prefix lookup is a bisect plus a short forward scan and never
+    touches the database. Writers build a new list and swap it in, readers
+    always see a consistent snapshot without locking.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = []
+        self._labels = {}
+        self._version = None
+        self._checked_at = 0.0
+
+    @property
+    def built(self):
+        return self._version is not None
+
+    def build(self):
+        version = get_catalog_version()
+        labels = {}
+        for pk, title in Course.objects.filter(is_published=True).values_list('id', 'title'):
+            labels[(COURSE, pk)] = title
+        for pk, name in Category.objects.values_list('id', 'name'):
+            labels[(CATEGORY, pk)] = name
+
+        entries = sorted(
+            (word, kind, pk)
+            for (kind, pk), label in labels.items()
+            for word in set(tokenize(label))
+        )
+        with self._lock:
+            self._entries, self._labels = entries, labels
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def ensure_fresh(self):
+        """Build on first use, rebuild when another worker changed the catalog"""
+        if not self.built:
+            self.build()
+            return
+        if time.monotonic() - self._checked_at < SUGGEST_CHECK_INTERVAL:
+            return
+        self._checked_at = time.monotonic()
+        if get_catalog_version() != self._version:
+            self.build()
+
+    def put(self, kind, pk, label):
+        """Insert or replace one label; a None label removes it"""
+        if not self.built:
+            return
+        with self._lock:
+            entries = self._entries
+            labels = dict(self._labels)
+            previous = labels.pop((kind, pk), None)
+            if previous is not None or label is not None:
+                entries = list(entries)
+            if previous is not None:
+                for word in set(tokenize(previous)):
+                    i = bisect_left(entries, (word, kind, pk))
+                    if i < len(entries) and entries[i] == (word, kind, pk):
+                        del entries[i]
+            if label is not None:
+                labels[(kind, pk)] = label
+                for word in set(tokenize(label)):
+                    insort(entries, (word, kind, pk))
+            self._entries, self._labels = entries, labels
+
+    def lookup(self, text, limit=SUGGEST_LIMIT):
+        words = tokenize(text)
+        if not words:
+            return []
+        entries, labels = self._entries, self._labels
+        first, rest = words[0], words[1:]
+        query = ' '.join(words)
+
+        seen = set()
+        matches = []
+        i = bisect_left(entries, (first,))
+        end = min(len(entries), i + SUGGEST_SCAN_LIMIT)
+        while i < end and entries[i][0].startswith(first):
+            key = entries[i][1:]
+            i += 1
+            if key in seen:
+                continue
+            seen.add(key)
+            label = labels[key]
+            tokens = tokenize(label)
+            if all(any(token.startswith(word) for token in tokens) for word in rest):
+                matches.append((not ' '.join(tokens).startswith(query), label.lower(), key, label))
+
+        matches.sort()
+        return [
+            {'type': kind, 'id': pk, 'label': label}
+            for _, _, (kind, pk), label in matches[:limit]
+        ]
+
+
+suggest_index = SuggestIndex()
+
+
+def suggest(text, limit=SUGGEST_LIMIT):
+    suggest_index.ensure_fresh()
+    return suggest_index.lookup(text, limit)
+
+
+def course_changed(course):
+    suggest_index.put(COURSE, course.pk, course.title if course.is_published else None)
+
+
+def course_removed(course_id):
+    suggest_index.put(COURSE, course_id, None)
+
+
+def category_changed(category):
+    suggest_index.put(CATEGORY, category.pk, category.name)
+
+
+def category_removed(category_id):
+    suggest_index.put(CATEGORY, category_id, None)
@@ -1,3 +1,456 @@
-from django.test import TestCase
+# courses/tests.py
+import base64
+import json
+from unittest import skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from ocms import invalidation
+from ocms.local_cache import local
+from . import query_plans
+from .cache import get_catalog_version
+from .models import Category, Course, CourseDocument, Module, Lecture
+from .suggest import suggest_index
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def make_course(instructor, title, **fields):
+    fields = {'description': 'Course', 'price': 10, 'is_published': True, **fields}
+    return Course.objects.create(title=title, instructor=instructor, **fields)
+
+
+def encode_cursor(cursor):
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CatalogPaginationTests(TestCase):
+    """Keyset cursors walk the catalog both ways and reject anything they did not issue"""
+
+    @classmethod
+    def setUpTestData(cls):
+        instructor = User.objects.create_user('instructor@example.com', None, full_name='Instructor', role='INSTRUCTOR')
+        # Repeated prices, so pages break inside a run of equal sort keys
+        for index, price in enumerate([5, 5, 5, 10, 10, 20, 20]):
+            Course.objects.create(
+                title=f'Course {index}', description='Course', instructor=instructor, price=price, is_published=True
+            )
+        cls.by_price = list(Course.objects.order_by('price', 'id').values_list('id', flat=True))
+
+    def setUp(self):
+        cache.clear()
+        local.clear()
+        self.client = APIClient()
+
+    def ids(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [course['id'] for course in response.json()['results']]
+
+    def test_next_and_previous_round_trip(self):
+        response = self.client.get('/api/courses/', {'ordering': 'price', 'page_size': 2})
+        pages = [self.ids(response)]
+        self.assertIsNone(response.json()['previous'])
+        while response.json()['next']:
+            response = self.client.get(response.json()['next'])
+            pages.append(self.ids(response))
+        self.assertEqual([pk for page in pages for pk in page], self.by_price)
+
+        for page in reversed(pages[:-1]):
+            response = self.client.get(response.json()['previous'])
+            self.assertEqual(self.ids(response), page)
+        self.assertIsNone(response.json()['previous'])
+
+    def test_malformed_cursors_are_not_found(self):
+        first = self.by_price[0]
+        cursors = {
+            'not base64': '!!!',
+            'not json': base64.urlsafe_b64encode(b'{oops').decode(),
+            'not an object': encode_cursor([1, 2]),
+            'other ordering': encode_cursor({'k': '-created_at', 'v': '5.00', 'id': first}),
+            'missing value': encode_cursor({'k': 'price', 'id': first}),
+            'missing id': encode_cursor({'k': 'price', 'v': '5.00'}),
+            'null value': encode_cursor({'k': 'price', 'v': None, 'id': first}),
+            'bad value': encode_cursor({'k': 'price', 'v': 'cheap', 'id': first}),
+            'bad id': encode_cursor({'k': 'price', 'v': '5.00', 'id': 'x'}),
+        }
+        for name, cursor in cursors.items():
+            with self.subTest(cursor=name):
+                response = self.client.get('/api/courses/', {'ordering': 'price', 'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+
+        # A hand-built but well-formed cursor is coerced and honoured
+        response = self.client.get('/api/courses/', {
+            'ordering': 'price', 'cursor': encode_cursor({'k': 'price', 'v': '5', 'id': first})
+        })
+        self.assertEqual(self.ids(response), self.by_price[1:])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Query plan checks need PostgreSQL')
+class QueryPlanTests(TestCase):
+    """Each hot endpoint query is answered from its index on a realistically sized dataset"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = query_plans.seed()
+
+    def test_hot_queries_use_their_index(self):
+        for name, queryset, expected in query_plans.hot_queries(self.data):
+            with self.subTest(query=name):
+                nodes, plan = query_plans.explain(queryset)
+                self.assertTrue(query_plans.uses_index(nodes, expected), json.dumps(plan, indent=2))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CatalogCacheTests(TestCase):
+    """Catalog pages are served from the cache until a visible write bumps the catalog version"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor@example.com', None, full_name='Instructor', role='INSTRUCTOR')
+        cls.published = make_course(cls.instructor, 'Published')
+        cls.draft = make_course(cls.instructor, 'Draft', is_published=False)
+
+    def setUp(self):
+        # Targets queued by setUpTestData, whose commit never comes
+        invalidation.flush()
+        cache.clear()
+        local.clear()
+        self.client = APIClient()
+        self.instructor_client = APIClient()
+        self.instructor_client.force_authenticate(self.instructor)
+
+    def titles(self):
+        response = self.client.get('/api/courses/')
+        self.assertEqual(response.status_code, 200)
+        return [course['title'] for course in response.json()['results']]
+
+    def edit(self, course, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.instructor_client.patch(f'/api/instructor/courses/{course.id}/', data, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_warm_pages_skip_the_database(self):
+        self.assertEqual(self.titles(), ['Published'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles(), ['Published'])
+
+    def test_visible_writes_bump_the_version(self):
+        self.assertEqual(self.titles(), ['Published'])
+        self.edit(self.draft, is_published=True)
+        self.assertEqual(self.titles(), ['Draft', 'Published'])
+        self.edit(self.published, title='Renamed')
+        self.assertEqual(self.titles(), ['Draft', 'Renamed'])
+        self.edit(self.draft, is_published=False)
+        self.assertEqual(self.titles(), ['Renamed'])
+
+    def test_draft_edits_keep_the_version(self):
+        version = get_catalog_version()
+        self.edit(self.draft, title='Still a draft')
+        self.assertEqual(get_catalog_version(), version)
+
+    def test_query_params_are_normalized(self):
+        self.client.get('/api/courses/', {'search': 'Published', 'level': 'Beginner'})
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/courses/', {'level': 'Beginner', 'search': 'PUBLISHED', 'utm': 'x'})
+        self.assertEqual([course['title'] for course in response.json()['results']], ['Published'])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CatalogSearchTests(TestCase):
+    """?search= matches titles, descriptions and lecture titles; PostgreSQL ranks the matches"""
+
+    @classmethod
+    def setUpTestData(cls):
+        instructor = User.objects.create_user('instructor@example.com', None, full_name='Instructor', role='INSTRUCTOR')
+        cls.in_title = make_course(instructor, 'Django Decorators')
+        cls.in_description = make_course(instructor, 'Web Basics', description='Some django along the way')
+        cls.in_lecture = make_course(instructor, 'Python Patterns')
+        module = Module.objects.create(course=cls.in_lecture, title='Module', order=1)
+        Lecture.objects.create(module=module, title='Django signals', order=1, duration=60)
+        cls.draft = make_course(instructor, 'Django Draft', is_published=False)
+        make_course(instructor, 'Unrelated')
+
+    def setUp(self):
+        cache.clear()
+        local.clear()
+        self.client = APIClient()
+
+    def search(self, text, **params):
+        response = self.client.get('/api/courses/', {'search': text, **params})
+        self.assertEqual(response.status_code, 200)
+        return [course['id'] for course in response.json()['results']]
+
+    def test_matches_and_filters(self):
+        expected = {self.in_title.id, self.in_description.id, self.in_lecture.id}
+        self.assertEqual(set(self.search('django')), expected)
+        self.assertEqual(set(self.search('DJANGO')), expected)
+        self.assertEqual(self.search('django decorators'), [self.in_title.id])
+        self.assertEqual(self.search('django', level='Advanced'), [])
+        self.assertEqual(self.search('nothing-matches'), [])
+
+    @skipUnless(connection.vendor == 'postgresql', 'Ranked search needs PostgreSQL')
+    def test_ranked_by_weight_and_prefix_matched(self):
+        # Title (A) outranks description (C) outranks lecture titles (D)
+        self.assertEqual(self.search('django'), [self.in_title.id, self.in_description.id, self.in_lecture.id])
+        self.assertEqual(self.search('decor'), [self.in_title.id])
+        # An explicit ordering replaces the rank
+        self.assertEqual(
+            self.search('django', ordering='title'), [self.in_title.id, self.in_lecture.id, self.in_description.id]
+        )
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class SuggestTests(TestCase):
+    """Suggestions come from the in-process index and follow writes once they commit"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor@example.com', None, full_name='Instructor', role='INSTRUCTOR')
+        cls.category = Category.objects.create(name='Data Science', slug='data-science')
+        cls.pandas = make_course(cls.instructor, 'Data Analysis with Pandas')
+        cls.advanced = make_course(cls.instructor, 'Advanced Data Engineering')
+        cls.draft = make_course(cls.instructor, 'Data Draft', is_published=False)
+
+    def setUp(self):
+        cache.clear()
+        local.clear()
+        suggest_index.build()
+        self.client = APIClient()
+        self.instructor_client = APIClient()
+        self.instructor_client.force_authenticate(self.instructor)
+
+    def labels(self, text, **params):
+        response = self.client.get('/api/courses/suggest/', {'q': text, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(result['type'], result['label']) for result in response.data['results']]
+
+    def test_prefix_matches_without_queries(self):
+        with self.assertNumQueries(0):
+            labels = self.labels('dat')
+        # Labels starting with the query first, drafts never
+        self.assertEqual(labels, [
+            ('course', 'Data Analysis with Pandas'), ('category', 'Data Science'), ('course', 'Advanced Data Engineering'),
+        ])
+        self.assertEqual(self.labels('data eng'), [('course', 'Advanced Data Engineering')])
+        self.assertEqual(self.labels('pand'), [('course', 'Data Analysis with Pandas')])
+        self.assertEqual(len(self.labels('data', limit=1)), 1)
+        self.assertEqual(self.labels('  '), [])
+
+    def test_writes_update_the_index_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.instructor_client.patch(f'/api/instructor/courses/{self.pandas.id}/', {'title': 'Pandas in Depth'})
+            self.instructor_client.patch(f'/api/instructor/courses/{self.draft.id}/', {'is_published': True})
+            Category.objects.create(name='Databases', slug='databases')
+        self.assertEqual(self.labels('data'), [
+            ('course', 'Data Draft'), ('category', 'Data Science'), ('category', 'Databases'),
+            ('course', 'Advanced Data Engineering'),
+        ])
+        self.assertEqual(self.labels('pandas'), [('course', 'Pandas in Depth')])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.instructor_client.patch(f'/api/instructor/courses/{self.draft.id}/', {'is_published': False})
+            self.advanced.delete()
+        self.assertEqual(self.labels('data'), [('category', 'Data Science'), ('category', 'Databases')])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class FacetTests(TestCase):
+    """?facets=1 counts the filtered catalog once per filter set, not once per page"""
+
+    @classmethod
+    def setUpTestData(cls):
+        instructor = User.objects.create_user('instructor@example.com', None, full_name='Instructor', role='INSTRUCTOR')
+        cls.web = Category.objects.create(name='Web', slug='web')
+        cls.data = Category.objects.create(name='Data', slug='data')
+        rows = [
+            ('Beginner', 0, cls.web, 0, 0), ('Beginner', 15, cls.web, 2, 4.5), ('Intermediate', 30, cls.data, 1, 3),
+            ('Advanced', 75, cls.data, 4, 2.5), ('Advanced', 150, None, 0, 0),
+        ]
+        for index, (level, price, category, reviews, average) in enumerate(rows):
+            course = make_course(instructor, f'Course {index}', level=level, price=price, category=category)
+            Course.objects.filter(pk=course.pk).update(review_count=reviews, average_rating=average)
+        make_course(instructor, 'Draft', level='Beginner', category=cls.web, is_published=False)
+
+    def setUp(self):
+        cache.clear()
+        local.clear()
+        self.client = APIClient()
+
+    def facets(self, **params):
+        response = self.client.get('/api/courses/', {'facets': '1', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['facets']
+
+    def counts(self, facet):
+        return {bucket['value']: bucket['count'] for bucket in facet}
+
+    def test_counts(self):
+        facets = self.facets()
+        self.assertEqual(self.counts(facets['level']), {'Beginner': 2, 'Intermediate': 1, 'Advanced': 2})
+        self.assertEqual(
+            [(bucket['label'], bucket['count']) for bucket in facets['category']], [('Data', 2), ('Web', 2), (None, 1)]
+        )
+        self.assertEqual(
+            self.counts(facets['price']), {'free': 1, 'under_20': 1, '20_to_50': 1, '50_to_100': 1, '100_plus': 1}
+        )
+        self.assertEqual(self.counts(facets['rating']), {'4_up': 1, '3_up': 2, '2_up': 3, '1_up': 3, 'unrated': 2})
+
+    def test_counts_follow_filters(self):
+        facets = self.facets(level='Advanced')
+        self.assertEqual(self.counts(facets['level']), {'Beginner': 0, 'Intermediate': 0, 'Advanced': 2})
+        self.assertEqual(self.counts(facets['category']), {self.data.id: 1, None: 1})
+
+        facets = self.facets(category=self.web.id)
+        self.assertEqual(self.counts(facets['price']), {'free': 1, 'under_20': 1, '20_to_50': 0, '50_to_100': 0, '100_plus': 0})
+
+    def test_paging_reuses_the_counts(self):
+        response = self.client.get('/api/courses/', {'facets': '1', 'page_size': 2})
+        with self.assertNumQueries(1):
+            page = self.client.get(response.json()['next'])
+        self.assertEqual(page.json()['facets'], response.json()['facets'])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CourseDocumentTests(TestCase):
+    """Course detail is served as a pre-rendered document with a stable ETag"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor@example.com', None, full_name='Instructor', role='INSTRUCTOR')
+        cls.course = make_course(cls.instructor, 'Documented')
+        cls.module = Module.objects.create(course=cls.course, title='Module', order=1)
+        cls.draft = make_course(cls.instructor, 'Draft', is_published=False)
+
+    def setUp(self):
+        # Targets queued by setUpTestData, whose commit never comes
+        invalidation.flush()
+        cache.clear()
+        local.clear()
+        self.client = APIClient()
+        self.instructor_client = APIClient()
+        self.instructor_client.force_authenticate(self.instructor)
+        self.url = f'/api/courses/{self.course.id}/'
+
+    def write(self, method, url, data=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = getattr(self.instructor_client, method)(url, data, format='json')
+        self.assertLess(response.status_code, 300)
+
+    def test_etag_and_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], 'Documented')
+        etag = response['ETag']
+        self.assertTrue(CourseDocument.objects.filter(course=self.course, etag=etag).exists())
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_writes_re_render_the_document(self):
+        etag = self.client.get(self.url)['ETag']
+        self.write('patch', f'/api/instructor/courses/{self.course.id}/', {'title': 'Renamed'})
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], 'Renamed')
+
+        etag = response['ETag']
+        self.write('post', f'/api/instructor/modules/{self.module.id}/lectures/',
+                   {'title': 'New lecture', 'order': 1, 'duration': 60})
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        lectures = response.json()['modules'][0]['lectures']
+        self.assertEqual([lecture['title'] for lecture in lectures], ['New lecture'])
+
+    def test_unpublished_and_missing_courses_are_not_found(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.write('patch', f'/api/instructor/courses/{self.course.id}/', {'is_published': False})
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertFalse(CourseDocument.objects.filter(course=self.course).exists())
+
+        self.assertEqual(self.client.get(f'/api/courses/{self.draft.id}/').status_code, 404)
+        self.assertEqual(self.client.get('/api/courses/999999/').status_code, 404)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class InvalidationRuleTests(TestCase):
+    """Each write refreshes exactly the documents and catalog pages that show what it changed"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor@example.com', None, full_name='Instructor', role='INSTRUCTOR')
+        cls.category = Category.objects.create(name='Web', slug='web')
+        cls.source = make_course(cls.instructor, 'Source', category=cls.category)
+        cls.target = make_course(cls.instructor, 'Target')
+        cls.module = Module.objects.create(course=cls.source, title='Moving', order=1)
+        cls.lecture = Lecture.objects.create(module=cls.module, title='Lecture', order=1, duration=60)
+
+    def setUp(self):
+        # Targets queued by setUpTestData, whose commit never comes
+        invalidation.flush()
+        cache.clear()
+        local.clear()
+        self.client = APIClient()
+        # Warm both documents and the catalog version
+        self.document(self.source)
+        self.document(self.target)
+        self.version = get_catalog_version()
+
+    def document(self, course):
+        response = self.client.get(f'/api/courses/{course.id}/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def save(self, instance, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            for name, value in fields.items():
+                setattr(instance, name, value)
+            instance.save()
+
+    def test_module_move_refreshes_both_courses(self):
+        self.save(self.module, course=self.target)
+        self.assertEqual(self.document(self.source)['modules'], [])
+        self.assertEqual([module['title'] for module in self.document(self.target)['modules']], ['Moving'])
+        # Catalog cards show module counts
+        self.assertNotEqual(get_catalog_version(), self.version)
+
+    def test_document_only_lecture_change_keeps_the_catalog(self):
+        self.save(self.lecture, video_url='https://example.com/lecture.mp4')
+        lecture = self.document(self.source)['modules'][0]['lectures'][0]
+        self.assertEqual(lecture['video_url'], 'https://example.com/lecture.mp4')
+        self.assertEqual(get_catalog_version(), self.version)
+
+        self.save(self.lecture, duration=120)
+        self.assertNotEqual(get_catalog_version(), self.version)
+
+    def test_category_rename_refreshes_its_courses(self):
+        self.save(self.category, name='Web Development')
+        self.assertEqual(self.document(self.source)['category']['name'], 'Web Development')
+        self.assertNotEqual(get_catalog_version(), self.version)
+
+    def test_instructor_profile(self):
+        self.save(self.instructor, full_name='Renamed Instructor')
+        self.assertEqual(self.document(self.target)['instructor']['full_name'], 'Renamed Instructor')
+        version = get_catalog_version()
+        self.assertNotEqual(version, self.version)
+
+        # A password change touches nothing public
+        with self.captureOnCommitCallbacks(execute=True):
+            self.instructor.set_password('new password')
+            self.instructor.save(update_fields=['password'])
+        self.assertEqual(get_catalog_version(), version)
+
+    def test_nothing_is_refreshed_before_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.target.title = 'Uncommitted'
+            self.target.save()
+        self.assertEqual(self.document(self.target)['title'], 'Target')
+        self.assertEqual(get_catalog_version(), self.version)
+        self.assertTrue(callbacks)
@@ -5,6 +5,7 @@ from . import views
 urlpatterns = [
     # Public course endpoints
     path('courses/', views.CourseListView.as_view(), name='course-list'),
+    path('courses/suggest/', views.CourseSuggestView.as_view(), name='course-suggest'),
     path('courses/<int:pk>/', views.CourseDetailView.as_view(), name='course-detail'),
     path('categories/', views.CategoryListCreateView.as_view(), name='category-list'),
     path('categories/<int:pk>/', views.CategoryDetailView.as_view(), name='category-detail'),
@@ -1,44 +1,37 @@
 # courses/views.py
-from rest_framework import generics, permissions, filters, status
+from rest_framework import generics, permissions, filters
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.renderers import JSONRenderer
 from django_filters.rest_framework import DjangoFilterBackend
-from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from .models import Category, Course, Module, Lecture
+from .cache import catalog_cache_key, CATALOG_CACHE_TIMEOUT, CATALOG_LOCAL_TIMEOUT
+from .documents import get_document
 from .serializers import (
-    CategorySerializer, CourseListSerializer, CourseDetailSerializer,
+    CategorySerializer, CourseListSerializer, CourseListRatingSerializer, CourseDetailSerializer,
     CourseCreateUpdateSerializer, ModuleCreateUpdateSerializer,
     LectureCreateUpdateSerializer
 )
 from accounts.permissions import IsInstructor, IsAdminOrReadOnly
-
-
-def safe_cache_get(key):
-    try:
-        return cache.get(key)
-    except Exception:
-        return None
-
-
-def safe_cache_set(key, value, timeout=300):
-    try:
-        cache.set(key, value, timeout=timeout)
-    except Exception:
-        pass
-
-
-def safe_cache_delete(key):
-    try:
-        cache.delete(key)
-    except Exception:
-        pass
+from ocms import cache
+from ocms.pagination import KeysetPagination
+from .facets import facet_counts
+from .search import CourseSearchFilter, is_searching
+from .suggest import suggest, SUGGEST_LIMIT, SUGGEST_MAX_LIMIT
 
 # Category Views
 class CategoryListCreateView(generics.ListCreateAPIView):
+    """Category listing - rendered JSON cached under the catalog version"""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [filters.SearchFilter]
     search_fields = ['name']
+    cache_params = ['search', 'page']
     
     def perform_create(self, serializer):
         # Only instructors and admins can create categories
@@ -46,6 +39,19 @@ class CategoryListCreateView(generics.ListCreateAPIView):
             serializer.save()
         else:
             self.permission_denied(self.request)
+    
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+        
+        cache_key = catalog_cache_key(
+            request.query_params, self.cache_params, namespace='categories', origin=request.build_absolute_uri('/')
+        )
+        body = cache.get_or_compute(
+            cache_key, lambda: JSONRenderer().render(super(CategoryListCreateView, self).list(request, *args, **kwargs).data),
+            timeout=CATALOG_CACHE_TIMEOUT, local_timeout=CATALOG_LOCAL_TIMEOUT
+        )
+        return HttpResponse(body, content_type='application/json')
 
 class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Category.objects.all()
@@ -54,30 +60,117 @@ class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 # Course Views
 class CourseListView(generics.ListAPIView):
-    """Public course listing - cached"""
+    """
+    Public course listing - cached
+    Rendered JSON is cached per (filters, search, ordering, cursor) under the
+    catalog version, so warm hits skip the ORM and the serializer entirely.
+    Keyset-paginated on (ordering field, id). `?facets=1` adds facet counts
+    for the filtered set, cached separately so paging does not recount.
+    """
     serializer_class = CourseListSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, CourseSearchFilter, filters.OrderingFilter]
     filterset_fields = ['level', 'category', 'price']
-    search_fields = ['title', 'description']
     ordering_fields = ['price', 'created_at', 'title']
+    ordering = ['-created_at']
+    cache_params = ['level', 'category', 'price', 'search', 'ordering', 'cursor', 'page_size', 'count', 'include', 'facets']
+    facet_params = ['level', 'category', 'price', 'search']
+    
+    def include_rating(self):
+        return 'rating' in self.request.query_params.get('include', '').split(',')
+    
+    def get_serializer_class(self):
+        if self.include_rating():
+            return CourseListRatingSerializer
+        return CourseListSerializer
+    
+    def get_keyset_ordering(self, request):
+        # Full-text matches are ranked unless the client picked an ordering
+        if is_searching(request) and not request.query_params.get('ordering'):
+            return '-search_rank'
+        return None
     
     def get_queryset(self):
-        # Try to get from cache first
-        cache_key = 'published_courses'
-        queryset = safe_cache_get(cache_key)
+        queryset = Course.objects.filter(is_published=True).select_related('instructor', 'category')
+        if self.include_rating():
+            queryset = queryset.select_related('rating_stats')
+        return queryset
+    
+    def include_facets(self):
+        return self.request.query_params.get('facets', '').lower() in ('1', 'true')
+    
+    def get_facets(self):
+        cache_key = catalog_cache_key(self.request.query_params, self.facet_params, namespace='catalog_facets')
+        return cache.get_or_compute(
+            cache_key, lambda: facet_counts(self.filter_queryset(self.get_queryset())),
+            timeout=CATALOG_CACHE_TIMEOUT, local_timeout=CATALOG_LOCAL_TIMEOUT
+        )
+    
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.include_facets():
+            response.data['facets'] = self.get_facets()
+        return response
+    
+    def list(self, request, *args, **kwargs):
+        # Browsable API and other renderers bypass the byte cache
+        if request.accepted_renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
         
-        if not queryset:
-            queryset = Course.objects.filter(is_published=True).select_related('instructor', 'category').prefetch_related('modules__lectures')
-            safe_cache_set(cache_key, queryset, timeout=300)  # Cache for 5 minutes
+        # Errors (bad cursor, bad filter) raise out of list() and are never cached
+        # next/previous links are absolute, so the key includes the host
+        cache_key = catalog_cache_key(request.query_params, self.cache_params, origin=request.build_absolute_uri('/'))
+        body = cache.get_or_compute(
+            cache_key, lambda: JSONRenderer().render(super(CourseListView, self).list(request, *args, **kwargs).data),
+            timeout=CATALOG_CACHE_TIMEOUT, local_timeout=CATALOG_LOCAL_TIMEOUT
+        )
+        return HttpResponse(body, content_type='application/json')
+
+class CourseSuggestView(APIView):
+    """
+    Search-box suggestions for course titles and categories
+    Served from the in-process prefix index in courses/suggest.py, no DB access.
+    """
+    permission_classes = [permissions.AllowAny]
+    
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit', SUGGEST_LIMIT))
+        except ValueError:
+            limit = SUGGEST_LIMIT
+        limit = max(1, min(limit, SUGGEST_MAX_LIMIT))
         
-        return queryset
+        text = request.query_params.get('q', '')
+        return Response({'query': text, 'results': suggest(text, limit)})
 
 class CourseDetailView(generics.RetrieveAPIView):
-    """Public course detail"""
+    """
+    Public course detail
+    Served as the pre-rendered document from courses/documents.py (L1, Redis,
+    then one row read); supports If-None-Match.
+    """
     queryset = Course.objects.filter(is_published=True).select_related('instructor', 'category').prefetch_related('modules__lectures')
     serializer_class = CourseDetailSerializer
     permission_classes = [permissions.AllowAny]
+    
+    def retrieve(self, request, *args, **kwargs):
+        # Browsable API and other renderers go through the serializer
+        if request.accepted_renderer.format != 'json':
+            return super().retrieve(request, *args, **kwargs)
+        
+        document = get_document(kwargs['pk'])
+        if document is None:
+            raise Http404
+        etag, body = document
+        
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
 
 class InstructorCourseListView(generics.ListCreateAPIView):
     """Instructor's courses"""
@@ -92,7 +185,7 @@ class InstructorCourseListView(generics.ListCreateAPIView):
         return CourseListSerializer
     
     def get_queryset(self):
-        return Course.objects.filter(instructor=self.request.user).select_related('category')
+        return Course.objects.filter(instructor=self.request.user).select_related('instructor', 'category')
     
     def perform_create(self, serializer):
         serializer.save(instructor=self.request.user)
@@ -108,16 +201,6 @@ class InstructorCourseDetailView(generics.RetrieveUpdateDestroyAPIView):
     
     def get_queryset(self):
         return Course.objects.filter(instructor=self.request.user)
-    
-    def perform_update(self, serializer):
-        # Clear cache when course is updated
-        safe_cache_delete('published_courses')
-        serializer.save()
-    
-    def perform_destroy(self, instance):
-        # Clear cache when course is deleted
-        safe_cache_delete('published_courses')
-        instance.delete()
 
 # Module Views
 class ModuleListCreateView(generics.ListCreateAPIView):
@@ -128,12 +211,11 @@ class ModuleListCreateView(generics.ListCreateAPIView):
         course_id = self.kwargs['course_id']
         return Module.objects.filter(course_id=course_id, course__instructor=self.request.user)
     
+    @transaction.atomic
     def perform_create(self, serializer):
         course_id = self.kwargs['course_id']
         course = Course.objects.get(id=course_id, instructor=self.request.user)
         serializer.save(course=course)
-        # Clear cache
-        safe_cache_delete('published_courses')
 
 class ModuleDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated, IsInstructor]
@@ -142,12 +224,12 @@ class ModuleDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return Module.objects.filter(course__instructor=self.request.user)
     
+    @transaction.atomic
     def perform_update(self, serializer):
-        safe_cache_delete('published_courses')
         serializer.save()
     
+    @transaction.atomic
     def perform_destroy(self, instance):
-        safe_cache_delete('published_courses')
         instance.delete()
 
 # Lecture Views
@@ -162,11 +244,11 @@ class LectureListCreateView(generics.ListCreateAPIView):
             module__course__instructor=self.request.user
         )
     
+    @transaction.atomic
     def perform_create(self, serializer):
         module_id = self.kwargs['module_id']
         module = Module.objects.get(id=module_id, course__instructor=self.request.user)
         serializer.save(module=module)
-        safe_cache_delete('published_courses')
 
 class LectureDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated, IsInstructor]
@@ -175,10 +257,10 @@ class LectureDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return Lecture.objects.filter(module__course__instructor=self.request.user)
     
+    @transaction.atomic
     def perform_update(self, serializer):
-        safe_cache_delete('published_courses')
         serializer.save()
     
+    @transaction.atomic
     def perform_destroy(self, instance):
-        safe_cache_delete('published_courses')
         instance.delete()
@@ -0,0 +1,119 @@
+# dashboard/activity.py
+import json
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from accounts.models import User
+from courses.models import Course
+from .models import ActivityEvent
+
+# Server-sent events tailing, read with fetch() streaming (see AdminActivityStreamView)
+STREAM_POLL_SECONDS = 1
+STREAM_HEARTBEAT_SECONDS = 15
+# Each open stream holds a worker and its DB connection, so on sync workers
+# streams end after this long and the client reconnects with Last-Event-ID.
+# Deployments on async or gevent workers can raise ACTIVITY_STREAM_MAX_SECONDS.
+STREAM_MAX_SECONDS = 25
+# Ids are assigned before commit, so a slow transaction can surface an id
+# below one already sent. Re-read this window and skip ids already sent.
+STREAM_GRACE = timedelta(seconds=10)
+
+
+def _related(instance, name, model, fields):
+    """Values of a FK target, from the instance cache when loaded, else one query"""
+    if getattr(type(instance), name).is_cached(instance):
+        target = getattr(instance, name)
+        return {field: getattr(target, field) for field in fields}
+    return model.objects.filter(pk=getattr(instance, f'{name}_id')).values(*fields).first() or {}
+
+
+def record_enrollments(course, students, when=None):
+    when = when or timezone.now()
+    ActivityEvent.objects.bulk_create(
+        ActivityEvent(
+            type='enrollment', description=f"Enrolled in {course.title}",
+            user_id=student.id, user_name=student.full_name, course_id=course.id, created_at=when
+        )
+        for student in students
+    )
+
+
+def record_enrollment(enrollment):
+    student = _related(enrollment, 'student', User, ['full_name'])
+    course = _related(enrollment, 'course', Course, ['title'])
+    ActivityEvent.objects.create(
+        type='enrollment', description=f"Enrolled in {course.get('title', '')}",
+        user_id=enrollment.student_id, user_name=student.get('full_name', ''),
+        course_id=enrollment.course_id, created_at=enrollment.enrolled_at
+    )
+
+
+def record_review(review):
+    student = _related(review, 'student', User, ['full_name'])
+    course = _related(review, 'course', Course, ['title'])
+    ActivityEvent.objects.create(
+        type='review', description=f"Reviewed {course.get('title', '')} - {review.rating}★",
+        user_id=review.student_id, user_name=student.get('full_name', ''),
+        course_id=review.course_id, created_at=review.created_at
+    )
+
+
+def record_course_published(course):
+    instructor = _related(course, 'instructor', User, ['full_name'])
+    ActivityEvent.objects.create(
+        type='course', description=f"New course: {course.title}",
+        user_id=course.instructor_id, user_name=instructor.get('full_name', ''), course_id=course.id
+    )
+
+
+def latest_event_id():
+    return ActivityEvent.objects.aggregate(latest=Max('id'))['latest'] or 0
+
+
+def _sse(event):
+    payload = {
+        'id': event.id,
+        'type': event.type,
+        'description': event.description,
+        'user_name': event.user_name,
+        'timestamp': event.created_at.isoformat(),
+    }
+    return f"id: {event.id}\nevent: activity\ndata: {json.dumps(payload)}\n\n"
+
+
+def stream_events(last_id):
+    """
+    Generator of server-sent events for activity after `last_id`, polling the
+    (created_at, id) index once a second. Comment lines keep idle proxies open.
+    """
+    deadline = time.monotonic() + getattr(settings, 'ACTIVITY_STREAM_MAX_SECONDS', STREAM_MAX_SECONDS)
+    last_write = time.monotonic()
+    # Events at or before last_id were delivered on a previous connection
+    sent = dict(
+        ActivityEvent.objects.filter(id__lte=last_id, created_at__gte=timezone.now() - STREAM_GRACE)
+        .values_list('id', 'created_at')
+    )
+    yield "retry: 3000\n\n"
+
+    while time.monotonic() < deadline:
+        since = timezone.now() - STREAM_GRACE
+        # Exclude what was already sent before the LIMIT, or re-read grace rows could fill it
+        events = list(
+            ActivityEvent.objects.filter(Q(id__gt=last_id) | Q(created_at__gte=since))
+            .exclude(id__in=list(sent)).order_by('id')[:100]
+        )
+        for event in events:
+            sent[event.id] = event.created_at
+            last_id = max(last_id, event.id)
+            last_write = time.monotonic()
+            yield _sse(event)
+        sent = {pk: created_at for pk, created_at in sent.items() if created_at >= since}
+
+        if time.monotonic() - last_write >= STREAM_HEARTBEAT_SECONDS:
+            last_write = time.monotonic()
+            yield ": keepalive\n\n"
+        time.sleep(STREAM_POLL_SECONDS)
@@ -1,13 +1,10 @@
 # dashboard/admin.py
 from django.contrib import admin
-from django.core.cache import cache
 from django.shortcuts import render
 from django.urls import path
-from django.db.models import Count, Avg
-from accounts.models import User
-from courses.models import Course
 from enrollments.models import Enrollment
 from reviews.models import Review
+from .analytics import platform_stats
 
 class DashboardAdmin(admin.AdminSite):
     site_header = 'OCMS Administration'
@@ -22,23 +19,19 @@ class DashboardAdmin(admin.AdminSite):
         return custom_urls + urls
     
     def dashboard_view(self, request):
-        # Get statistics
-        total_students = User.objects.filter(role='STUDENT').count()
-        total_instructors = User.objects.filter(role='INSTRUCTOR').count()
-        total_courses = Course.objects.count()
-        total_enrollments = Enrollment.objects.count()
-        total_reviews = Review.objects.count()
+        # Get statistics from the platform counters
+        stats = platform_stats()
         
         # Get recent activities
         recent_enrollments = Enrollment.objects.select_related('student', 'course').order_by('-enrolled_at')[:5]
         recent_reviews = Review.objects.select_related('student', 'course').order_by('-created_at')[:5]
         
         context = {
-            'total_students': total_students,
-            'total_instructors': total_instructors,
-            'total_courses': total_courses,
-            'total_enrollments': total_enrollments,
-            'total_reviews': total_reviews,
+            'total_students': stats['total_students'],
+            'total_instructors': stats['total_instructors'],
+            'total_courses': stats['all_courses'],
+            'total_enrollments': stats['total_enrollments'],
+            'total_reviews': stats['total_reviews'],
             'recent_enrollments': recent_enrollments,
             'recent_reviews': recent_reviews,
         }
@@ -0,0 +1,138 @@
+# dashboard/analytics.py
+import random
+
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+
+from accounts.models import User
+from courses.models import Course
+from enrollments.models import Enrollment
+from reviews.models import Review
+from ocms import cache
+from .models import DailyCourseStats, PlatformCounter
+
+COUNTER_SLOTS = 8
+
+STUDENTS = 'students'
+INSTRUCTORS = 'instructors'
+COURSES = 'courses'
+PUBLISHED_COURSES = 'published_courses'
+ENROLLMENTS = 'enrollments'
+REVIEWS = 'reviews'
+RATING_SUM = 'rating_sum'
+
+ROLE_COUNTERS = {'STUDENT': STUDENTS, 'INSTRUCTOR': INSTRUCTORS}
+
+INSTRUCTOR_SNAPSHOT_TIMEOUT = 600
+
+
+def increment(name, delta=1):
+    """Add delta to a random slot of the named counter (inside the caller's transaction)"""
+    if not delta:
+        return
+    slot = random.randrange(COUNTER_SLOTS)
+    slot_row = PlatformCounter.objects.filter(name=name, slot=slot)
+    if not slot_row.update(value=F('value') + delta):
+        PlatformCounter.objects.bulk_create([PlatformCounter(name=name, slot=slot)], ignore_conflicts=True)
+        slot_row.update(value=F('value') + delta)
+
+
+def platform_totals():
+    """All platform counters in one small GROUP BY over at most names x slots rows"""
+    totals = dict.fromkeys([STUDENTS, INSTRUCTORS, COURSES, PUBLISHED_COURSES, ENROLLMENTS, REVIEWS, RATING_SUM], 0)
+    rows = PlatformCounter.objects.order_by().values('name').annotate(total=Sum('value'))
+    totals.update((row['name'], row['total']) for row in rows)
+    return totals
+
+
+def platform_stats():
+    totals = platform_totals()
+    reviews = totals[REVIEWS]
+    return {
+        'total_students': totals[STUDENTS],
+        'total_instructors': totals[INSTRUCTORS],
+        'total_courses': totals[PUBLISHED_COURSES],
+        'total_enrollments': totals[ENROLLMENTS],
+        'total_reviews': reviews,
+        'average_rating': round(totals[RATING_SUM] / reviews, 2) if reviews else 0,
+        'all_courses': totals[COURSES],
+    }
+
+
+def rebuild_platform_counters():
+    """Recount every counter from the source tables, collapsing the slots"""
+    values = {
+        STUDENTS: User.objects.filter(role='STUDENT').count(),
+        INSTRUCTORS: User.objects.filter(role='INSTRUCTOR').count(),
+        COURSES: Course.objects.count(),
+        PUBLISHED_COURSES: Course.objects.filter(is_published=True).count(),
+        ENROLLMENTS: Enrollment.objects.count(),
+        REVIEWS: Review.objects.count(),
+        RATING_SUM: Review.objects.aggregate(total=Sum('rating'))['total'] or 0,
+    }
+    PlatformCounter.objects.all().delete()
+    PlatformCounter.objects.bulk_create(
+        PlatformCounter(name=name, slot=0, value=value) for name, value in values.items()
+    )
+    return values
+
+
+# Instructor dashboard
+#
+# A per-instructor snapshot, computed in two queries whatever the number of
+# courses and dropped by dashboard/signals.py on that instructor's course,
+# enrollment and review writes.
+
+def instructor_snapshot_key(instructor_id):
+    return f'instructor_dashboard_{instructor_id}'
+
+
+def _per_instructor(queryset, group_field, aggregate):
+    """Correlated scalar aggregate over one instructor's rows"""
+    return Subquery(queryset.order_by().values(group_field).annotate(value=aggregate).values('value')[:1])
+
+
+def compute_instructor_stats(instructor_id):
+    courses = Course.objects.filter(instructor_id=OuterRef('pk'))
+    totals = User.objects.filter(pk=instructor_id).annotate(
+        total_courses=_per_instructor(courses, 'instructor_id', Count('id')),
+        rating_sum=_per_instructor(courses, 'instructor_id', Sum('rating_stats__rating_sum')),
+        rating_count=_per_instructor(courses, 'instructor_id', Sum('rating_stats__rating_count')),
+        total_students=_per_instructor(
+            Enrollment.objects.filter(course__instructor_id=OuterRef('pk')),
+            'course__instructor_id', Count('student_id', distinct=True)
+        ),
+        total_revenue=_per_instructor(
+            DailyCourseStats.objects.filter(instructor_id=OuterRef('pk')), 'instructor_id', Sum('revenue')
+        ),
+    ).values('total_courses', 'rating_sum', 'rating_count', 'total_students', 'total_revenue').first() or {}
+
+    recent = (
+        Course.objects.filter(instructor_id=instructor_id)
+        .order_by('-created_at')
+        .values('id', 'title', 'enrollment_count', 'average_rating')[:5]
+    )
+    rating_count = totals.get('rating_count') or 0
+    return {
+        'total_courses': totals.get('total_courses') or 0,
+        'total_students': totals.get('total_students') or 0,
+        'total_revenue': float(totals.get('total_revenue') or 0),
+        'average_rating': round(totals['rating_sum'] / rating_count, 2) if rating_count else 0,
+        'recent_courses': [
+            {
+                'id': course['id'],
+                'title': course['title'],
+                'enrollments': course['enrollment_count'],
+                'rating': float(course['average_rating'])
+            }
+            for course in recent
+        ]
+    }
+
+
+def instructor_stats(instructor_id):
+    return cache.get_or_compute(
+        instructor_snapshot_key(instructor_id), lambda: compute_instructor_stats(instructor_id),
+        timeout=INSTRUCTOR_SNAPSHOT_TIMEOUT
+    )
+
+
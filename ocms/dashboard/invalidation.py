@@ -0,0 +1,32 @@
+# dashboard/invalidation.py
+from courses.models import Course
+from enrollments.models import Enrollment
+from ocms.invalidation import rule
+from reviews.models import Review
+from .analytics import instructor_snapshot_key
+
+
+def _instructor_of(instance):
+    """Instructor of the course behind an enrollment or review"""
+    if type(instance).course.is_cached(instance):
+        return instance.course.instructor_id
+    return Course.objects.filter(pk=instance.course_id).values_list('instructor_id', flat=True).first()
+
+
+@rule(Course, watch=('instructor_id',))
+def course_dashboard_targets(change):
+    # Snapshots list the instructor's recent courses; a reassigned course moves between two
+    for instructor_id in {change.instance.instructor_id, change.before('instructor_id')}:
+        yield instructor_snapshot_key(instructor_id)
+
+
+@rule(Enrollment)
+def enrollment_dashboard_targets(change):
+    if change.created or change.deleted:
+        yield instructor_snapshot_key(_instructor_of(change.instance))
+
+
+@rule(Review, watch=('rating',))
+def review_dashboard_targets(change):
+    if change.changed('rating'):
+        yield instructor_snapshot_key(_instructor_of(change.instance))
@@ -0,0 +1,38 @@
+# dashboard/management/commands/backfill_rollups.py
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from dashboard.rollups import rebuild
+from enrollments.models import Enrollment
+
+
+class Command(BaseCommand):
+    help = ('Rebuild the daily course rollups (enrollments, completions, reviews, revenue) from the '
+            'source tables. Idempotent: each chunk of days is replaced in its own transaction.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, help='First day (default: first enrollment)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last day (default: today)')
+        parser.add_argument('--chunk-days', type=int, default=31)
+
+    def handle(self, *args, **options):
+        end = options['end'] or timezone.localdate()
+        start = options['start']
+        if start is None:
+            first = Enrollment.objects.aggregate(first=Min('enrolled_at'))['first']
+            start = timezone.localdate(first) if first else end
+        if start > end:
+            raise CommandError('--start is after --end')
+
+        chunk = timedelta(days=max(1, options['chunk_days']))
+        total = 0
+        while start <= end:
+            chunk_end = min(end, start + chunk - timedelta(days=1))
+            rows = rebuild(start, chunk_end)
+            total += rows
+            self.stdout.write(f'{start} .. {chunk_end}: {rows} course-days')
+            start = chunk_end + timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {total} course-days'))
@@ -0,0 +1,327 @@
+# dashboard/management/commands/benchmark_endpoints.py
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from courses.models import Category, Course, Lecture, Module
+from enrollments.models import Enrollment, LectureProgress
+from reviews.models import Review
+
+# Routes left out of the run: the Django admin and the long-lived SSE stream
+SKIP_PREFIXES = ('admin/', 'api/admin/recent-activity/stream/', '^static/')
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _routes(patterns=None, prefix=''):
+    """Every concrete route pattern of the project urlconf, e.g. 'api/courses/<int:pk>/'"""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from _routes(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern):
+            yield route
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class _QueryCounter:
+    """connection.execute_wrapper hook; cheaper than CaptureQueriesContext inside the timed loop"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = ('Drive every API route through the test client against a seeded dataset (see seed_data) '
+            'and report p50/p95 latency, queries and peak allocations per endpoint. Writes are rolled back. '
+            '--save writes a JSON baseline, --baseline compares a run against one.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='seed', help='Dataset prefix passed to seed_data')
+        parser.add_argument('--iterations', type=int, default=30, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per endpoint first')
+        parser.add_argument('--alloc-iterations', type=int, default=3, help='Requests traced for allocations')
+        parser.add_argument('--only', nargs='+', default=[], help='Run only benchmarks whose name contains one of these')
+        parser.add_argument('--save', metavar='PATH', help='Write results as a JSON baseline')
+        parser.add_argument('--baseline', metavar='PATH', help='Compare against a saved baseline')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Relative p95 slowdown vs the baseline reported as a regression')
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        data = self._dataset(options['prefix'])
+        self._users = {role: data[role] for role in ('student', 'instructor', 'admin')}
+        self._clients = {}
+        specs = self._specs(data)
+
+        covered = {route for route, *_ in specs}
+        for route in _routes():
+            if not route.startswith(SKIP_PREFIXES) and route not in covered:
+                self.stderr.write(self.style.WARNING(f'No benchmark for route {route!r}'))
+
+        specs = [spec for spec in specs if not options['only'] or any(part in self._name(spec) for part in options['only'])]
+        if not specs:
+            raise CommandError('No benchmarks selected')
+
+        results = {}
+        for spec in specs:
+            results[self._name(spec)] = self._run(spec, options)
+
+        self._report(results)
+        if options['save']:
+            with open(options['save'], 'w') as fp:
+                json.dump({
+                    'created_at': timezone.now().isoformat(),
+                    'database': connection.vendor,
+                    'python': platform.python_version(),
+                    'iterations': options['iterations'],
+                    'results': results,
+                }, fp, indent=2, sort_keys=True)
+            self.stdout.write(f"Baseline written to {options['save']}")
+        if options['baseline']:
+            regressions = self._compare(results, options['baseline'], options['tolerance'], partial=bool(options['only']))
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f'{regressions} endpoints regressed against the baseline')
+
+    def _name(self, spec):
+        route, method, role, path = spec[:4]
+        query = path.partition('?')[2]
+        return f"{method} /{route}{'?' + query if query else ''} [{role}]"
+
+    # Dataset
+
+    def _dataset(self, prefix):
+        users = User.objects.filter(email__startswith=f'{prefix}-')
+        student = (users.filter(role='STUDENT').annotate(n=Count('enrollments')).order_by('-n', 'id').first())
+        instructor = (users.filter(role='INSTRUCTOR').annotate(n=Count('courses_taught')).order_by('-n', 'id').first())
+        admin = users.filter(role='ADMIN').order_by('id').first()
+        if not (student and instructor and admin):
+            raise CommandError(f'No seeded dataset "{prefix}"; run seed_data first')
+
+        enrollment = (Enrollment.objects.filter(student=student, course__lecture_count__gt=0)
+                      .order_by('-course__lecture_count', 'id').first())
+        if enrollment is None:
+            raise CommandError('The benchmark student has no enrollments; seed more data')
+        course = enrollment.course
+        done = LectureProgress.objects.filter(enrollment=enrollment, completed=True).values_list('lecture_id', flat=True)
+        lecture = Lecture.objects.filter(module__course=course).exclude(id__in=done).order_by('id').first() \
+            or Lecture.objects.filter(module__course=course).order_by('id').first()
+        own_course = Course.objects.filter(instructor=instructor).order_by('-lecture_count', 'id').first()
+        module = Module.objects.filter(course=own_course).order_by('order').first()
+        return {
+            'student': student,
+            'instructor': instructor,
+            'admin': admin,
+            'course': course,
+            'lecture': lecture,
+            'unenrolled': Course.objects.filter(is_published=True).exclude(enrollments__student=student)
+                                        .order_by('-enrollment_count', 'id').first(),
+            'review': Review.objects.filter(student=student).order_by('id').first(),
+            'own_course': own_course,
+            'module': module,
+            'own_lecture': Lecture.objects.filter(module=module).order_by('order').first(),
+            'category': Category.objects.order_by('id').first(),
+            'new_students': list(users.filter(role='STUDENT').exclude(enrollments__course=own_course)
+                                 .order_by('id').values_list('id', flat=True)[:20]),
+            'refresh': str(RefreshToken.for_user(student)),
+        }
+
+    def _specs(self, d):
+        """(route, method, role, path, payload) per benchmark; payload may be a callable for per-request data"""
+        course, lecture, own_course, module = d['course'], d['lecture'], d['own_course'], d['module']
+        review_id = d['review'].id if d['review'] else 0
+        own_lecture_id = d['own_lecture'].id if d['own_lecture'] else 0
+        unenrolled_id = d['unenrolled'].id if d['unenrolled'] else course.id
+
+        def events():
+            return {'events': [{'event_id': uuid.uuid4().hex, 'lecture_id': lecture.id, 'type': 'complete'}]}
+
+        def register():
+            return {'email': f'bench-{uuid.uuid4().hex[:12]}@example.com', 'full_name': 'Bench User',
+                    'password': 'benchmark-pass', 'password2': 'benchmark-pass', 'role': 'STUDENT'}
+
+        return [
+            # Accounts
+            ('api/auth/register/', 'post', 'anon', '/api/auth/register/', register),
+            ('api/auth/login/', 'post', 'anon', '/api/auth/login/',
+             {'email': d['student'].email, 'password': 'benchmark-pass'}),
+            ('api/auth/logout/', 'post', 'student', '/api/auth/logout/', {}),
+            ('api/auth/refresh/', 'post', 'anon', '/api/auth/refresh/', {'refresh': d['refresh']}),
+            ('api/auth/profile/', 'get', 'student', '/api/auth/profile/', None),
+            ('api/auth/profile/', 'put', 'student', '/api/auth/profile/', {'full_name': 'Renamed Student'}),
+            # Catalog
+            ('api/courses/', 'get', 'anon', '/api/courses/', None),
+            ('api/courses/', 'get', 'anon', f"/api/courses/?category={d['category'].id}&ordering=price", None),
+            ('api/courses/', 'get', 'anon', '/api/courses/?search=python&facets=1', None),
+            ('api/courses/suggest/', 'get', 'anon', '/api/courses/suggest/?q=da', None),
+            ('api/courses/<int:pk>/', 'get', 'anon', f'/api/courses/{course.id}/', None),
+            ('api/categories/', 'get', 'anon', '/api/categories/', None),
+            ('api/categories/<int:pk>/', 'get', 'anon', f"/api/categories/{d['category'].id}/", None),
+            # Instructor authoring
+            ('api/instructor/courses/', 'get', 'instructor', '/api/instructor/courses/', None),
+            ('api/instructor/courses/<int:pk>/', 'get', 'instructor', f'/api/instructor/courses/{own_course.id}/', None),
+            ('api/instructor/courses/<int:pk>/', 'patch', 'instructor', f'/api/instructor/courses/{own_course.id}/',
+             {'title': 'Renamed Course'}),
+            ('api/instructor/courses/<int:course_id>/modules/', 'get', 'instructor',
+             f'/api/instructor/courses/{own_course.id}/modules/', None),
+            ('api/instructor/modules/<int:pk>/', 'get', 'instructor', f'/api/instructor/modules/{module.id}/', None),
+            ('api/instructor/modules/<int:module_id>/lectures/', 'get', 'instructor',
+             f'/api/instructor/modules/{module.id}/lectures/', None),
+            ('api/instructor/modules/<int:module_id>/lectures/', 'post', 'instructor',
+             f'/api/instructor/modules/{module.id}/lectures/', {'title': 'New Lecture', 'order': 99, 'duration': 300}),
+            ('api/instructor/lectures/<int:pk>/', 'get', 'instructor', f'/api/instructor/lectures/{own_lecture_id}/', None),
+            # Enrollment and progress
+            ('api/enroll/', 'post', 'student', '/api/enroll/', {'course_id': unenrolled_id}),
+            ('api/course/<int:course_id>/bulk-enroll/', 'post', 'instructor',
+             f'/api/course/{own_course.id}/bulk-enroll/', {'student_ids': d['new_students']}),
+            ('api/my-courses/', 'get', 'student', '/api/my-courses/', None),
+            ('api/my-courses/progress/', 'get', 'student', '/api/my-courses/progress/', None),
+            ('api/my-progress/', 'get', 'student', '/api/my-progress/', None),
+            ('api/course/<int:course_id>/progress/', 'get', 'student', f'/api/course/{course.id}/progress/', None),
+            ('api/lecture/<int:lecture_id>/complete/', 'post', 'student', f'/api/lecture/{lecture.id}/complete/', {}),
+            ('api/progress/events/', 'post', 'student', '/api/progress/events/', events),
+            # Reviews
+            ('api/courses/<int:course_id>/reviews/', 'get', 'anon', f'/api/courses/{course.id}/reviews/', None),
+            ('api/courses/<int:course_id>/rating/', 'get', 'anon', f'/api/courses/{course.id}/rating/', None),
+            ('api/courses/ratings/', 'get', 'anon', f'/api/courses/ratings/?ids={course.id},{unenrolled_id}', None),
+            ('api/courses/<int:course_id>/reviews/create/', 'post', 'student',
+             f'/api/courses/{course.id}/reviews/create/', {'rating': 4, 'comment': 'Benchmark review'}),
+            ('api/reviews/my/', 'get', 'student', '/api/reviews/my/', None),
+            ('api/reviews/<int:review_id>/', 'put', 'student', f'/api/reviews/{review_id}/',
+             {'rating': 5, 'comment': 'Updated benchmark review'}),
+            # Dashboards
+            ('api/admin/analytics/', 'get', 'admin', '/api/admin/analytics/', None),
+            ('api/admin/top-courses/', 'get', 'admin', '/api/admin/top-courses/', None),
+            ('api/admin/recent-activity/', 'get', 'admin', '/api/admin/recent-activity/', None),
+            ('api/analytics/timeseries/', 'get', 'admin', '/api/analytics/timeseries/?interval=week', None),
+            ('api/instructor/dashboard/', 'get', 'instructor', '/api/instructor/dashboard/', None),
+            ('api/student/dashboard/', 'get', 'student', '/api/student/dashboard/', None),
+            ('metrics', 'get', 'anon', '/metrics', None),
+            # Frontend pages
+            ('', 'get', 'anon', '/', None),
+            ('login/', 'get', 'anon', '/login/', None),
+            ('register/', 'get', 'anon', '/register/', None),
+            ('student-dashboard/', 'get', 'anon', '/student-dashboard/', None),
+            ('courses/', 'get', 'anon', '/courses/', None),
+            ('my-courses/', 'get', 'anon', '/my-courses/', None),
+        ]
+
+    # Measurement
+
+    def _client(self, role):
+        if role not in self._clients:
+            headers = {}
+            if role != 'anon':
+                token = RefreshToken.for_user(self._users[role]).access_token
+                headers['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+            self._clients[role] = Client(**headers)
+        return self._clients[role]
+
+    def _request(self, spec):
+        route, method, role, path, payload = spec
+        if callable(payload):
+            payload = payload()
+        client = self._client(role)
+        if payload is None:
+            return getattr(client, method)(path)
+        return getattr(client, method)(path, data=json.dumps(payload), content_type='application/json')
+
+    def _call(self, spec):
+        """One request; writes run in a savepoint that is always rolled back"""
+        if spec[1] == 'get':
+            return self._request(spec)
+        try:
+            with transaction.atomic():
+                response = self._request(spec)
+                raise _Rollback
+        except _Rollback:
+            return response
+
+    def _run(self, spec, options):
+        for _ in range(options['warmup']):
+            response = self._call(spec)
+        if options['warmup'] and response.status_code >= 400:
+            self.stderr.write(self.style.WARNING(f'{self._name(spec)} returned {response.status_code}'))
+
+        timings, queries = [], []
+        for _ in range(options['iterations']):
+            counter = _QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                response = self._call(spec)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(counter.count)
+
+        peaks = []
+        for _ in range(options['alloc_iterations']):
+            tracemalloc.start()
+            try:
+                self._call(spec)
+                peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+            finally:
+                tracemalloc.stop()
+
+        return {
+            'status': response.status_code,
+            'p50_ms': round(_percentile(timings, 0.5), 3),
+            'p95_ms': round(_percentile(timings, 0.95), 3),
+            'queries': max(queries),
+            'peak_kib': round(statistics.median(peaks), 1) if peaks else None,
+        }
+
+    def _report(self, results):
+        self.stdout.write(f"{'endpoint':<70} {'status':>6} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'peak KiB':>9}")
+        for name, row in results.items():
+            peak = '' if row['peak_kib'] is None else f"{row['peak_kib']:.1f}"
+            self.stdout.write(
+                f"{name:<70} {row['status']:>6} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['queries']:>8} {peak:>9}"
+            )
+
+    def _compare(self, results, path, tolerance, partial=False):
+        try:
+            with open(path) as fp:
+                baseline = json.load(fp)['results']
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f'Cannot read baseline {path}: {exc}')
+
+        regressions = 0
+        self.stdout.write('')
+        self.stdout.write(f"{'endpoint':<70} {'p50 Δ':>8} {'p95 Δ':>8} {'queries':>9}")
+        for name, row in results.items():
+            before = baseline.get(name)
+            if before is None:
+                self.stdout.write(f'{name:<70} {"new":>8}')
+                continue
+            p50 = (row['p50_ms'] - before['p50_ms']) / before['p50_ms'] if before['p50_ms'] else 0
+            p95 = (row['p95_ms'] - before['p95_ms']) / before['p95_ms'] if before['p95_ms'] else 0
+            regressed = p95 > tolerance or row['queries'] > before['queries']
+            regressions += regressed
+            line = f"{name:<70} {p50:>+8.0%} {p95:>+8.0%} {before['queries']:>4}→{row['queries']:<4}"
+            self.stdout.write(self.style.ERROR(line) if regressed else line)
+        for name in [] if partial else sorted(baseline.keys() - results.keys()):
+            self.stdout.write(f'{name:<70} {"missing":>8}')
+        return regressions
@@ -0,0 +1,19 @@
+# dashboard/management/commands/refresh_dashboard_stats.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from dashboard.analytics import platform_totals, rebuild_platform_counters
+
+
+class Command(BaseCommand):
+    help = ('Recount the platform dashboard counters from the source tables. Signals keep them '
+            'current; run this periodically (or after raw SQL / bulk imports) to correct drift.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            before = platform_totals()
+            after = rebuild_platform_counters()
+
+        for name, value in after.items():
+            drift = value - before.get(name, 0)
+            self.stdout.write(f"{name:<20} {value:>12} {'(drift %+d)' % drift if drift else ''}")
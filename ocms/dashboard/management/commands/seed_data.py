@@ -0,0 +1,189 @@
+# dashboard/management/commands/seed_data.py
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User
+from courses.cache import bump_catalog_version
+from courses.documents import rebuild_documents
+from courses.models import Category, Course, Module, Lecture
+from courses.search import update_search_vectors
+from courses.stats import refresh_course_counters
+from dashboard.analytics import rebuild_platform_counters
+from dashboard.rollups import rebuild as rebuild_rollups
+from enrollments.models import Enrollment, LectureProgress
+from reviews.models import Review
+from reviews.ratings import rebuild_course_ratings
+
+SEED_PASSWORD = 'benchmark-pass'
+LEVELS = [value for value, _ in Course.LEVEL_CHOICES]
+BATCH = 5000
+
+
+class Command(BaseCommand):
+    help = ('Seed a synthetic dataset (users by role, categories, courses with module/lecture fan-out, '
+            'enrollments, progress, reviews) with bulk inserts, then rebuild every denormalized counter. '
+            f'All seeded users share the password "{SEED_PASSWORD}".')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='seed', help='Email prefix identifying seeded users')
+        parser.add_argument('--flush', action='store_true', help='Delete a previous dataset with this prefix first')
+        parser.add_argument('--random-seed', type=int, default=42)
+        parser.add_argument('--students', type=int, default=2000)
+        parser.add_argument('--instructors', type=int, default=50)
+        parser.add_argument('--admins', type=int, default=2)
+        parser.add_argument('--categories', type=int, default=15)
+        parser.add_argument('--courses', type=int, default=300)
+        parser.add_argument('--modules', default='3-8', help='Modules per course, as min-max')
+        parser.add_argument('--lectures', default='3-10', help='Lectures per module, as min-max')
+        parser.add_argument('--enrollments', default='1-8', help='Enrollments per student, as min-max')
+        parser.add_argument('--completion', type=float, default=0.4, help='Mean fraction of lectures completed')
+        parser.add_argument('--review-rate', type=float, default=0.3, help='Fraction of enrollments reviewed')
+        parser.add_argument('--days', type=int, default=180, help='Spread activity over this many past days')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['random_seed'])
+        prefix = options['prefix']
+        existing = User.objects.filter(email__startswith=f'{prefix}-')
+        existing_categories = Category.objects.filter(slug__startswith=f'{prefix}-category-')
+
+        # Flush and seed together, so a failed seed leaves the previous dataset in place
+        with transaction.atomic():
+            if existing.exists() or existing_categories.exists():
+                if not options['flush']:
+                    raise CommandError(f'A dataset with prefix "{prefix}" exists; pass --flush or another --prefix')
+                # Courses, enrollments, progress and reviews cascade from their users
+                existing.delete()
+                existing_categories.delete()
+            counts = self._seed(options)
+        self._rebuild(counts['course_ids'], options['days'])
+
+        for name, value in counts.items():
+            if name != 'course_ids':
+                self.stdout.write(f'{name:<16} {value:>10}')
+        self.stdout.write(self.style.SUCCESS(f'Seeded dataset "{prefix}" (password "{SEED_PASSWORD}")'))
+
+    def _range(self, text):
+        low, _, high = text.partition('-')
+        return int(low), int(high or low)
+
+    def _when(self, days):
+        return timezone.now() - timedelta(seconds=self.rng.randrange(max(1, days * 86400)))
+
+    def _seed(self, options):
+        rng, prefix, days = self.rng, options['prefix'], options['days']
+        password = make_password(SEED_PASSWORD)
+
+        users = []
+        for role, count in (('STUDENT', options['students']), ('INSTRUCTOR', options['instructors']),
+                            ('ADMIN', options['admins'])):
+            users.extend(
+                User(email=f'{prefix}-{role.lower()}-{i}@example.com', full_name=f'{role.title()} {i}',
+                     role=role, password=password)
+                for i in range(count)
+            )
+        users = User.objects.bulk_create(users, batch_size=BATCH)
+        students = [user for user in users if user.role == 'STUDENT']
+        instructors = [user for user in users if user.role == 'INSTRUCTOR']
+        if not instructors and options['courses']:
+            raise CommandError('Courses need at least one instructor')
+
+        categories = Category.objects.bulk_create(
+            Category(name=f'Category {i}', slug=f'{prefix}-category-{i}') for i in range(options['categories'])
+        )
+        words = ['Python', 'Django', 'Data', 'Machine Learning', 'Web', 'SQL', 'Design', 'Cloud', 'Security', 'Testing']
+        courses = Course.objects.bulk_create(
+            (Course(
+                title=f'{rng.choice(words)} {rng.choice(["Basics", "in Depth", "Bootcamp", "Patterns"])} {i}',
+                description=f'Synthetic course {i} covering {rng.choice(words).lower()} and {rng.choice(words).lower()}.',
+                price=rng.choice([0, 9.99, 19.99, 49.99, 99.99, 149.99]),
+                level=rng.choice(LEVELS),
+                instructor=rng.choice(instructors),
+                category=rng.choice(categories) if categories else None,
+                is_published=rng.random() < 0.9,
+            ) for i in range(options['courses'])),
+            batch_size=BATCH
+        )
+
+        low, high = self._range(options['modules'])
+        modules = Module.objects.bulk_create(
+            (Module(course=course, title=f'Module {order}', order=order)
+             for course in courses for order in range(1, rng.randint(low, high) + 1)),
+            batch_size=BATCH
+        )
+        low, high = self._range(options['lectures'])
+        lectures = Lecture.objects.bulk_create(
+            (Lecture(module=module, title=f'Lecture {order}', order=order, duration=rng.randint(120, 1800),
+                     notes='Synthetic lecture notes.')
+             for module in modules for order in range(1, rng.randint(low, high) + 1)),
+            batch_size=BATCH
+        )
+        lectures_by_course = {}
+        module_course = {module.id: module.course_id for module in modules}
+        for lecture in lectures:
+            lectures_by_course.setdefault(module_course[lecture.module_id], []).append(lecture.id)
+
+        # Popularity follows a long tail: a few courses take most enrollments
+        published = [course for course in courses if course.is_published]
+        weights = [1 / (rank + 1) for rank in range(len(published))]
+        low, high = self._range(options['enrollments'])
+        enrollments, progress, reviews = [], [], []
+        for student in students:
+            picked = {course.id: course for course in rng.choices(published, weights, k=rng.randint(low, high))} if published else {}
+            for course in picked.values():
+                enrolled_at = self._when(days)
+                course_lectures = lectures_by_course.get(course.id, [])
+                done = [pk for pk in course_lectures if rng.random() < options['completion']]
+                finished = bool(course_lectures) and len(done) == len(course_lectures)
+                last_activity = enrolled_at + timedelta(hours=rng.randint(1, 240)) if done else None
+                enrollment = Enrollment(
+                    student=student, course=course, price_paid=course.price,
+                    status='COMPLETED' if finished else 'ACTIVE', completed_lectures=len(done),
+                    last_activity=last_activity, completed_at=last_activity if finished else None,
+                )
+                enrollment._done = done
+                enrollments.append(enrollment)
+                if rng.random() < options['review_rate']:
+                    reviews.append(Review(student=student, course=course, rating=rng.choices(range(1, 6), [1, 1, 3, 6, 8])[0],
+                                          comment='Synthetic review.'))
+
+        enrollments = Enrollment.objects.bulk_create(enrollments, batch_size=BATCH)
+        # enrolled_at is auto_now_add; spread it over the requested window afterwards
+        for enrollment in enrollments:
+            enrollment.enrolled_at = (enrollment.last_activity or timezone.now()) - timedelta(hours=rng.randint(1, 240))
+            progress.extend(
+                LectureProgress(enrollment_id=enrollment.id, lecture_id=lecture_id, completed=True,
+                                completed_at=enrollment.last_activity, position=0)
+                for lecture_id in enrollment._done
+            )
+        Enrollment.objects.bulk_update(enrollments, ['enrolled_at'], batch_size=BATCH)
+        LectureProgress.objects.bulk_create(progress, batch_size=BATCH)
+        Review.objects.bulk_create(reviews, batch_size=BATCH)
+
+        return {
+            'users': len(users),
+            'categories': len(categories),
+            'courses': len(courses),
+            'modules': len(modules),
+            'lectures': len(lectures),
+            'enrollments': len(enrollments),
+            'progress': len(progress),
+            'reviews': len(reviews),
+            'course_ids': [course.id for course in courses],
+        }
+
+    def _rebuild(self, course_ids, days):
+        """Bulk inserts skip signals; recompute everything they would have maintained"""
+        with transaction.atomic():
+            refresh_course_counters(course_ids)
+            rebuild_course_ratings(course_ids)
+            update_search_vectors(course_ids)
+            rebuild_platform_counters()
+            today = timezone.localdate()
+            rebuild_rollups(today - timedelta(days=days + 11), today)
+            rebuild_documents(course_ids)
+        bump_catalog_version()
@@ -0,0 +1,54 @@
+# Generated by Django 6.0.2 on 2026-10-17 23:40
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_counters(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    Course = apps.get_model('courses', 'Course')
+    Enrollment = apps.get_model('enrollments', 'Enrollment')
+    Review = apps.get_model('reviews', 'Review')
+    PlatformCounter = apps.get_model('dashboard', 'PlatformCounter')
+
+    values = {
+        'students': User.objects.filter(role='STUDENT').count(),
+        'instructors': User.objects.filter(role='INSTRUCTOR').count(),
+        'courses': Course.objects.count(),
+        'published_courses': Course.objects.filter(is_published=True).count(),
+        'enrollments': Enrollment.objects.count(),
+        'reviews': Review.objects.count(),
+        'rating_sum': Review.objects.aggregate(total=Sum('rating'))['total'] or 0,
+    }
+    PlatformCounter.objects.bulk_create(
+        PlatformCounter(name=name, slot=0, value=value) for name, value in values.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0002_index_audit'),
+        ('courses', '0006_popular_index'),
+        ('enrollments', '0006_index_audit'),
+        ('reviews', '0003_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('slot', models.PositiveSmallIntegerField()),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'dashboard_platformcounter',
+                'unique_together': {('name', 'slot')},
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
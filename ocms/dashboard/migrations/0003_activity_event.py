@@ -0,0 +1,70 @@
+# Generated by Django 6.0.2 on 2026-10-18 00:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+# Recent history carried over so the feed isn't empty after deploy
+BACKFILL_PER_TYPE = 1000
+
+
+def backfill_events(apps, schema_editor):
+    Enrollment = apps.get_model('enrollments', 'Enrollment')
+    Review = apps.get_model('reviews', 'Review')
+    Course = apps.get_model('courses', 'Course')
+    ActivityEvent = apps.get_model('dashboard', 'ActivityEvent')
+
+    events = []
+    for enrollment in Enrollment.objects.select_related('student', 'course').order_by('-enrolled_at')[:BACKFILL_PER_TYPE]:
+        events.append(ActivityEvent(
+            type='enrollment', description=f"Enrolled in {enrollment.course.title}",
+            user_id=enrollment.student_id, user_name=enrollment.student.full_name,
+            course_id=enrollment.course_id, created_at=enrollment.enrolled_at
+        ))
+    for review in Review.objects.select_related('student', 'course').order_by('-created_at')[:BACKFILL_PER_TYPE]:
+        events.append(ActivityEvent(
+            type='review', description=f"Reviewed {review.course.title} - {review.rating}★",
+            user_id=review.student_id, user_name=review.student.full_name,
+            course_id=review.course_id, created_at=review.created_at
+        ))
+    for course in Course.objects.filter(is_published=True).select_related('instructor').order_by('-created_at')[:BACKFILL_PER_TYPE]:
+        events.append(ActivityEvent(
+            type='course', description=f"New course: {course.title}",
+            user_id=course.instructor_id, user_name=course.instructor.full_name,
+            course_id=course.id, created_at=course.created_at
+        ))
+    # Oldest first so ids follow time like live inserts
+    events.sort(key=lambda event: event.created_at)
+    ActivityEvent.objects.bulk_create(events, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_popular_index'),
+        ('dashboard', '0002_daily_rollups'),
+        ('enrollments', '0007_enrollment_revenue'),
+        ('reviews', '0003_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('type', models.CharField(choices=[('enrollment', 'Enrollment'), ('review', 'Review'), ('course', 'Course')], max_length=20)),
+                ('description', models.CharField(max_length=255)),
+                ('user_name', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('course', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='courses.course')),
+                ('user', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'dashboard_activityevent',
+                'indexes': [models.Index(fields=['created_at', 'id'], name='dashboard_a_created_cb9da5_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_events, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,84 @@
 # dashboard/models.py
 from django.db import models
+from django.utils import timezone
 
-# This app doesn't need database tables
-# All analytics come from aggregation queries and Redis caching
-# Just create this file to make it a valid Django app
-pass
\ No newline at end of file
+# Platform-wide totals for the admin dashboards, maintained incrementally by
+# dashboard/signals.py (see dashboard/analytics.py). Per-course numbers live
+# in the denormalized counters on courses.Course.
+
+
+class PlatformCounter(models.Model):
+    """
+    One slot of a sharded counter. Writers bump a random slot so concurrent
+    enrollments don't queue on a single hot row; readers sum the slots.
+    """
+    name = models.CharField(max_length=50)
+    slot = models.PositiveSmallIntegerField()
+    value = models.BigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.name}[{self.slot}] = {self.value}"
+    
+    class Meta:
+        db_table = 'dashboard_platformcounter'
+        unique_together = ['name', 'slot']
+
+
+class DailyCourseStats(models.Model):
+    """
+    Per-course, per-day activity rollup for the time-series endpoints.
+    Instructor and category are copied in when the row is created so charts
+    for either scope are a range scan on (scope, day) with no joins.
+    Weekly series are summed from these rows at read time.
+    """
+    id = models.BigAutoField(primary_key=True)
+    course = models.ForeignKey('courses.Course', on_delete=models.CASCADE, related_name='daily_stats')
+    instructor = models.ForeignKey('accounts.User', on_delete=models.CASCADE, related_name='+', db_index=False)
+    category = models.ForeignKey('courses.Category', on_delete=models.SET_NULL, null=True, related_name='+', db_index=False)
+    day = models.DateField()
+    enrollments = models.IntegerField(default=0)
+    completions = models.IntegerField(default=0)
+    reviews = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    
+    def __str__(self):
+        return f"{self.course_id} @ {self.day}"
+    
+    class Meta:
+        db_table = 'dashboard_dailycoursestats'
+        unique_together = ['course', 'day']
+        indexes = [
+            models.Index(fields=['day']),
+            models.Index(fields=['instructor', 'day']),
+            models.Index(fields=['category', 'day']),
+        ]
+
+
+class ActivityEvent(models.Model):
+    """
+    Append-only log of platform activity behind the admin feed. Rows are
+    written by dashboard/activity.py and never updated; names and titles are
+    copied in so the feed is a single indexed query with no joins.
+    """
+    TYPE_CHOICES = (
+        ('enrollment', 'Enrollment'),
+        ('review', 'Review'),
+        ('course', 'Course'),
+    )
+    
+    id = models.BigAutoField(primary_key=True)
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    description = models.CharField(max_length=255)
+    user_name = models.CharField(max_length=255)
+    user = models.ForeignKey('accounts.User', on_delete=models.SET_NULL, null=True, related_name='+', db_index=False)
+    course = models.ForeignKey('courses.Course', on_delete=models.SET_NULL, null=True, related_name='+', db_index=False)
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    def __str__(self):
+        return f"{self.type}: {self.description}"
+    
+    class Meta:
+        db_table = 'dashboard_activityevent'
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
@@ -0,0 +1,130 @@
+# dashboard/rollups.py
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, DateField, F, Sum
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+from courses.models import Course
+from enrollments.models import Enrollment
+from reviews.models import Review
+from .models import DailyCourseStats
+
+METRICS = ('enrollments', 'completions', 'reviews', 'revenue')
+INTERVALS = ('day', 'week')
+
+
+def record(course_id, when, **deltas):
+    """
+    Add metric deltas to the course's rollup row for the day of `when`.
+    Decrements never create a row: there is nothing to take back from a day
+    that has no row, and the course may be mid-delete.
+    """
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not deltas or course_id is None:
+        return
+    day = timezone.localdate(when)
+    updates = {name: F(name) + value for name, value in deltas.items()}
+    rows = DailyCourseStats.objects.filter(course_id=course_id, day=day)
+    if rows.update(**updates) or any(value < 0 for value in deltas.values()):
+        return
+
+    owner = Course.objects.filter(pk=course_id).values('instructor_id', 'category_id').first()
+    if owner is None:
+        return
+    DailyCourseStats.objects.bulk_create(
+        [DailyCourseStats(course_id=course_id, day=day, **owner)], ignore_conflicts=True
+    )
+    rows.update(**updates)
+
+
+@transaction.atomic
+def rebuild(start, end):
+    """
+    Recompute every rollup row with start <= day <= end from the source
+    tables. Idempotent: the range is deleted and re-inserted in one transaction.
+
+    On PostgreSQL the rollup table is locked against writers first, so an
+    increment from record() either commits before the source tables are read
+    (and is counted there) or waits and lands on top of the rebuilt rows.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {DailyCourseStats._meta.db_table} IN SHARE ROW EXCLUSIVE MODE')
+
+    # Half-open range on the raw timestamp so the column's index can be used
+    tz = timezone.get_current_timezone()
+    since = timezone.make_aware(datetime.combine(start, time.min), tz)
+    until = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz)
+    totals = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+    sources = [
+        (Enrollment.objects.all(), 'enrolled_at', {'enrollments': Count('id'), 'revenue': Sum('price_paid')}),
+        (Enrollment.objects.filter(completed_at__isnull=False), 'completed_at', {'completions': Count('id')}),
+        (Review.objects.all(), 'created_at', {'reviews': Count('id')}),
+    ]
+    for queryset, field, aggregates in sources:
+        rows = (
+            queryset.filter(**{f'{field}__gte': since, f'{field}__lt': until})
+            .annotate(day=TruncDate(field))
+            .order_by()
+            .values('course_id', 'day')
+            .annotate(**aggregates)
+        )
+        for row in rows:
+            bucket = totals[(row['course_id'], row['day'])]
+            for name in aggregates:
+                bucket[name] += row[name] or 0
+
+    owners = {
+        row['id']: row
+        for row in Course.objects.filter(pk__in={course_id for course_id, _ in totals})
+        .values('id', 'instructor_id', 'category_id')
+    }
+    DailyCourseStats.objects.filter(day__range=(start, end)).delete()
+    DailyCourseStats.objects.bulk_create(
+        (
+            DailyCourseStats(
+                course_id=course_id, day=day,
+                instructor_id=owners[course_id]['instructor_id'],
+                category_id=owners[course_id]['category_id'],
+                **values
+            )
+            for (course_id, day), values in totals.items()
+        ),
+        batch_size=5000
+    )
+    return len(totals)
+
+
+def timeseries(queryset, start, end, interval='day'):
+    """
+    Summed metrics per day or ISO week (periods start on Monday) for
+    start..end, with empty periods filled in as zeros.
+    """
+    period = TruncWeek('day', output_field=DateField()) if interval == 'week' else F('day')
+    rows = (
+        queryset.filter(day__range=(start, end))
+        .annotate(period=period)
+        .order_by()
+        .values('period')
+        .annotate(**{name: Sum(name) for name in METRICS})
+    )
+    by_period = {row['period']: row for row in rows}
+
+    step = timedelta(days=7 if interval == 'week' else 1)
+    current = start - timedelta(days=start.weekday()) if interval == 'week' else start
+    series = []
+    while current <= end:
+        row = by_period.get(current, {})
+        series.append({
+            'period': current,
+            'enrollments': row.get('enrollments') or 0,
+            'completions': row.get('completions') or 0,
+            'reviews': row.get('reviews') or 0,
+            'revenue': row.get('revenue') or Decimal('0'),
+        })
+        current += step
+    return series
@@ -19,8 +19,17 @@ class TopCourseSerializer(serializers.Serializer):
     average_rating = serializers.FloatField()
     
 class RecentActivitySerializer(serializers.Serializer):
-    """Serializer for recent platform activities"""
+    """Serializer for recent platform activities (ActivityEvent rows)"""
+    id = serializers.IntegerField()
     type = serializers.CharField()  # 'enrollment', 'review', 'course'
     description = serializers.CharField()
     user_name = serializers.CharField()
-    timestamp = serializers.DateTimeField()
\ No newline at end of file
+    timestamp = serializers.DateTimeField(source='created_at')
+    
+class TimeseriesPointSerializer(serializers.Serializer):
+    """Serializer for one period of a dashboard time series"""
+    period = serializers.DateField()
+    enrollments = serializers.IntegerField()
+    completions = serializers.IntegerField()
+    reviews = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
\ No newline at end of file
@@ -0,0 +1,88 @@
+# dashboard/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import User
+from courses.models import Course
+from enrollments.models import Enrollment
+from ocms import invalidation
+from reviews.models import Review
+from . import activity, analytics, rollups
+
+# Stored values come from the invalidation registry's pre_save read
+invalidation.watch(User, 'role')
+invalidation.watch(Course, 'is_published')
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    previous = invalidation.previous(instance, 'role')
+    if previous == instance.role or (not created and previous is None):
+        return
+    if previous in analytics.ROLE_COUNTERS:
+        analytics.increment(analytics.ROLE_COUNTERS[previous], -1)
+    if instance.role in analytics.ROLE_COUNTERS:
+        analytics.increment(analytics.ROLE_COUNTERS[instance.role], 1)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    if instance.role in analytics.ROLE_COUNTERS:
+        analytics.increment(analytics.ROLE_COUNTERS[instance.role], -1)
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, created, **kwargs):
+    if created:
+        analytics.increment(analytics.COURSES, 1)
+        if instance.is_published:
+            analytics.increment(analytics.PUBLISHED_COURSES, 1)
+            activity.record_course_published(instance)
+        return
+    previous = invalidation.previous(instance, 'is_published')
+    if previous is not None and previous != instance.is_published:
+        analytics.increment(analytics.PUBLISHED_COURSES, 1 if instance.is_published else -1)
+        if instance.is_published:
+            activity.record_course_published(instance)
+
+
+@receiver(post_delete, sender=Course)
+def course_deleted(sender, instance, **kwargs):
+    analytics.increment(analytics.COURSES, -1)
+    if instance.is_published:
+        analytics.increment(analytics.PUBLISHED_COURSES, -1)
+
+
+@receiver(post_save, sender=Enrollment)
+def enrollment_created(sender, instance, created, **kwargs):
+    if created:
+        analytics.increment(analytics.ENROLLMENTS, 1)
+        rollups.record(instance.course_id, instance.enrolled_at, enrollments=1, revenue=instance.price_paid)
+        activity.record_enrollment(instance)
+
+
+@receiver(post_delete, sender=Enrollment)
+def enrollment_deleted(sender, instance, **kwargs):
+    analytics.increment(analytics.ENROLLMENTS, -1)
+    rollups.record(instance.course_id, instance.enrolled_at, enrollments=-1, revenue=-instance.price_paid)
+    if instance.completed_at:
+        rollups.record(instance.course_id, instance.completed_at, completions=-1)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    previous = invalidation.previous(instance, 'rating')
+    if previous is None:
+        analytics.increment(analytics.REVIEWS, 1)
+        analytics.increment(analytics.RATING_SUM, instance.rating)
+        rollups.record(instance.course_id, instance.created_at, reviews=1)
+        activity.record_review(instance)
+    else:
+        analytics.increment(analytics.RATING_SUM, instance.rating - previous)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    analytics.increment(analytics.REVIEWS, -1)
+    analytics.increment(analytics.RATING_SUM, -instance.rating)
+    rollups.record(instance.course_id, instance.created_at, reviews=-1)
@@ -1,3 +1,127 @@
-from django.test import TestCase
+# dashboard/tests.py
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import User
+from courses.models import Course
+from enrollments.services import enroll_students
+from ocms import invalidation
+from ocms.local_cache import local
+from reviews.models import Review
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class DashboardQueryCountTests(TestCase):
+    """Dashboard endpoints cost the same number of queries at any data size"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin@example.com', 'pw', full_name='Admin', role='ADMIN')
+        cls.instructor = User.objects.create_user('instructor@example.com', 'pw', full_name='Instructor', role='INSTRUCTOR')
+        cls.students = 0
+        cls.add_data(courses=2, students=3)
+
+    @classmethod
+    def add_data(cls, courses, students):
+        """Published courses, each with `students` enrollments and reviews"""
+        for _ in range(courses):
+            course = Course.objects.create(
+                title=f'Course {Course.objects.count()}', description='Course', instructor=cls.instructor,
+                price=10, is_published=True
+            )
+            enrolled = User.objects.bulk_create(
+                User(email=f'student{cls.students + i}@example.com', full_name='Student') for i in range(students)
+            )
+            cls.students += students
+            enroll_students(course, enrolled)
+            for index, student in enumerate(enrolled):
+                Review.objects.create(student=student, course=course, rating=1 + index % 5, comment='ok')
+
+    def setUp(self):
+        cache.clear()
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def assert_constant_queries(self, user, url, queries):
+        client = self.client_for(user)
+        for size in ('small', 'large'):
+            if size == 'large':
+                self.add_data(courses=10, students=8)
+                cache.clear()
+            with self.subTest(size=size):
+                with self.assertNumQueries(queries):
+                    response = client.get(url)
+                self.assertEqual(response.status_code, 200)
+        return client
+
+    def test_admin_analytics(self):
+        self.assert_constant_queries(self.admin, '/api/admin/analytics/', 1)
+
+    def test_admin_top_courses(self):
+        self.assert_constant_queries(self.admin, '/api/admin/top-courses/', 1)
+
+    def test_admin_recent_activity(self):
+        self.assert_constant_queries(self.admin, '/api/admin/recent-activity/', 1)
+
+    def test_instructor_dashboard(self):
+        client = self.assert_constant_queries(self.instructor, '/api/instructor/dashboard/', 2)
+        # Warm snapshot
+        with self.assertNumQueries(0):
+            response = client.get('/api/instructor/dashboard/')
+        self.assertEqual(response.data['total_courses'], 12)
+        self.assertEqual(response.data['total_students'], 2 * 3 + 10 * 8)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class InstructorSnapshotInvalidationTests(TestCase):
+    """The cached instructor dashboard is dropped by the enrollment, review and course writes it shows"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor@example.com', None, full_name='Instructor', role='INSTRUCTOR')
+        cls.other = User.objects.create_user('other@example.com', None, full_name='Other', role='INSTRUCTOR')
+        cls.course = Course.objects.create(
+            title='Course', description='Course', instructor=cls.instructor, price=10, is_published=True
+        )
+        cls.students = User.objects.bulk_create(
+            User(email=f'student{index}@example.com', full_name='Student') for index in range(2)
+        )
+        enroll_students(cls.course, cls.students[:1])
+
+    def setUp(self):
+        # Targets queued by setUpTestData, whose commit never comes
+        invalidation.flush()
+        cache.clear()
+        local.clear()
+
+    def dashboard(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get('/api/instructor/dashboard/').data
+
+    def test_enrollments_reviews_and_reassignment(self):
+        self.assertEqual(self.dashboard(self.instructor)['total_students'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            enroll_students(self.course, self.students[1:])
+        self.assertEqual(self.dashboard(self.instructor)['total_students'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            review = Review.objects.create(student=self.students[0], course=self.course, rating=4, comment='ok')
+        self.assertEqual(self.dashboard(self.instructor)['average_rating'], 4.0)
+        with self.captureOnCommitCallbacks(execute=True):
+            review.rating = 2
+            review.save()
+        self.assertEqual(self.dashboard(self.instructor)['average_rating'], 2.0)
+
+        self.assertEqual(self.dashboard(self.other)['total_courses'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.instructor = self.other
+            self.course.save()
+        self.assertEqual(self.dashboard(self.instructor)['total_courses'], 0)
+        self.assertEqual(self.dashboard(self.other)['total_courses'], 1)
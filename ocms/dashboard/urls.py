@@ -7,6 +7,10 @@ urlpatterns = [
     path('admin/analytics/', views.AdminDashboardStatsView.as_view(), name='admin-analytics'),
     path('admin/top-courses/', views.AdminTopCoursesView.as_view(), name='admin-top-courses'),
     path('admin/recent-activity/', views.AdminRecentActivityView.as_view(), name='admin-recent-activity'),
+    path('admin/recent-activity/stream/', views.AdminActivityStreamView.as_view(), name='admin-activity-stream'),
+    
+    # Time series from the daily rollups
+    path('analytics/timeseries/', views.AnalyticsTimeseriesView.as_view(), name='analytics-timeseries'),
     
     # Instructor dashboard
     path('instructor/dashboard/', views.InstructorDashboardStatsView.as_view(), name='instructor-dashboard'),
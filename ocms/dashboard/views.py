@@ -1,17 +1,21 @@
 # dashboard/views.py
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import permissions, status
-from django.core.cache import cache
-from django.db.models import Count, Avg
+from rest_framework import generics, permissions, status
+from django.http import StreamingHttpResponse
 from django.utils import timezone
-from datetime import timedelta
+from datetime import date, timedelta
 
-from accounts.models import User
 from courses.models import Course
-from enrollments.models import Enrollment
-from reviews.models import Review
-from .serializers import DashboardStatsSerializer, TopCourseSerializer, RecentActivitySerializer
+from enrollments.progress import enrollments_with_progress, build_progress
+from ocms.pagination import KeysetPagination
+from .activity import latest_event_id, stream_events
+from .analytics import instructor_stats, platform_stats
+from .models import ActivityEvent, DailyCourseStats
+from .rollups import INTERVALS, timeseries
+from .serializers import (
+    DashboardStatsSerializer, TopCourseSerializer, RecentActivitySerializer, TimeseriesPointSerializer
+)
 
 class IsAdminUser(permissions.BasePermission):
     """Custom permission to only allow admins"""
@@ -21,126 +25,83 @@ class IsAdminUser(permissions.BasePermission):
 class AdminDashboardStatsView(APIView):
     """
     API endpoint for admin dashboard statistics
-    Cached in Redis for 5 minutes
+    Read from the incrementally maintained platform counters
     """
     permission_classes = [IsAdminUser]
     
     def get(self, request):
-        # Try to get from cache first
-        cache_key = 'admin_dashboard_stats'
-        stats = cache.get(cache_key)
-        
-        if not stats:
-            # Calculate statistics
-            total_students = User.objects.filter(role='STUDENT').count()
-            total_instructors = User.objects.filter(role='INSTRUCTOR').count()
-            total_courses = Course.objects.filter(is_published=True).count()
-            total_enrollments = Enrollment.objects.count()
-            total_reviews = Review.objects.count()
-            
-            # Calculate average rating
-            avg_rating = Review.objects.aggregate(avg=Avg('rating'))['avg'] or 0
-            
-            stats = {
-                'total_students': total_students,
-                'total_instructors': total_instructors,
-                'total_courses': total_courses,
-                'total_enrollments': total_enrollments,
-                'total_reviews': total_reviews,
-                'average_rating': round(avg_rating, 2)
-            }
-            
-            # Cache for 5 minutes
-            cache.set(cache_key, stats, timeout=300)
-        
-        serializer = DashboardStatsSerializer(stats)
+        serializer = DashboardStatsSerializer(platform_stats())
         return Response(serializer.data)
 
 class AdminTopCoursesView(APIView):
     """
     API endpoint for top enrolled courses
-    Cached in Redis for 5 minutes
+    Uses the course counters, so this is an index-ordered LIMIT 10 with no joins
     """
     permission_classes = [IsAdminUser]
     
     def get(self, request):
-        # Try to get from cache
-        cache_key = 'admin_top_courses'
-        top_courses = cache.get(cache_key)
-        
-        if not top_courses:
-            # Get courses with most enrollments
-            courses = Course.objects.filter(is_published=True).annotate(
-                enrollment_count=Count('enrollments'),
-                avg_rating=Avg('reviews__rating')
-            ).order_by('-enrollment_count')[:10]
-            
-            top_courses = []
-            for course in courses:
-                top_courses.append({
-                    'course_id': course.id,
-                    'course_title': course.title,
-                    'instructor_name': course.instructor.full_name,
-                    'enrollment_count': course.enrollment_count,
-                    'average_rating': round(course.avg_rating or 0, 2)
-                })
-            
-            # Cache for 5 minutes
-            cache.set(cache_key, top_courses, timeout=300)
+        courses = (
+            Course.objects.filter(is_published=True)
+            .select_related('instructor')
+            .order_by('-enrollment_count', '-id')[:10]
+        )
+        
+        top_courses = []
+        for course in courses:
+            top_courses.append({
+                'course_id': course.id,
+                'course_title': course.title,
+                'instructor_name': course.instructor.full_name,
+                'enrollment_count': course.enrollment_count,
+                'average_rating': float(course.average_rating)
+            })
         
         serializer = TopCourseSerializer(top_courses, many=True)
         return Response(serializer.data)
 
-class AdminRecentActivityView(APIView):
+class AdminRecentActivityView(generics.ListAPIView):
     """
     API endpoint for recent platform activities
-    Not cached - shows real-time data
+    One indexed query on the append-only activity log, keyset-paginated
+    newest first.
+    """
+    permission_classes = [IsAdminUser]
+    serializer_class = RecentActivitySerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = '-created_at'
+    
+    def get_queryset(self):
+        return ActivityEvent.objects.all()
+
+class AdminActivityStreamView(APIView):
+    """
+    Server-sent events tail of the activity log for live admin dashboards
+    Resumes after the Last-Event-ID header (or ?last_event_id=), otherwise
+    starts at the newest event. Auth is the usual JWT header, so browsers
+    read it with fetch() streaming rather than EventSource. Streams are short
+    (dashboard/activity.py STREAM_MAX_SECONDS) because each one holds a sync
+    worker; the client reconnects with the last id it saw.
     """
     permission_classes = [IsAdminUser]
     
     def get(self, request):
-        recent_activities = []
-        
-        # Get recent enrollments (last 7 days)
-        recent_enrollments = Enrollment.objects.select_related('student', 'course').order_by('-enrolled_at')[:5]
-        for enrollment in recent_enrollments:
-            recent_activities.append({
-                'type': 'enrollment',
-                'description': f"Enrolled in {enrollment.course.title}",
-                'user_name': enrollment.student.full_name,
-                'timestamp': enrollment.enrolled_at
-            })
-        
-        # Get recent reviews (last 7 days)
-        recent_reviews = Review.objects.select_related('student', 'course').order_by('-created_at')[:5]
-        for review in recent_reviews:
-            recent_activities.append({
-                'type': 'review',
-                'description': f"Reviewed {review.course.title} - {review.rating}★",
-                'user_name': review.student.full_name,
-                'timestamp': review.created_at
-            })
-        
-        # Get recent courses (last 7 days)
-        recent_courses = Course.objects.filter(is_published=True).select_related('instructor').order_by('-created_at')[:5]
-        for course in recent_courses:
-            recent_activities.append({
-                'type': 'course',
-                'description': f"New course: {course.title}",
-                'user_name': course.instructor.full_name,
-                'timestamp': course.created_at
-            })
-        
-        # Sort by timestamp (most recent first) and take top 10
-        recent_activities.sort(key=lambda x: x['timestamp'], reverse=True)
-        recent_activities = recent_activities[:10]
-        
-        serializer = RecentActivitySerializer(recent_activities, many=True)
-        return Response(serializer.data)
+        last_id = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+        try:
+            last_id = int(last_id) if last_id else latest_event_id()
+        except ValueError:
+            return Response({"error": "Invalid Last-Event-ID"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response = StreamingHttpResponse(stream_events(last_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
 
 class InstructorDashboardStatsView(APIView):
     """
     API endpoint for instructor dashboard statistics
+    Two queries on a miss, then a per-instructor cached snapshot
     """
     permission_classes = [permissions.IsAuthenticated]
     
@@ -151,36 +112,7 @@ class InstructorDashboardStatsView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Get instructor's courses
-        courses = Course.objects.filter(instructor=request.user)
-        total_courses = courses.count()
-        
-        # Calculate total students across all courses
-        total_students = Enrollment.objects.filter(course__in=courses).values('student').distinct().count()
-        
-        # Calculate total revenue
-        total_revenue = sum(course.price for course in courses if course.price)
-        
-        # Get average rating for instructor's courses
-        avg_rating = Review.objects.filter(course__in=courses).aggregate(avg=Avg('rating'))['avg'] or 0
-        
-        stats = {
-            'total_courses': total_courses,
-            'total_students': total_students,
-            'total_revenue': float(total_revenue),
-            'average_rating': round(avg_rating, 2),
-            'recent_courses': [
-                {
-                    'id': course.id,
-                    'title': course.title,
-                    'enrollments': course.enrollments.count(),
-                    'rating': round(Review.objects.filter(course=course).aggregate(avg=Avg('rating'))['avg'] or 0, 2)
-                }
-                for course in courses.order_by('-created_at')[:5]
-            ]
-        }
-        
-        return Response(stats)
+        return Response(instructor_stats(request.user.id))
 
 class StudentDashboardStatsView(APIView):
     """
@@ -195,27 +127,23 @@ class StudentDashboardStatsView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Get student's enrollments
-        enrollments = Enrollment.objects.filter(student=request.user).select_related('course')
-        total_enrolled = enrollments.count()
-        completed_courses = enrollments.filter(status='COMPLETED').count()
+        # All enrollments with progress in one query (most recent first)
+        enrollments = list(enrollments_with_progress(request.user))
+        total_enrolled = len(enrollments)
+        completed_courses = sum(1 for enrollment in enrollments if enrollment.status == 'COMPLETED')
         
-        # Calculate progress for each course
         courses_in_progress = []
-        for enrollment in enrollments.filter(status='ACTIVE'):
-            total_lectures = enrollment.course.modules.aggregate(
-                total=models.Sum('lectures__duration')
-            )['total'] or 0
-            
-            completed_lectures = enrollment.lecture_progress.filter(completed=True).count()
-            progress = (completed_lectures / total_lectures * 100) if total_lectures > 0 else 0
-            
+        for enrollment in enrollments:
+            if enrollment.status != 'ACTIVE':
+                continue
+            progress = build_progress(enrollment)
             courses_in_progress.append({
-                'course_id': enrollment.course.id,
+                'course_id': enrollment.course_id,
                 'course_title': enrollment.course.title,
                 'instructor': enrollment.course.instructor.full_name,
-                'progress': round(progress, 2),
-                'enrolled_at': enrollment.enrolled_at
+                'progress': progress['progress_percentage'],
+                'enrolled_at': enrollment.enrolled_at,
+                'last_activity': progress['last_activity']
             })
         
         stats = {
@@ -225,4 +153,78 @@ class StudentDashboardStatsView(APIView):
             'courses': courses_in_progress[:5]  # Show last 5
         }
         
-        return Response(stats)
\ No newline at end of file
+        return Response(stats)
+
+class AnalyticsTimeseriesView(APIView):
+    """
+    Enrollment, completion, review and revenue series for charts
+    Served from the daily rollups, never from the enrollment/review tables.
+    ?scope=platform|instructor|category|course&id=&start=&end=&interval=day|week
+    Admins can read any scope; instructors their own totals and courses.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_days = 731
+    
+    def get(self, request):
+        if request.user.role not in ('ADMIN', 'INSTRUCTOR'):
+            return Response(
+                {"error": "Only instructors and admins can access this"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        params = request.query_params
+        scope = params.get('scope', 'platform' if request.user.role == 'ADMIN' else 'instructor')
+        interval = params.get('interval', 'day')
+        if interval not in INTERVALS:
+            return Response({"error": "interval must be day or week"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            end = date.fromisoformat(params['end']) if params.get('end') else timezone.localdate()
+            start = date.fromisoformat(params['start']) if params.get('start') else end - timedelta(days=29)
+        except ValueError:
+            return Response({"error": "start and end must be YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST)
+        if start > end or (end - start).days >= self.max_days:
+            return Response(
+                {"error": f"Date range must be ascending and at most {self.max_days} days"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            scope_id = int(params['id']) if params.get('id') else None
+        except ValueError:
+            return Response({"error": "id must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        rows = DailyCourseStats.objects.all()
+        is_admin = request.user.role == 'ADMIN'
+        if scope == 'platform':
+            if not is_admin:
+                return Response({"error": "Only admins can access this"}, status=status.HTTP_403_FORBIDDEN)
+        elif scope == 'instructor':
+            scope_id = scope_id or request.user.id
+            if not is_admin and scope_id != request.user.id:
+                return Response({"error": "Only admins can access this"}, status=status.HTTP_403_FORBIDDEN)
+            rows = rows.filter(instructor_id=scope_id)
+        elif scope == 'category':
+            if not is_admin:
+                return Response({"error": "Only admins can access this"}, status=status.HTTP_403_FORBIDDEN)
+            rows = rows.filter(category_id=scope_id)
+        elif scope == 'course':
+            if not is_admin and not Course.objects.filter(pk=scope_id, instructor=request.user).exists():
+                return Response({"error": "Only the course instructor can access this"}, status=status.HTTP_403_FORBIDDEN)
+            rows = rows.filter(course_id=scope_id)
+        else:
+            return Response({"error": "Unknown scope"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if scope != 'platform' and scope_id is None:
+            return Response({"error": "id is required for this scope"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        series = timeseries(rows, start, end, interval)
+        serializer = TimeseriesPointSerializer(series, many=True)
+        return Response({
+            'scope': scope,
+            'id': scope_id,
+            'interval': interval,
+            'start': start,
+            'end': end,
+            'series': serializer.data
+        })
@@ -0,0 +1,79 @@
+# enrollments/management/commands/benchmark_enrollment.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from courses.models import Course, Module, Lecture
+from enrollments.services import enroll_student, enroll_students
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measure per-enrollment latency against course size. All data is rolled back.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lectures', type=int, nargs='+', default=[10, 50, 100, 400],
+                            help='Course sizes (lecture counts) to measure')
+        parser.add_argument('--students', type=int, default=20,
+                            help='Enrollments per course size and mode')
+
+    def handle(self, *args, **options):
+        rows = []
+        try:
+            with transaction.atomic():
+                for lecture_count in options['lectures']:
+                    rows.append(self._measure(lecture_count, options['students']))
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(f"{'lectures':>9} {'single ms/enr':>14} {'queries/enr':>12} {'cohort ms/enr':>14} {'cohort queries':>15}")
+        for row in rows:
+            self.stdout.write(
+                f"{row['lectures']:>9} {row['single_ms']:>14.2f} {row['single_queries']:>12.1f} "
+                f"{row['cohort_ms']:>14.2f} {row['cohort_queries']:>15}"
+            )
+
+    def _measure(self, lecture_count, student_count):
+        instructor = User.objects.create_user(
+            f'bench-instructor-{lecture_count}@example.com', None,
+            full_name='Bench Instructor', role='INSTRUCTOR'
+        )
+        course = Course.objects.create(
+            title=f'Bench {lecture_count}', description='benchmark', instructor=instructor, is_published=True
+        )
+        module = Module.objects.create(course=course, title='Module', order=1)
+        Lecture.objects.bulk_create(
+            [Lecture(module=module, title=f'Lecture {i}', order=i) for i in range(lecture_count)]
+        )
+
+        students = User.objects.bulk_create([
+            User(email=f'bench-{lecture_count}-{i}@example.com', full_name=f'Student {i}', role='STUDENT')
+            for i in range(student_count * 2)
+        ])
+        single, cohort = students[:student_count], students[student_count:]
+
+        with CaptureQueriesContext(connection) as single_queries:
+            start = time.perf_counter()
+            for student in single:
+                enroll_student(student, course)
+            single_elapsed = time.perf_counter() - start
+
+        with CaptureQueriesContext(connection) as cohort_queries:
+            start = time.perf_counter()
+            enroll_students(course, cohort)
+            cohort_elapsed = time.perf_counter() - start
+
+        return {
+            'lectures': lecture_count,
+            'single_ms': single_elapsed * 1000 / student_count,
+            'single_queries': len(single_queries) / student_count,
+            'cohort_ms': cohort_elapsed * 1000 / student_count,
+            'cohort_queries': len(cohort_queries),
+        }
@@ -0,0 +1,91 @@
+# enrollments/management/commands/loadtest_progress.py
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from courses.models import Course, Module, Lecture
+from courses.stats import refresh_course_structure
+from enrollments.services import enroll_student
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Compare sustained events/second of the single-lecture completion endpoint '
+            'against the batched progress events endpoint. All data is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=500, help='Events per scenario')
+        parser.add_argument('--batch-size', type=int, default=100, help='Events per batched request')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                rows = self._run(options['events'], options['batch_size'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(f"{'scenario':<32} {'events':>7} {'requests':>9} {'seconds':>9} {'events/s':>10}")
+        for name, events, requests, elapsed in rows:
+            self.stdout.write(f"{name:<32} {events:>7} {requests:>9} {elapsed:>9.3f} {events / elapsed:>10.1f}")
+
+    def _setup(self, suffix, lecture_count):
+        instructor = User.objects.create_user(
+            f'load-instructor-{suffix}@example.com', None, full_name='Load Instructor', role='INSTRUCTOR'
+        )
+        course = Course.objects.create(
+            title=f'Load {suffix}', description='load test', instructor=instructor, is_published=True
+        )
+        module = Module.objects.create(course=course, title='Module', order=1)
+        lectures = Lecture.objects.bulk_create(
+            [Lecture(module=module, title=f'Lecture {i}', order=i) for i in range(lecture_count)]
+        )
+        # bulk_create skips the signals that maintain lecture_count; without it
+        # the first event would complete the enrollment
+        refresh_course_structure(course.id)
+        student = User.objects.create_user(
+            f'load-student-{suffix}@example.com', None, full_name='Load Student', role='STUDENT'
+        )
+        enroll_student(student, course)
+        client = APIClient()
+        client.force_authenticate(student)
+        return client, [lecture.id for lecture in lectures]
+
+    def _run(self, event_count, batch_size):
+        rows = []
+
+        client, lecture_ids = self._setup('single', event_count)
+        start = time.perf_counter()
+        for lecture_id in lecture_ids:
+            client.post(f'/api/lecture/{lecture_id}/complete/')
+        rows.append(('single completion endpoint', event_count, event_count, time.perf_counter() - start))
+
+        client, lecture_ids = self._setup('batch', event_count)
+        events = [
+            {'event_id': uuid.uuid4().hex, 'lecture_id': lecture_id, 'type': 'complete'}
+            for lecture_id in lecture_ids
+        ]
+        rows.append(('batched completions', event_count, *self._post_batches(client, events, batch_size)))
+
+        heartbeats = [
+            {'event_id': uuid.uuid4().hex, 'lecture_id': lecture_ids[i % len(lecture_ids)],
+             'type': 'heartbeat', 'position': i}
+            for i in range(event_count)
+        ]
+        rows.append(('batched heartbeats', event_count, *self._post_batches(client, heartbeats, batch_size)))
+        return rows
+
+    def _post_batches(self, client, events, batch_size):
+        requests = 0
+        start = time.perf_counter()
+        for offset in range(0, len(events), batch_size):
+            client.post('/api/progress/events/', {'events': events[offset:offset + batch_size]}, format='json')
+            requests += 1
+        return requests, time.perf_counter() - start
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-17 23:10
+
+from django.db import migrations
+
+
+def drop_untouched_progress(apps, schema_editor):
+    # Progress rows are now created on first activity; pre-materialized
+    # rows that were never completed carry no information.
+    LectureProgress = apps.get_model('enrollments', 'LectureProgress')
+    LectureProgress.objects.filter(completed=False, completed_at__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_untouched_progress, migrations.RunPython.noop),
+    ]
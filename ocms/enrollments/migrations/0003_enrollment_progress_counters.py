@@ -0,0 +1,48 @@
+# Generated by Django 6.0.2 on 2026-10-17 22:59
+
+from django.db import migrations, models
+from django.db.models import Count, F, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Enrollment = apps.get_model('enrollments', 'Enrollment')
+    LectureProgress = apps.get_model('enrollments', 'LectureProgress')
+
+    completed = LectureProgress.objects.filter(
+        enrollment_id=OuterRef('pk'), completed=True
+    ).order_by().values('enrollment_id')
+
+    Enrollment.objects.update(
+        completed_lectures=Coalesce(
+            Subquery(completed.annotate(total=Count('id')).values('total')[:1]), Value(0)
+        ),
+        last_activity=Subquery(completed.annotate(latest=Max('completed_at')).values('latest')[:1]),
+    )
+    Enrollment.objects.filter(
+        status='ACTIVE',
+        course__lecture_count__gt=0,
+        completed_lectures__gte=F('course__lecture_count')
+    ).update(status='COMPLETED')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_counters'),
+        ('enrollments', '0002_sparse_lecture_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='completed_lectures',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='last_activity',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollments', '0003_enrollment_progress_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lectureprogress',
+            name='position',
+            field=models.PositiveIntegerField(default=0, help_text='Last watch position in seconds'),
+        ),
+    ]
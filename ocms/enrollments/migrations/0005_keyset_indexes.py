@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-17 23:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_keyset_indexes'),
+        ('enrollments', '0004_lectureprogress_position'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['student', 'enrolled_at', 'id'], name='enrollments_student_143b43_idx'),
+        ),
+    ]
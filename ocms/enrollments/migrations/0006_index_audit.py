@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-17 23:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_index_audit'),
+        ('enrollments', '0005_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['student', 'status'], name='enrollments_student_885f1d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lectureprogress',
+            index=models.Index(condition=models.Q(('completed', True)), fields=['enrollment', 'lecture'], name='progress_completed_idx'),
+        ),
+    ]
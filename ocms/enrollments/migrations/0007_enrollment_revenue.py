@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-17 23:55
+
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+
+def backfill_revenue(apps, schema_editor):
+    Enrollment = apps.get_model('enrollments', 'Enrollment')
+    Course = apps.get_model('courses', 'Course')
+
+    # Historic purchase prices were never stored; the current list price is the best estimate
+    Enrollment.objects.update(
+        price_paid=Subquery(Course.objects.filter(pk=OuterRef('course_id')).values('price')[:1])
+    )
+    Enrollment.objects.filter(status='COMPLETED').update(completed_at=F('last_activity'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_popular_index'),
+        ('enrollments', '0006_index_audit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='price_paid',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10),
+        ),
+        migrations.RunPython(backfill_revenue, migrations.RunPython.noop),
+    ]
@@ -14,23 +14,47 @@ class Enrollment(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ACTIVE')
     enrolled_at = models.DateTimeField(auto_now_add=True)
     
+    # Maintained on the completion write path so progress reads never aggregate
+    completed_lectures = models.PositiveIntegerField(default=0, editable=False)
+    last_activity = models.DateTimeField(null=True, blank=True, editable=False)
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    # Course price at enrollment time; revenue is summed from this, not list prices
+    price_paid = models.DecimalField(max_digits=10, decimal_places=2, default=0, editable=False)
+    
     def __str__(self):
         return f"{self.student.full_name} - {self.course.title}"
     
     class Meta:
         db_table = 'enrollments_enrollment'
         unique_together = ['student', 'course']  # Prevent duplicate enrollments
+        indexes = [
+            # Keyset pagination of a student's enrollments
+            models.Index(fields=['student', 'enrolled_at', 'id']),
+            # Per-status dashboard filters (active / completed courses)
+            models.Index(fields=['student', 'status']),
+        ]
 
 class LectureProgress(models.Model):
+    """
+    Sparse progress record: a row exists only once a student has activity on
+    a lecture, so storage scales with completions rather than students x lectures.
+    A missing row means "not started".
+    """
     id = models.BigAutoField(primary_key=True)
     enrollment = models.ForeignKey(Enrollment, on_delete=models.CASCADE, related_name='lecture_progress')
     lecture = models.ForeignKey('courses.Lecture', on_delete=models.CASCADE)
     completed = models.BooleanField(default=False)
     completed_at = models.DateTimeField(null=True, blank=True)
+    position = models.PositiveIntegerField(default=0, help_text="Last watch position in seconds")
     
     def __str__(self):
         return f"{self.enrollment.student.full_name} - {self.lecture.title}"
     
     class Meta:
         db_table = 'enrollments_lectureprogress'
-        unique_together = ['enrollment', 'lecture']
\ No newline at end of file
+        unique_together = ['enrollment', 'lecture']
+        indexes = [
+            # "Which lectures has this enrollment completed" as an index-only scan
+            models.Index(fields=['enrollment', 'lecture'], condition=models.Q(completed=True), name='progress_completed_idx'),
+        ]
\ No newline at end of file
@@ -0,0 +1,46 @@
+# enrollments/progress.py
+import hashlib
+
+from .models import Enrollment
+
+
+def enrollments_with_progress(student, **filters):
+    """
+    A student's enrollments with everything needed for progress in one query.
+    Completed-lecture count and last activity are counters on Enrollment and
+    the lecture total is the denormalized Course.lecture_count, so this is a
+    plain read with no aggregation and no writes.
+    """
+    return Enrollment.objects.filter(student=student, **filters).select_related(
+        'course__instructor', 'course__category'
+    ).order_by('-enrolled_at')
+
+
+def progress_percentage(completed_lectures, total_lectures):
+    if total_lectures <= 0:
+        return 0
+    return round(min(completed_lectures, total_lectures) / total_lectures * 100, 2)
+
+
+def build_progress(enrollment):
+    """Progress summary for an enrollment fetched with enrollments_with_progress()"""
+    total_lectures = enrollment.course.lecture_count
+    return {
+        'course_id': enrollment.course_id,
+        'course_title': enrollment.course.title,
+        'total_lectures': total_lectures,
+        'completed_lectures': enrollment.completed_lectures,
+        'progress_percentage': progress_percentage(enrollment.completed_lectures, total_lectures),
+        'status': enrollment.status,
+        'enrolled_at': enrollment.enrolled_at,
+        'last_activity': enrollment.last_activity,
+    }
+
+
+def progress_etag(progress):
+    """Weak validator over the fields that define a progress response"""
+    parts = (
+        progress['course_id'], progress['total_lectures'], progress['completed_lectures'],
+        progress['status'], progress['course_title'], progress['last_activity'],
+    )
+    return 'W/"%s"' % hashlib.md5(repr(parts).encode()).hexdigest()
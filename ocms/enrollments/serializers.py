@@ -3,6 +3,7 @@ from rest_framework import serializers
 from .models import Enrollment, LectureProgress
 from courses.models import Course, Lecture
 from courses.serializers import CourseListSerializer
+from .progress import build_progress
 
 class EnrollmentSerializer(serializers.ModelSerializer):
     course_details = CourseListSerializer(source='course', read_only=True)
@@ -12,6 +13,22 @@ class EnrollmentSerializer(serializers.ModelSerializer):
         fields = ['id', 'course', 'course_details', 'status', 'enrolled_at']
         read_only_fields = ['id', 'enrolled_at']
 
+class EnrollmentProgressSerializer(EnrollmentSerializer):
+    """Enrollment with embedded progress; expects enrollments_with_progress() rows"""
+    progress = serializers.SerializerMethodField()
+    
+    class Meta(EnrollmentSerializer.Meta):
+        fields = EnrollmentSerializer.Meta.fields + ['progress']
+    
+    def get_progress(self, obj):
+        progress = build_progress(obj)
+        return {
+            'total_lectures': progress['total_lectures'],
+            'completed_lectures': progress['completed_lectures'],
+            'progress_percentage': progress['progress_percentage'],
+            'last_activity': progress['last_activity'],
+        }
+
 class EnrollCourseSerializer(serializers.Serializer):
     course_id = serializers.IntegerField()
     
@@ -28,6 +45,13 @@ class EnrollCourseSerializer(serializers.Serializer):
         
         return value
 
+class BulkEnrollSerializer(serializers.Serializer):
+    student_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=5000
+    )
+
 class LectureProgressSerializer(serializers.ModelSerializer):
     lecture_title = serializers.CharField(source='lecture.title', read_only=True)
     
@@ -35,10 +59,22 @@ class LectureProgressSerializer(serializers.ModelSerializer):
         model = LectureProgress
         fields = ['id', 'lecture', 'lecture_title', 'completed', 'completed_at']
 
+class ProgressEventSerializer(serializers.Serializer):
+    EVENT_TYPES = ('complete', 'heartbeat')
+    
+    event_id = serializers.CharField(max_length=64)
+    lecture_id = serializers.IntegerField()
+    type = serializers.ChoiceField(choices=EVENT_TYPES)
+    position = serializers.IntegerField(min_value=0, required=False)
+
+class ProgressEventBatchSerializer(serializers.Serializer):
+    events = ProgressEventSerializer(many=True, allow_empty=False, max_length=1000)
+
 class CourseProgressSerializer(serializers.Serializer):
     course_id = serializers.IntegerField()
     course_title = serializers.CharField()
     total_lectures = serializers.IntegerField()
     completed_lectures = serializers.IntegerField()
     progress_percentage = serializers.FloatField()
-    status = serializers.CharField()
\ No newline at end of file
+    status = serializers.CharField()
+    last_activity = serializers.DateTimeField(allow_null=True)
\ No newline at end of file
@@ -0,0 +1,256 @@
+# enrollments/services.py
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from .models import Enrollment, LectureProgress
+from courses.models import Lecture
+from courses.stats import adjust_enrollment_count
+from ocms import cache, invalidation
+from dashboard import activity, analytics, rollups
+
+# How long applied event ids are remembered for cross-batch deduplication
+EVENT_DEDUP_TIMEOUT = 3600
+
+
+def enroll_student(student, course):
+    """Enroll one student; returns the new Enrollment, or None if already enrolled"""
+    enrollments = enroll_students(course, [student])
+    return enrollments[0] if enrollments else None
+
+
+@transaction.atomic
+def enroll_students(course, students):
+    """
+    Enroll many students in one course as a single atomic operation.
+    Cost is a fixed number of statements: one lookup of existing enrollments
+    and one batched INSERT, independent of how many lectures the course has
+    (progress rows are only written once a lecture is completed).
+    Students that are already enrolled are skipped.
+    """
+    already_enrolled = set(
+        Enrollment.objects.filter(course=course, student__in=students).values_list('student_id', flat=True)
+    )
+    enrollments = Enrollment.objects.bulk_create([
+        Enrollment(student=student, course=course, status='ACTIVE', price_paid=course.price)
+        for student in students
+        if student.id not in already_enrolled
+    ])
+    if not enrollments:
+        return []
+    
+    # bulk_create skips post_save, so keep the counters in step here
+    adjust_enrollment_count(course.id, len(enrollments))
+    analytics.increment(analytics.ENROLLMENTS, len(enrollments))
+    invalidation.schedule([analytics.instructor_snapshot_key(course.instructor_id)])
+    activity.record_enrollments(course, [e.student for e in enrollments], enrollments[0].enrolled_at)
+    rollups.record(
+        course.id, enrollments[0].enrolled_at,
+        enrollments=len(enrollments), revenue=sum(e.price_paid for e in enrollments)
+    )
+    return enrollments
+
+
+def record_completions(enrollment_id, count, when):
+    """
+    Apply newly completed lectures to the enrollment counters and move the
+    enrollment to COMPLETED once every lecture is done. Completion is decided
+    here, on the write path, so progress reads stay pure reads.
+    """
+    if count <= 0:
+        Enrollment.objects.filter(pk=enrollment_id).update(last_activity=when)
+        return
+    Enrollment.objects.filter(pk=enrollment_id).update(
+        completed_lectures=F('completed_lectures') + count,
+        last_activity=when
+    )
+    completed = Enrollment.objects.filter(
+        pk=enrollment_id,
+        status='ACTIVE',
+        completed_lectures__gte=F('course__lecture_count')
+    ).update(status='COMPLETED', completed_at=when)
+    if completed:
+        course_id = Enrollment.objects.filter(pk=enrollment_id).values_list('course_id', flat=True).first()
+        rollups.record(course_id, when, completions=1)
+
+
+@transaction.atomic
+def sync_completion_status(course_ids, when=None):
+    """
+    Re-derive COMPLETED/ACTIVE after the courses' lecture_count changed, with
+    one UPDATE over the enrollments that flip: a new lecture reopens finished
+    enrollments, deleting the last unfinished one completes them. Completion
+    rollups follow, one delta per (course, day).
+    """
+    when = when or timezone.now()
+    flipping = Enrollment.objects.filter(course_id__in=course_ids).filter(
+        Q(status='ACTIVE', completed_lectures__gte=F('course__lecture_count'), course__lecture_count__gt=0)
+        | Q(status='COMPLETED', completed_lectures__lt=F('course__lecture_count'))
+    )
+    rows = list(flipping.select_for_update(of=('self',)).values_list('pk', 'course_id', 'status', 'completed_at'))
+    if not rows:
+        return 0
+    Enrollment.objects.filter(pk__in=[pk for pk, _, _, _ in rows]).update(
+        status=Case(When(status='ACTIVE', then=Value('COMPLETED')), default=Value('ACTIVE')),
+        completed_at=Case(When(status='ACTIVE', then=Value(when)), default=None),
+    )
+    
+    deltas = {}
+    for _, course_id, status, completed_at in rows:
+        at, delta = (when, 1) if status == 'ACTIVE' else (completed_at, -1)
+        if at is not None:
+            key = (course_id, timezone.localdate(at))
+            deltas[key] = (at, deltas.get(key, (at, 0))[1] + delta)
+    for (course_id, _), (at, delta) in deltas.items():
+        rollups.record(course_id, at, completions=delta)
+    return len(rows)
+
+
+def apply_progress(enrollment_id, completions=(), positions=None, when=None):
+    """
+    Apply completions and watch positions to one enrollment in a fixed number
+    of statements. The caller must hold the enrollment row lock (see
+    lock_enrollments) so the existing-row snapshot below stays accurate.
+    Returns (newly_completed, already_completed) lecture id sets.
+    """
+    when = when or timezone.now()
+    positions = positions or {}
+    completions = set(completions)
+    lecture_ids = completions | set(positions)
+    
+    existing = dict(
+        LectureProgress.objects.filter(enrollment_id=enrollment_id, lecture_id__in=lecture_ids)
+        .values_list('lecture_id', 'completed')
+    )
+    already_completed = {lecture_id for lecture_id in completions if existing.get(lecture_id)}
+    
+    # First activity on a lecture creates its row
+    LectureProgress.objects.bulk_create([
+        LectureProgress(
+            enrollment_id=enrollment_id,
+            lecture_id=lecture_id,
+            completed=lecture_id in completions,
+            completed_at=when if lecture_id in completions else None,
+            position=positions.get(lecture_id, 0)
+        )
+        for lecture_id in lecture_ids - set(existing)
+    ])
+    
+    # Flip existing rows in one guarded UPDATE ... WHERE completed = false
+    to_complete = [lecture_id for lecture_id in completions if existing.get(lecture_id) is False]
+    if to_complete:
+        LectureProgress.objects.filter(
+            enrollment_id=enrollment_id, lecture_id__in=to_complete, completed=False
+        ).update(completed=True, completed_at=when)
+    
+    moved = [lecture_id for lecture_id in positions if lecture_id in existing]
+    if moved:
+        rows = list(LectureProgress.objects.filter(enrollment_id=enrollment_id, lecture_id__in=moved))
+        for row in rows:
+            row.position = positions[row.lecture_id]
+        LectureProgress.objects.bulk_update(rows, ['position'])
+    
+    newly_completed = completions - already_completed
+    if newly_completed or positions:
+        record_completions(enrollment_id, len(newly_completed), when)
+    return newly_completed, already_completed
+
+
+def lock_enrollments(enrollment_ids):
+    """Row-lock enrollments in pk order so concurrent writers can't deadlock"""
+    return list(
+        Enrollment.objects.select_for_update().filter(pk__in=enrollment_ids).order_by('pk').values_list('pk', flat=True)
+    )
+
+
+@transaction.atomic
+def mark_lecture_complete(enrollment, lecture_id):
+    """
+    Record a completion, creating the progress row on first activity.
+    Returns True if the lecture was newly completed.
+    """
+    lock_enrollments([enrollment.id])
+    newly_completed, _ = apply_progress(enrollment.id, completions=[lecture_id])
+    return lecture_id in newly_completed
+
+
+def _event_cache_key(student_id, event_id):
+    return f'progress_event:{student_id}:{event_id}'
+
+
+def ingest_progress_events(student, events):
+    """
+    Apply a batch of completion/heartbeat events for one student.
+    
+    Events are deduplicated by event_id within the batch and, best effort,
+    across batches via the cache. Events are then grouped per enrollment and
+    applied with set-based statements under one transaction. Returns one
+    {'event_id', 'status'} result per input event, in input order.
+    """
+    results = [None] * len(events)
+    
+    # Dedupe within the request (first occurrence wins) and against recent batches
+    first_index = {}
+    for index, event in enumerate(events):
+        if event['event_id'] in first_index:
+            results[index] = 'duplicate'
+        else:
+            first_index[event['event_id']] = index
+    
+    seen = cache.get_many([_event_cache_key(student.id, event_id) for event_id in first_index])
+    for event_id, index in first_index.items():
+        if _event_cache_key(student.id, event_id) in seen:
+            results[index] = 'duplicate'
+    
+    pending = [index for index in first_index.values() if results[index] is None]
+    
+    # Resolve every lecture to the student's enrollment in one query
+    lecture_ids = {events[index]['lecture_id'] for index in pending}
+    enrollment_for_lecture = dict(
+        Lecture.objects.filter(id__in=lecture_ids, module__course__enrollments__student=student)
+        .values_list('id', 'module__course__enrollments__id')
+    )
+    
+    grouped = {}
+    for index in pending:
+        event = events[index]
+        enrollment_id = enrollment_for_lecture.get(event['lecture_id'])
+        if enrollment_id is None:
+            results[index] = 'not_enrolled'
+            continue
+        batch = grouped.setdefault(enrollment_id, {'completions': set(), 'positions': {}, 'indexes': []})
+        if event['type'] == 'complete':
+            batch['completions'].add(event['lecture_id'])
+        if event.get('position') is not None:
+            # Later events in the batch win for watch position
+            batch['positions'][event['lecture_id']] = event['position']
+        batch['indexes'].append(index)
+    
+    now = timezone.now()
+    with transaction.atomic():
+        lock_enrollments(grouped)
+        for enrollment_id, batch in grouped.items():
+            newly_completed, _ = apply_progress(
+                enrollment_id, batch['completions'], batch['positions'], when=now
+            )
+            for index in batch['indexes']:
+                event = events[index]
+                if event['type'] == 'heartbeat':
+                    results[index] = 'recorded'
+                elif event['lecture_id'] in newly_completed:
+                    # Only the first completion event for a lecture counts
+                    newly_completed.discard(event['lecture_id'])
+                    results[index] = 'completed'
+                else:
+                    results[index] = 'already_completed'
+    
+    applied = {
+        _event_cache_key(student.id, events[index]['event_id']): 1
+        for batch in grouped.values() for index in batch['indexes']
+    }
+    cache.set_many(applied, timeout=EVENT_DEDUP_TIMEOUT)
+    
+    return [
+        {'event_id': event['event_id'], 'status': result}
+        for event, result in zip(events, results)
+    ]
@@ -0,0 +1,29 @@
+# enrollments/signals.py
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .models import Enrollment, LectureProgress
+from courses.models import Lecture
+from courses.stats import adjust_enrollment_count
+
+
+@receiver(post_save, sender=Enrollment)
+def enrollment_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_enrollment_count(instance.course_id, 1)
+
+
+@receiver(post_delete, sender=Enrollment)
+def enrollment_deleted(sender, instance, **kwargs):
+    adjust_enrollment_count(instance.course_id, -1)
+
+
+@receiver(pre_delete, sender=Lecture)
+def lecture_deleted(sender, instance, **kwargs):
+    # One UPDATE for everyone who completed the lecture; its progress rows
+    # then go with Django's fast cascade delete
+    completed = LectureProgress.objects.filter(lecture=instance, completed=True).values('enrollment_id')
+    Enrollment.objects.filter(id__in=completed, completed_lectures__gt=0).update(
+        completed_lectures=F('completed_lectures') - 1
+    )
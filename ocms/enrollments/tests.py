@@ -1,3 +1,199 @@
-from django.test import TestCase
+# enrollments/tests.py
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import User
+from courses.models import Course, Module, Lecture
+from .models import Enrollment, LectureProgress
+from .services import enroll_student
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def make_course(instructor, title, lectures):
+    course = Course.objects.create(
+        title=title, description='Course', instructor=instructor, price=10, is_published=True
+    )
+    module = Module.objects.create(course=course, title='Module', order=1)
+    for order in range(lectures):
+        Lecture.objects.create(module=module, title=f'Lecture {order}', order=order, duration=60)
+    return course
+
+
+class BulkEnrollTests(TestCase):
+    """A cohort is enrolled in one pass and every requested id is accounted for"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor@example.com', None, full_name='Instructor', role='INSTRUCTOR')
+        cls.course = make_course(cls.instructor, 'Cohort', lectures=3)
+        cls.students = User.objects.bulk_create(
+            User(email=f'student{index}@example.com', full_name='Student') for index in range(4)
+        )
+        cls.other_instructor = User.objects.create_user('other@example.com', None, full_name='Other', role='INSTRUCTOR')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.instructor)
+
+    def bulk_enroll(self, student_ids):
+        return self.client.post(f'/api/course/{self.course.id}/bulk-enroll/', {'student_ids': student_ids}, format='json')
+
+    def test_enrolled_already_enrolled_and_invalid(self):
+        first, second, third, fourth = (student.id for student in self.students)
+        enroll_student(self.students[0], self.course)
+        User.objects.filter(pk=fourth).update(is_active=False)
+
+        response = self.bulk_enroll([first, second, third, fourth, self.other_instructor.id, 999999, second])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['enrolled'], [second, third])
+        self.assertEqual(response.data['already_enrolled'], [first])
+        self.assertEqual(response.data['invalid'], sorted([fourth, self.other_instructor.id, 999999]))
+        self.assertEqual(
+            set(Enrollment.objects.filter(course=self.course).values_list('student_id', flat=True)), {first, second, third}
+        )
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.enrollment_count, 3)
+
+        # A repeat is a no-op that reports everyone as already enrolled
+        response = self.bulk_enroll([first, second, third])
+        self.assertEqual(response.data['enrolled'], [])
+        self.assertEqual(response.data['already_enrolled'], [first, second, third])
+
+    def test_only_the_owner_or_an_admin(self):
+        self.client.force_authenticate(self.other_instructor)
+        response = self.bulk_enroll([self.students[0].id])
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Enrollment.objects.filter(course=self.course).exists())
+
+
+class ProgressQueryCountTests(TestCase):
+    """The progress path costs a fixed number of queries, whatever the course or enrollment size"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor@example.com', 'pw', full_name='Instructor', role='INSTRUCTOR')
+        cls.student = User.objects.create_user('student@example.com', 'pw', full_name='Student')
+        cls.small = make_course(cls.instructor, 'Small', lectures=2)
+        cls.large = make_course(cls.instructor, 'Large', lectures=20)
+        for course in (cls.small, cls.large):
+            enroll_student(cls.student, course)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def lecture(self, course, index=0):
+        return Lecture.objects.filter(module__course=course).order_by('order')[index]
+
+    def test_mark_lecture_complete(self):
+        for course in (self.small, self.large):
+            lecture = self.lecture(course)
+            with self.subTest(course=course.title):
+                with self.assertNumQueries(8):
+                    response = self.client.post(f'/api/lecture/{lecture.id}/complete/')
+                self.assertEqual(response.data['message'], 'Lecture marked as completed')
+
+    def test_mark_lecture_complete_again(self):
+        lecture = self.lecture(self.large)
+        self.client.post(f'/api/lecture/{lecture.id}/complete/')
+        with self.assertNumQueries(5):
+            response = self.client.post(f'/api/lecture/{lecture.id}/complete/')
+        self.assertEqual(response.data['message'], 'Lecture already completed')
+
+    def test_last_lecture_completes_enrollment(self):
+        for index in range(2):
+            self.client.post(f'/api/lecture/{self.lecture(self.small, index).id}/complete/')
+        enrollment = Enrollment.objects.get(student=self.student, course=self.small)
+        self.assertEqual(enrollment.status, 'COMPLETED')
+
+    def test_enrollment_list(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/my-courses/')
+        self.assertEqual(len(response.data['results']), 2)
+
+        for index in range(5):
+            enroll_student(self.student, make_course(self.instructor, f'Extra {index}', lectures=3))
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/my-courses/')
+        self.assertEqual(len(response.data['results']), 7)
+
+    def test_progress(self):
+        for url in ('/api/my-progress/', '/api/my-courses/progress/', f'/api/course/{self.large.id}/progress/'):
+            with self.subTest(url=url):
+                with self.assertNumQueries(1):
+                    self.client.get(url)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ProgressEventsTests(TestCase):
+    """Batched player events are deduplicated, checked against enrollments and applied once"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor@example.com', None, full_name='Instructor', role='INSTRUCTOR')
+        cls.student = User.objects.create_user('student@example.com', None, full_name='Student')
+        cls.course = make_course(cls.instructor, 'Enrolled', lectures=3)
+        cls.other = make_course(cls.instructor, 'Not enrolled', lectures=1)
+        enroll_student(cls.student, cls.course)
+        cls.lectures = list(Lecture.objects.filter(module__course=cls.course).order_by('order'))
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def post(self, *events):
+        response = self.client.post('/api/progress/events/', {'events': [
+            {'event_id': event_id, 'lecture_id': lecture.id, 'type': kind, **extra}
+            for event_id, lecture, kind, extra in events
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def statuses(self, data):
+        return [result['status'] for result in data['results']]
+
+    def enrollment(self):
+        return Enrollment.objects.get(student=self.student, course=self.course)
+
+    def test_batch_results(self):
+        first, second, _ = self.lectures
+        other_lecture = Lecture.objects.get(module__course=self.other)
+        data = self.post(
+            ('e1', first, 'complete', {}),
+            ('e1', first, 'complete', {}),
+            ('e2', first, 'complete', {}),
+            ('e3', second, 'heartbeat', {'position': 30}),
+            ('e4', other_lecture, 'complete', {}),
+        )
+        self.assertEqual(
+            self.statuses(data), ['completed', 'duplicate', 'already_completed', 'recorded', 'not_enrolled']
+        )
+        self.assertEqual(data['completed'], 1)
+        self.assertEqual(self.enrollment().completed_lectures, 1)
+        self.assertEqual(
+            LectureProgress.objects.get(enrollment=self.enrollment(), lecture=second).completed, False
+        )
+        self.assertFalse(LectureProgress.objects.filter(lecture=other_lecture).exists())
+
+    def test_replayed_batch_is_duplicate(self):
+        events = [('e1', self.lectures[0], 'complete', {})]
+        self.assertEqual(self.statuses(self.post(*events)), ['completed'])
+        self.assertEqual(self.statuses(self.post(*events)), ['duplicate'])
+        self.assertEqual(self.enrollment().completed_lectures, 1)
+
+    def test_last_completion_completes_enrollment(self):
+        self.post(('e1', self.lectures[0], 'complete', {}))
+        self.assertEqual(self.enrollment().status, 'ACTIVE')
+
+        data = self.post(*(
+            (f'e{index}', lecture, 'complete', {}) for index, lecture in enumerate(self.lectures, start=2)
+        ))
+        self.assertEqual(self.statuses(data), ['already_completed', 'completed', 'completed'])
+        enrollment = self.enrollment()
+        self.assertEqual(enrollment.completed_lectures, 3)
+        self.assertEqual(enrollment.status, 'COMPLETED')
+        self.assertIsNotNone(enrollment.completed_at)
+        self.assertIsNotNone(enrollment.last_activity)
@@ -4,8 +4,11 @@ from . import views
 
 urlpatterns = [
     path('enroll/', views.EnrollCourseView.as_view(), name='enroll-course'),
+    path('course/<int:course_id>/bulk-enroll/', views.BulkEnrollView.as_view(), name='bulk-enroll'),
     path('my-courses/', views.MyCoursesView.as_view(), name='my-courses'),
+    path('my-courses/progress/', views.MyCoursesProgressView.as_view(), name='my-courses-progress'),
     path('my-progress/', views.MyProgressView.as_view(), name='my-progress'),
     path('course/<int:course_id>/progress/', views.CourseProgressView.as_view(), name='course-progress'),
     path('lecture/<int:lecture_id>/complete/', views.MarkLectureCompleteView.as_view(), name='mark-complete'),
+    path('progress/events/', views.ProgressEventsView.as_view(), name='progress-events'),
 ]
\ No newline at end of file
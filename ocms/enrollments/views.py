@@ -3,11 +3,20 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Sum
+from django.db import IntegrityError
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 
-from .models import Enrollment, LectureProgress
-from courses.models import Course, Lecture
-from .serializers import EnrollmentSerializer, EnrollCourseSerializer, LectureProgressSerializer, CourseProgressSerializer
+from .models import Enrollment
+from courses.models import Course
+from accounts.models import User
+from .serializers import (
+    EnrollmentSerializer, EnrollmentProgressSerializer, EnrollCourseSerializer, BulkEnrollSerializer,
+    LectureProgressSerializer, CourseProgressSerializer, ProgressEventBatchSerializer
+)
+from .services import enroll_student, enroll_students, mark_lecture_complete, ingest_progress_events
+from .progress import enrollments_with_progress, build_progress, progress_etag
+from ocms.pagination import KeysetPagination
 
 class IsStudent(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -23,20 +32,17 @@ class EnrollCourseView(APIView):
             course_id = serializer.validated_data['course_id']
             course = Course.objects.get(id=course_id)
             
-            # Create enrollment
-            enrollment = Enrollment.objects.create(
-                student=request.user,
-                course=course,
-                status='ACTIVE'
-            )
+            # One Enrollment row; progress rows are only written once a lecture is completed
+            try:
+                enrollment = enroll_student(request.user, course)
+            except IntegrityError:
+                enrollment = None
             
-            # Create lecture progress entries for all lectures in the course
-            lectures = Lecture.objects.filter(module__course=course)
-            for lecture in lectures:
-                LectureProgress.objects.create(
-                    enrollment=enrollment,
-                    lecture=lecture,
-                    completed=False
+            if enrollment is None:
+                # Lost a race with a concurrent request for the same course
+                return Response(
+                    {'course_id': ['Already enrolled in this course']},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
             
             return Response({
@@ -46,98 +52,145 @@ class EnrollCourseView(APIView):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class BulkEnrollView(APIView):
+    """API endpoint for instructors/admins to enroll a cohort of students in one course"""
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request, course_id):
+        course = get_object_or_404(Course, id=course_id, is_published=True)
+        
+        is_owner = request.user.role == 'INSTRUCTOR' and course.instructor_id == request.user.id
+        if not (is_owner or request.user.role == 'ADMIN'):
+            return Response(
+                {"error": "Only the course instructor or an admin can bulk enroll"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = BulkEnrollSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        student_ids = set(serializer.validated_data['student_ids'])
+        students = list(User.objects.filter(id__in=student_ids, role='STUDENT', is_active=True))
+        found_ids = {student.id for student in students}
+        
+        try:
+            enrollments = enroll_students(course, students)
+        except IntegrityError:
+            return Response(
+                {"error": "Enrollment conflicted with a concurrent request, please retry"},
+                status=status.HTTP_409_CONFLICT
+            )
+        enrolled_ids = {enrollment.student_id for enrollment in enrollments}
+        
+        return Response({
+            'course_id': course.id,
+            'enrolled': sorted(enrolled_ids),
+            'already_enrolled': sorted(found_ids - enrolled_ids),
+            'invalid': sorted(student_ids - found_ids)
+        }, status=status.HTTP_201_CREATED)
+
 class MyCoursesView(generics.ListAPIView):
     """API endpoint for students to see their enrolled courses"""
     serializer_class = EnrollmentSerializer
     permission_classes = [permissions.IsAuthenticated, IsStudent]
+    pagination_class = KeysetPagination
+    keyset_ordering = '-enrolled_at'
     
     def get_queryset(self):
-        return Enrollment.objects.filter(student=self.request.user).select_related('course__instructor')
+        return Enrollment.objects.filter(student=self.request.user).select_related('course__instructor', 'course__category')
+
+class MyCoursesProgressView(APIView):
+    """
+    API endpoint returning enrolled courses with embedded progress in one response.
+    Optional ?course_ids=1,2,3 restricts the result; read-only, one query.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsStudent]
+    
+    def get(self, request):
+        filters = {}
+        course_ids = request.query_params.get('course_ids')
+        if course_ids:
+            try:
+                filters['course_id__in'] = [int(value) for value in course_ids.split(',') if value.strip()]
+            except ValueError:
+                return Response(
+                    {"error": "course_ids must be a comma-separated list of integers"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        enrollments = enrollments_with_progress(request.user, **filters)
+        serializer = EnrollmentProgressSerializer(enrollments, many=True)
+        return Response(serializer.data)
 
 class CourseProgressView(APIView):
-    """API endpoint to get progress for a specific course"""
+    """
+    API endpoint to get progress for a specific course
+    Read-only, so it can be served from a replica; supports If-None-Match
+    """
     permission_classes = [permissions.IsAuthenticated, IsStudent]
     
     def get(self, request, course_id):
-        # Get enrollment
-        enrollment = get_object_or_404(Enrollment, student=request.user, course_id=course_id)
-        
-        # Get all lectures for the course
-        total_lectures = Lecture.objects.filter(module__course_id=course_id).count()
-        
-        # Get completed lectures
-        completed_lectures = LectureProgress.objects.filter(
-            enrollment=enrollment,
-            completed=True
-        ).count()
-        
-        # Calculate progress
-        progress_percentage = (completed_lectures / total_lectures * 100) if total_lectures > 0 else 0
+        # Pure read: status transitions happen when lectures are completed
+        enrollment = get_object_or_404(enrollments_with_progress(request.user, course_id=course_id))
+        data = build_progress(enrollment)
         
-        # Update enrollment status if all lectures completed
-        if progress_percentage == 100 and enrollment.status == 'ACTIVE':
-            enrollment.status = 'COMPLETED'
-            enrollment.save()
+        etag = progress_etag(data)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(CourseProgressSerializer(data).data)
         
-        data = {
-            'course_id': course_id,
-            'course_title': enrollment.course.title,
-            'total_lectures': total_lectures,
-            'completed_lectures': completed_lectures,
-            'progress_percentage': round(progress_percentage, 2),
-            'status': enrollment.status
-        }
-        
-        serializer = CourseProgressSerializer(data)
-        return Response(serializer.data)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
 
 class MarkLectureCompleteView(APIView):
     """API endpoint to mark a lecture as completed"""
     permission_classes = [permissions.IsAuthenticated, IsStudent]
     
     def post(self, request, lecture_id):
-        # Get lecture progress
-        lecture_progress = get_object_or_404(
-            LectureProgress,
-            lecture_id=lecture_id,
-            enrollment__student=request.user
+        # Enrollment in the course that owns the lecture; works for lectures
+        # added after the student enrolled since progress rows are created lazily
+        enrollment = get_object_or_404(
+            Enrollment,
+            student=request.user,
+            course__modules__lectures__id=lecture_id
         )
         
         # Mark as completed
-        if not lecture_progress.completed:
-            lecture_progress.completed = True
-            lecture_progress.completed_at = timezone.now()
-            lecture_progress.save()
-            
+        if mark_lecture_complete(enrollment, lecture_id):
             return Response({'message': 'Lecture marked as completed'})
         
         return Response({'message': 'Lecture already completed'})
 
+class ProgressEventsView(APIView):
+    """
+    API endpoint for video players to submit completion/heartbeat events in batches.
+    Events are deduplicated by event_id and applied set-based per enrollment.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsStudent]
+    
+    def post(self, request):
+        serializer = ProgressEventBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        results = ingest_progress_events(request.user, serializer.validated_data['events'])
+        return Response({
+            'results': results,
+            'completed': sum(1 for result in results if result['status'] == 'completed')
+        })
+
 class MyProgressView(APIView):
     """API endpoint to get progress for all enrolled courses"""
     permission_classes = [permissions.IsAuthenticated, IsStudent]
     
     def get(self, request):
-        enrollments = Enrollment.objects.filter(student=request.user).select_related('course')
-        
         progress_data = []
-        for enrollment in enrollments:
-            total_lectures = Lecture.objects.filter(module__course=enrollment.course).count()
-            completed_lectures = LectureProgress.objects.filter(
-                enrollment=enrollment,
-                completed=True
-            ).count()
-            
-            progress = (completed_lectures / total_lectures * 100) if total_lectures > 0 else 0
-            
-            progress_data.append({
-                'course_id': enrollment.course.id,
-                'course_title': enrollment.course.title,
-                'total_lectures': total_lectures,
-                'completed_lectures': completed_lectures,
-                'progress': round(progress, 2),
-                'status': enrollment.status,
-                'enrolled_at': enrollment.enrolled_at
-            })
+        for enrollment in enrollments_with_progress(request.user):
+            data = build_progress(enrollment)
+            data['progress'] = data.pop('progress_percentage')
+            progress_data.append(data)
         
         return Response(progress_data)
\ No newline at end of file
@@ -0,0 +1,315 @@
+# ocms/cache.py
+"""
+Shared cache layer used by every app.
+
+`get_or_compute` / `get_or_compute_many` wrap computed values in an
+envelope `(value, fresh_until, compute_seconds)` stored for `timeout + stale`
+seconds, and add on top of the plain cache:
+
+- single-flight: on a miss one caller takes a short lock (cache.add) and
+  computes; the others wait briefly for its result instead of piling onto
+  the database, and compute themselves only if it never shows up.
+- probabilistic early refresh (XFetch): shortly before `fresh_until` a
+  caller may volunteer to recompute, more likely the closer to expiry and
+  the more expensive the value, so hot keys are refreshed before they
+  expire instead of all at once after.
+- stale-while-revalidate: past `fresh_until` the caller holding the lock
+  recomputes while everyone else keeps being served the stale value.
+- negative caching: a computed None is cached for `negative_timeout` so
+  lookups of missing rows don't hit the database every time.
+- fill guard: delete/delete_many leave a short-lived tombstone per key, and
+  a computed value is not written if its key's tombstone changed while it
+  was being computed, since it may have been read before the delete.
+- per-family counters (ocms_cache_events_total in /metrics); the family
+  defaults to the key with its ids stripped, e.g. course_rating_12 ->
+  course_rating.
+
+Reads given a `local_timeout` are also served from the per-process L1 in
+ocms/local_cache.py. L1 keys must only be invalidated with delete,
+delete_many or incr, which broadcast to every worker; a plain set does not.
+
+Every backend call degrades to "not cached" on error, and after one error
+the cache is skipped entirely for BACKEND_RETRY_AFTER seconds so a dead
+Redis costs one timeout, not one per lookup. The plain get/set/delete/...
+helpers follow the same rules for values that don't need an envelope.
+"""
+import math
+import random
+import re
+import time
+import uuid
+from collections import Counter
+
+from django.core.cache import cache
+
+from ocms.local_cache import MISSING, local
+from ocms.metrics import CACHE_EVENTS, record_cache
+
+DEFAULT_TIMEOUT = 300
+# Seconds a lock holder may take to compute before others stop waiting on it
+LOCK_TIMEOUT = 10
+# How long a caller waits on another's computation before doing it itself
+LOCK_WAIT = 1.0
+LOCK_POLL = 0.02
+BACKEND_RETRY_AFTER = 5
+# How long a delete's tombstone outlives it; fills taking longer are not guarded
+FILL_GUARD_TIMEOUT = 60
+EARLY_REFRESH_BETA = 1.0
+
+_backend_down_until = 0.0
+
+
+def key_family(key):
+    """'course_rating_12' -> 'course_rating', 'catalog:171:ab12' -> 'catalog'"""
+    return re.sub(r'[_:]?\d+$', '', key.split(':', 1)[0]) or key
+
+
+def _available():
+    return time.monotonic() >= _backend_down_until
+
+
+def _failed():
+    global _backend_down_until
+    _backend_down_until = time.monotonic() + BACKEND_RETRY_AFTER
+    CACHE_EVENTS.inc(1, 'backend', 'error')
+
+
+def _call(method, *args, default=None, **kwargs):
+    if not _available():
+        return default
+    try:
+        return getattr(cache, method)(*args, **kwargs)
+    except Exception:
+        _failed()
+        return default
+
+
+# Plain values
+
+def get(key, default=None, local_timeout=None):
+    if local_timeout:
+        value = local.get(key)
+        if value is not MISSING:
+            record_cache(hits=1)
+            return value
+        generation = local.generation
+    value = _call('get', key)
+    record_cache(hits=value is not None, misses=value is None)
+    if value is None:
+        return default
+    if local_timeout:
+        local.set(key, value, local_timeout, generation)
+    return value
+
+
+def get_many(keys):
+    values = _call('get_many', list(keys), default={})
+    record_cache(hits=len(values), misses=len(keys) - len(values))
+    return values
+
+
+def set(key, value, timeout=DEFAULT_TIMEOUT):
+    _call('set', key, value, timeout=timeout)
+
+
+def set_many(values, timeout=DEFAULT_TIMEOUT):
+    if values:
+        _call('set_many', values, timeout=timeout)
+
+
+def add(key, value, timeout=DEFAULT_TIMEOUT):
+    """cache.add; False when the key exists or the cache is unavailable"""
+    return bool(_call('add', key, value, timeout=timeout, default=False))
+
+
+# The L1 broadcast goes out after the backend write: invalidating first would
+# let another worker refill its L1 from the old value in between.
+
+def incr(key, delta=1):
+    """cache.incr; None when the key is missing or the cache is unavailable"""
+    value = None
+    if _available():
+        try:
+            value = cache.incr(key, delta)
+        except ValueError:
+            pass
+        except Exception:
+            _failed()
+    local.invalidate([key])
+    return value
+
+
+def delete(key):
+    delete_many([key])
+
+
+def delete_many(keys):
+    if keys:
+        keys = list(keys)
+        # Tombstones first: a fill that checks between the two writes is dropped too
+        token = uuid.uuid4().hex
+        _call('set_many', {_tombstone_key(key): token for key in keys}, timeout=FILL_GUARD_TIMEOUT)
+        _call('delete_many', keys)
+        local.invalidate(keys)
+
+
+# Computed values
+
+def _lock_key(key):
+    return f'lock:{key}'
+
+
+def _tombstone_key(key):
+    return f'gone:{key}'
+
+
+def _state(entry, now, beta):
+    """'fresh', 'early' (volunteer to refresh), 'stale' or None for a missing/foreign entry"""
+    if not (isinstance(entry, tuple) and len(entry) == 3):
+        return None
+    _, fresh_until, delta = entry
+    if now >= fresh_until:
+        return 'stale'
+    # XFetch: -log(U) is exponential, scaled by how long the value took to compute
+    if delta and beta and now - delta * beta * math.log(1 - random.random()) >= fresh_until:
+        return 'early'
+    return 'fresh'
+
+
+def _wait_for(keys, now):
+    """Poll for entries other callers are computing, up to LOCK_WAIT"""
+    found = {}
+    deadline = time.monotonic() + LOCK_WAIT
+    pending = list(keys)
+    while pending and time.monotonic() < deadline:
+        time.sleep(LOCK_POLL)
+        entries = _call('get_many', pending, default={})
+        for key, entry in entries.items():
+            if _state(entry, now, 0) is not None:
+                found[key] = entry
+        pending = [key for key in pending if key not in found]
+    return found
+
+
+def get_or_compute_many(keys, compute, timeout=DEFAULT_TIMEOUT, stale=None, negative_timeout=60,
+                        family=None, beta=EARLY_REFRESH_BETA, local_timeout=None):
+    """
+    Values for many keys with one get_many. `compute(keys)` is called once
+    with the keys this caller has to (re)compute and returns {key: value};
+    keys it leaves out or maps to None are cached as negative entries.
+    Returns {key: value} for keys with a non-None value.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    family = family or key_family(keys[0])
+    if local_timeout:
+        found = {}
+        for key in keys:
+            value = local.get(key)
+            if value is not MISSING:
+                found[key] = value
+        if found:
+            CACHE_EVENTS.inc(len(found), family, 'local_hit')
+            record_cache(hits=len(found))
+        generation = local.generation
+        remaining = [key for key in keys if key not in found]
+        if remaining:
+            values = get_or_compute_many(
+                remaining, compute, timeout=timeout, stale=stale, negative_timeout=negative_timeout,
+                family=family, beta=beta
+            )
+            for key in remaining:
+                value = values.get(key)
+                local.set(key, value, min(local_timeout, timeout if value is not None else negative_timeout),
+                          generation)
+                found[key] = value
+        return {key: value for key, value in found.items() if value is not None}
+    stale = timeout if stale is None else stale
+    now = time.time()
+    entries = _call('get_many', keys, default={})
+
+    values, refresh, missing = {}, [], []
+    events = Counter()
+    for key in keys:
+        entry = entries.get(key)
+        state = _state(entry, now, beta)
+        if state is None:
+            missing.append(key)
+            continue
+        values[key] = entry[0]
+        if state == 'fresh':
+            events['hit' if entry[0] is not None else 'negative_hit'] += 1
+        elif add(_lock_key(key), 1, timeout=LOCK_TIMEOUT):
+            refresh.append(key)
+            events[f'{state}_refresh'] += 1
+        else:
+            # Someone else is refreshing it; serve what we have
+            events[f'{state}_served'] += 1
+
+    if missing:
+        events['miss'] = len(missing)
+        if _available():
+            owned = [key for key in missing if add(_lock_key(key), 1, timeout=LOCK_TIMEOUT)]
+            waiting = [key for key in missing if key not in owned]
+            if waiting:
+                events['lock_wait'] = len(waiting)
+                found = _wait_for(waiting, now)
+                values.update((key, entry[0]) for key, entry in found.items())
+                owned += [key for key in waiting if key not in found]
+            refresh += owned
+        else:
+            refresh += missing
+
+    for result, count in events.items():
+        CACHE_EVENTS.inc(count, family, result)
+    record_cache(hits=len(keys) - len(missing), misses=len(missing))
+
+    if refresh:
+        tombstones = [_tombstone_key(key) for key in refresh]
+        guards = _call('get_many', tombstones, default={})
+        try:
+            start = time.perf_counter()
+            try:
+                computed = compute(refresh)
+            except Exception:
+                # Stale-if-error: a failed refresh keeps serving the old values
+                if any(key not in values for key in refresh):
+                    raise
+                CACHE_EVENTS.inc(len(refresh), family, 'refresh_error')
+                return {key: value for key, value in values.items() if value is not None}
+            delta = time.perf_counter() - start
+            # Deleted while computing: this value may predate the delete, leave the key empty
+            current = _call('get_many', tombstones, default={})
+            raced = {key for key, tombstone in zip(refresh, tombstones)
+                     if current.get(tombstone) != guards.get(tombstone)}
+            if raced:
+                CACHE_EVENTS.inc(len(raced), family, 'fill_raced')
+            written_at = time.time()
+            fresh, negative = {}, {}
+            for key in refresh:
+                value = computed.get(key)
+                values[key] = value
+                if key in raced:
+                    continue
+                if value is None:
+                    negative[key] = (None, written_at + negative_timeout, 0)
+                else:
+                    fresh[key] = (value, written_at + timeout, delta)
+            set_many(fresh, timeout=timeout + stale)
+            set_many(negative, timeout=negative_timeout)
+        finally:
+            # Released only after the write, so waiters find the value instead of recomputing
+            if _available():
+                _call('delete_many', [_lock_key(key) for key in refresh])
+
+    return {key: value for key, value in values.items() if value is not None}
+
+
+def get_or_compute(key, compute, timeout=DEFAULT_TIMEOUT, stale=None, negative_timeout=60,
+                   family=None, beta=EARLY_REFRESH_BETA, local_timeout=None):
+    """Single-key get_or_compute_many; `compute()` takes no arguments"""
+    return get_or_compute_many(
+        [key], lambda keys: {key: compute()}, timeout=timeout, stale=stale,
+        negative_timeout=negative_timeout, family=family, beta=beta, local_timeout=local_timeout
+    ).get(key)
@@ -0,0 +1,174 @@
+# ocms/invalidation.py
+"""
+Declarative cache invalidation.
+
+Apps register rules mapping a model change to the cache targets it makes
+stale:
+
+    @invalidation.rule(Course, watch=('is_published',))
+    def course_targets(change):
+        yield rating_cache_key(change.instance.pk)      # a cache key
+        if change.visible('is_published'):
+            yield Tag(CATALOG)                          # a tag
+        yield Tag(COURSE_DOCUMENT, change.instance.pk)  # a tag with an argument
+
+Rules run from post_save and pre_delete, so view writes, admin edits and
+shell saves are all covered; `watch` fields are read back in pre_save so a
+rule can tell what changed, and deletes are seen before the cascade, while
+related rows (a lecture's module, a category's courses) still exist.
+
+Targets are collected per thread and applied once per commit: one
+delete_many for the keys (broadcast to every worker's L1) and one call per
+tag handler with the set of arguments gathered, e.g. one catalog version
+bump and one document rebuild for all touched courses.
+
+Writers that bypass signals (bulk_create, queryset.update) call
+`schedule(...)` with the targets themselves.
+
+The pre_save read is the one read of the stored row per save: other
+post_save handlers declare the fields they need with `watch(...)` and get
+them from `previous(instance, field)` instead of selecting the row again.
+"""
+import threading
+from collections import namedtuple
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete
+
+from ocms import cache
+
+
+class Tag(namedtuple('Tag', 'name arg')):
+    """A named group of cache entries, cleared by the handler registered for `name`"""
+
+    def __new__(cls, name, arg=None):
+        return super().__new__(cls, name, arg)
+
+
+class Change:
+    """One saved or deleted instance, with the stored values of the rule's watched fields"""
+
+    def __init__(self, instance, created=False, deleted=False, previous=None):
+        self.instance = instance
+        self.created = created
+        self.deleted = deleted
+        self.previous = previous or {}
+
+    def changed(self, *fields):
+        """Created, deleted, or any of these watched fields now differs from the stored value"""
+        if self.created or self.deleted:
+            return True
+        return any(
+            field in self.previous and self.previous[field] != getattr(self.instance, field)
+            for field in fields
+        )
+
+    def before(self, field):
+        """Stored value of a watched field (the current value when it wasn't read back)"""
+        return self.previous.get(field, getattr(self.instance, field))
+
+    def visible(self, flag):
+        """True when the instance is public (by boolean `flag`) before or after the change"""
+        return bool(getattr(self.instance, flag) or (not self.created and self.before(flag)))
+
+
+_rules = {}
+_tags = {}
+_pending = threading.local()
+
+
+def register_tag(name, handler):
+    """`handler(args)` receives the set of arguments yielded with this tag in one transaction"""
+    _tags[name] = handler
+
+
+def rule(model, watch=()):
+    def decorator(fn):
+        rules = _rules.setdefault(model, [])
+        if not rules:
+            _connect(model)
+        rules.append((fn, tuple(watch)))
+        return fn
+    return decorator
+
+
+def watch(model, *fields):
+    """Read these fields back in pre_save too, for `previous()`"""
+    rule(model, watch=fields)(lambda change: ())
+
+
+def previous(instance, field):
+    """
+    Stored value of a watched field before the current save, None for a new
+    row. A field the save doesn't write (update_fields) reads as unchanged.
+    """
+    stored = getattr(instance, '_invalidation_previous', None)
+    if stored is None:
+        return None
+    return stored.get(field, getattr(instance, field))
+
+
+def _connect(model):
+    uid = f'ocms.invalidation.{model._meta.label}'
+    pre_save.connect(_capture, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(_saved, sender=model, weak=False, dispatch_uid=uid)
+    pre_delete.connect(_deleted, sender=model, weak=False, dispatch_uid=uid)
+
+
+def _capture(sender, instance, update_fields=None, **kwargs):
+    fields = {field for _, watch in _rules[sender] for field in watch}
+    if update_fields is not None:
+        fields &= {sender._meta.get_field(name).attname for name in update_fields} | set(update_fields)
+    instance._invalidation_previous = None if instance._state.adding else {}
+    if fields and not instance._state.adding:
+        fields = sorted(fields)
+        row = sender._default_manager.filter(pk=instance.pk).values(*fields).first()
+        instance._invalidation_previous = row or {}
+
+
+def _saved(sender, instance, created, **kwargs):
+    previous = {} if created else getattr(instance, '_invalidation_previous', None) or {}
+    _apply(sender, Change(instance, created=created, previous=previous))
+
+
+def _deleted(sender, instance, **kwargs):
+    _apply(sender, Change(instance, deleted=True))
+
+
+def _apply(model, change):
+    targets = []
+    for fn, _ in _rules[model]:
+        targets.extend(fn(change) or ())
+    schedule(targets)
+
+
+def schedule(targets):
+    """
+    Queue cache keys and Tags for invalidation when the current transaction
+    commits (immediately outside one). Every commit callback flushes all that
+    is pending on this thread, so later callbacks of the same commit are
+    no-ops; targets left by a rolled back transaction go out, harmlessly,
+    with the next flush.
+    """
+    targets = list(targets)
+    if not targets:
+        return
+    if not hasattr(_pending, 'targets'):
+        _pending.targets = set()
+    _pending.targets.update(targets)
+    transaction.on_commit(flush, robust=True)
+
+
+def flush():
+    targets, _pending.targets = getattr(_pending, 'targets', set()), set()
+    if not targets:
+        return
+    keys = [target for target in targets if isinstance(target, str)]
+    tags = {}
+    for target in targets:
+        if isinstance(target, Tag):
+            tags.setdefault(target.name, set()).add(target.arg)
+
+    for name, args in tags.items():
+        _tags[name]({arg for arg in args if arg is not None})
+    cache.delete_many(keys)
@@ -0,0 +1,241 @@
+# ocms/local_cache.py
+"""
+Per-process L1 cache in front of Redis, used by ocms/cache.py for keys read
+with a `local_timeout`.
+
+Entries live in a size-bounded LRU (entry count and approximate pickled
+bytes) with a per-entry TTL. Invalidations (cache.delete/incr) drop the key
+locally and are broadcast on an invalidation bus so every other worker
+drops it too:
+
+- RedisBus: a Redis pub/sub channel with a daemon subscriber thread per
+  process. While the subscriber is not connected the L1 is cleared and
+  bypassed, since invalidations may have been missed.
+- LocalBus: in-process stand-in for single-process setups and tests
+  (locmem cache), delivering synchronously.
+
+CACHE_INVALIDATION_BUS picks one ('redis'/'local'); by default Redis is used
+when the default cache is django_redis. CACHE_L1_MAX_ENTRIES = 0 disables
+the L1.
+"""
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from ocms.metrics import CACHE_EVENTS
+
+INVALIDATION_CHANNEL = 'ocms:cache:invalidate'
+RECONNECT_DELAY = 1.0
+
+MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Bumped by every invalidation, so fills that raced one are dropped
+        self.generation = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return MISSING
+            value, expires_at, _ = item
+            if time.monotonic() >= expires_at:
+                self._pop(key)
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout, generation=None):
+        try:
+            size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)) + len(key)
+        except Exception:
+            return
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._pop(key)
+            self._entries[key] = (value, time.monotonic() + timeout, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def discard(self, keys):
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def _pop(self, key):
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self._bytes -= item[2]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class LocalBus:
+    """Synchronous in-process bus: every publish is delivered immediately"""
+
+    def __init__(self, on_message, on_reset):
+        self.on_message = on_message
+        self.on_reset = on_reset
+
+    @property
+    def healthy(self):
+        return True
+
+    def start(self):
+        pass
+
+    def publish(self, keys):
+        self.on_message(keys)
+
+
+class RedisBus:
+    """Redis pub/sub bus with one subscriber thread per process (restarted after fork)"""
+
+    def __init__(self, on_message, on_reset, channel=INVALIDATION_CHANNEL):
+        self.on_message = on_message
+        self.on_reset = on_reset
+        self.channel = channel
+        self._connected = False
+        self._pid = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self):
+        return self._connected and self._pid == os.getpid()
+
+    def start(self):
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._connected = False
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._listen, name='ocms-cache-invalidation', daemon=True)
+            self._thread.start()
+
+    def _connection(self):
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._connection().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Anything published before the subscription was missed
+                self.on_reset()
+                self._connected = True
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self.on_message(json.loads(message['data']))
+            except Exception:
+                CACHE_EVENTS.inc(1, 'l1', 'bus_error')
+            self._connected = False
+            self.on_reset()
+            time.sleep(RECONNECT_DELAY)
+
+    def publish(self, keys):
+        try:
+            self._connection().publish(self.channel, json.dumps(keys))
+        except Exception:
+            # Other workers fall back on their entries' TTL
+            CACHE_EVENTS.inc(1, 'l1', 'publish_error')
+
+
+class LocalCache:
+    """The L1 plus its invalidation bus; inert until the first read"""
+
+    def __init__(self):
+        self._lru = None
+        self._bus = None
+
+    def _setup(self):
+        max_entries = getattr(settings, 'CACHE_L1_MAX_ENTRIES', 5000)
+        max_bytes = getattr(settings, 'CACHE_L1_MAX_BYTES', 32 * 1024 * 1024)
+        self._lru = LRUCache(max_entries, max_bytes)
+        kind = getattr(settings, 'CACHE_INVALIDATION_BUS', None)
+        if kind is None:
+            backend = settings.CACHES['default']['BACKEND']
+            kind = 'redis' if backend.startswith('django_redis') else 'local'
+        bus_class = RedisBus if kind == 'redis' else LocalBus
+        self._bus = bus_class(self._lru.discard, self._lru.clear)
+
+    @property
+    def enabled(self):
+        if self._lru is None:
+            self._setup()
+        if not self._lru.max_entries:
+            return False
+        self._bus.start()
+        return self._bus.healthy
+
+    @property
+    def generation(self):
+        return self._lru.generation if self._lru is not None else None
+
+    def get(self, key):
+        return self._lru.get(key) if self.enabled else MISSING
+
+    def set(self, key, value, timeout, generation=None):
+        """Fill one key; pass the `generation` read before fetching the value"""
+        if timeout and self.enabled:
+            self._lru.set(key, value, timeout, generation)
+
+    def invalidate(self, keys):
+        """Drop keys here and in every other worker"""
+        if self._lru is None:
+            self._setup()
+        if not self._lru.max_entries:
+            return
+        keys = list(keys)
+        self._lru.discard(keys)
+        self._bus.publish(keys)
+
+    def clear(self):
+        if self._lru is not None:
+            self._lru.clear()
+
+    def reset(self):
+        """Drop the L1 and its bus; the next read sets them up from current settings"""
+        self.clear()
+        self._lru = None
+        self._bus = None
+
+
+local = LocalCache()
+
+
+@receiver(setting_changed)
+def settings_changed(setting, **kwargs):
+    # override_settings in tests: entries and bus belong to the previous cache
+    if setting == 'CACHES' or setting.startswith('CACHE_L1_') or setting == 'CACHE_INVALIDATION_BUS':
+        local.reset()
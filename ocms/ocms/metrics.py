@@ -0,0 +1,196 @@
+# ocms/metrics.py
+"""
+In-process request metrics: per-request query/DB/cache/serializer stats
+collected by ocms.middleware.MetricsMiddleware, aggregated into Prometheus
+histograms and served in text format at /metrics.
+
+Each worker process keeps its own registry, so scrape every worker (or run
+one per container) the way you would with any per-process exporter.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# Stats of the request being handled on this thread/task; None when unsampled
+current = ContextVar('ocms_request_stats', default=None)
+
+
+class RequestStats:
+    __slots__ = ('queries', 'db_time', 'cache_hits', 'cache_misses', 'serializer_time', 'serializer_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook: count and time every statement"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+def record_cache(hits=0, misses=0):
+    stats = current.get()
+    if stats is not None:
+        stats.cache_hits += hits
+        stats.cache_misses += misses
+
+
+def _timed_serializer_data(fget):
+    def data(self):
+        stats = current.get()
+        # Nested .data calls are already inside the outer measurement
+        if stats is None or stats.serializer_depth:
+            return fget(self)
+        stats.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return fget(self)
+        finally:
+            stats.serializer_time += time.perf_counter() - start
+            stats.serializer_depth -= 1
+    data._ocms_timed = True
+    return data
+
+
+def install_serializer_timing():
+    """Time DRF Serializer.data / ListSerializer.data, where representation is built"""
+    from rest_framework import serializers
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        fget = cls.__dict__['data'].fget
+        if not getattr(fget, '_ocms_timed', False):
+            cls.data = property(_timed_serializer_data(fget))
+
+
+# Registry
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in items) + '}'
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.label_names = label_names
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            snapshot = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+        for labels, counts, total, count in sorted(snapshot):
+            named = list(zip(self.label_names, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{_format_labels(named, ("le", bound))} {cumulative}')
+            lines.append(f'{self.name}_bucket{_format_labels(named, ("le", "+Inf"))} {count}')
+            lines.append(f'{self.name}_sum{_format_labels(named)} {total}')
+            lines.append(f'{self.name}_count{_format_labels(named)} {count}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount, *labels):
+        if amount:
+            with self._lock:
+                self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        for labels, value in snapshot:
+            lines.append(f'{self.name}_total{_format_labels(zip(self.label_names, labels))} {value}')
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    'ocms_request_duration_seconds', 'Total request latency (all requests).',
+    LATENCY_BUCKETS, ('view', 'method', 'status')
+)
+REQUEST_QUERIES = Histogram(
+    'ocms_request_db_queries', 'SQL statements per sampled request.', QUERY_BUCKETS, ('view',)
+)
+REQUEST_DB_TIME = Histogram(
+    'ocms_request_db_seconds', 'Time spent in SQL per sampled request.', LATENCY_BUCKETS, ('view',)
+)
+REQUEST_SERIALIZER_TIME = Histogram(
+    'ocms_request_serializer_seconds', 'Time spent building DRF serializer output per sampled request.',
+    LATENCY_BUCKETS, ('view',)
+)
+CACHE_LOOKUPS = Counter('ocms_cache_lookups', 'Cache lookups in sampled requests.', ('view', 'result'))
+SAMPLED_REQUESTS = Counter('ocms_sampled_requests', 'Requests with detailed stats collected.', ('view',))
+CACHE_EVENTS = Counter(
+    'ocms_cache_events', 'Shared cache outcomes (ocms/cache.py) by key family, all requests.', ('family', 'result')
+)
+
+REGISTRY = (
+    REQUEST_DURATION, REQUEST_QUERIES, REQUEST_DB_TIME, REQUEST_SERIALIZER_TIME, CACHE_LOOKUPS, SAMPLED_REQUESTS,
+    CACHE_EVENTS
+)
+
+
+def observe_request(view, method, status, duration, stats=None):
+    REQUEST_DURATION.observe(duration, view, method, str(status))
+    if stats is None:
+        return
+    SAMPLED_REQUESTS.inc(1, view)
+    REQUEST_QUERIES.observe(stats.queries, view)
+    REQUEST_DB_TIME.observe(stats.db_time, view)
+    REQUEST_SERIALIZER_TIME.observe(stats.serializer_time, view)
+    CACHE_LOOKUPS.inc(stats.cache_hits, view, 'hit')
+    CACHE_LOOKUPS.inc(stats.cache_misses, view, 'miss')
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, limited to METRICS_ALLOWED_IPS when set"""
+    allowed = getattr(settings, 'METRICS_ALLOWED_IPS', None)
+    if allowed is not None and request.META.get('REMOTE_ADDR') not in allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
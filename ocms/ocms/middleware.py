@@ -0,0 +1,56 @@
+# ocms/middleware.py
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+
+
+class MetricsMiddleware:
+    """
+    Per-request instrumentation.
+
+    Every request feeds the latency histogram. A METRICS_SAMPLE_RATE fraction
+    of requests also collects query count, DB time, cache hits/misses and
+    serializer time, reported in a Server-Timing header and in /metrics.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'METRICS_SAMPLE_RATE', 1.0)
+        metrics.install_serializer_timing()
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        if random.random() >= self.sample_rate:
+            response = self.get_response(request)
+            self._observe(request, response, time.perf_counter() - start)
+            return response
+
+        stats = metrics.RequestStats()
+        token = metrics.current.set(stats)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(stats.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            metrics.current.reset(token)
+
+        duration = time.perf_counter() - start
+        self._observe(request, response, duration, stats)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"',
+            f'cache;desc="{stats.cache_hits} hit / {stats.cache_misses} miss"',
+            f'ser;dur={stats.serializer_time * 1000:.1f}',
+            f'total;dur={duration * 1000:.1f}',
+        ])
+        return response
+
+    def _observe(self, request, response, duration, stats=None):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name or match._func_path) if match else 'unmatched'
+        metrics.observe_request(view, request.method, response.status_code, duration, stats)
@@ -0,0 +1,182 @@
+# ocms/pagination.py
+import base64
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    Planner row estimate for a queryset on PostgreSQL (no scan), exact
+    COUNT(*) elsewhere.
+    """
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on a (sort key, id) pair.
+
+    Each page is `WHERE key <= last_key AND (key < last_key OR (key = last_key
+    AND id < last_id)) ORDER BY key, id LIMIT n`. The OR alone is only a filter,
+    the redundant `key <= last_key` bound is what the index range scan starts
+    from, so deep pages cost the same as the first one and no COUNT(*) is
+    issued. `?count=approx` adds a planner estimate of the total,
+    `?count=exact` a real count.
+
+    The sort key is the view's `get_keyset_ordering(request)` if it returns
+    one, else its OrderingFilter choice, else `keyset_ordering`/`ordering`;
+    `id` is always appended as the tiebreaker in the same direction.
+    """
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 10)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    ordering = '-created_at'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = self.get_count(queryset, request)
+        rows = list(self.get_page_queryset(queryset, request, view))
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        self.first = rows[0] if rows else None
+        self.last = rows[-1] if rows else None
+        return rows
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """The LIMIT page_size + 1 queryset for the requested page, not yet evaluated"""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.key = self.get_ordering(request, queryset, view)
+        self.field = self.key.lstrip('-')
+        self.descending = self.key.startswith('-')
+
+        self.cursor = self.decode_cursor(request, queryset)
+        self.reverse = bool(self.cursor and self.cursor.get('r'))
+        descending = self.descending != self.reverse
+
+        if self.cursor is not None:
+            value, pk = self.cursor['v'], self.cursor['id']
+            op = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{op}e': value}),
+                Q(**{f'{self.field}__{op}': value}) | Q(**{self.field: value, f'pk__{op}': pk})
+            )
+
+        prefix = '-' if descending else ''
+        return queryset.order_by(f'{prefix}{self.field}', f'{prefix}pk')[:self.page_size + 1]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, request, queryset, view):
+        if hasattr(view, 'get_keyset_ordering'):
+            key = view.get_keyset_ordering(request)
+            if key:
+                return key
+        if view is not None and any(issubclass(backend, OrderingFilter) for backend in getattr(view, 'filter_backends', [])):
+            requested = OrderingFilter().get_ordering(request, queryset, view)
+            if requested:
+                return requested[0]
+        return getattr(view, 'keyset_ordering', self.ordering)
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == 'approx':
+            return estimate_count(queryset)
+        if mode == 'exact':
+            return queryset.count()
+        return None
+
+    def get_key_field(self, queryset):
+        """Model field (or annotation output field) the cursor value is coerced with"""
+        try:
+            return queryset.model._meta.get_field(self.field)
+        except FieldDoesNotExist:
+            return queryset.query.annotations[self.field].output_field
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if cursor['k'] != self.key:
+                raise ValueError('cursor was issued for a different ordering')
+            cursor['v'] = self.get_key_field(queryset).to_python(cursor['v'])
+            cursor['id'] = queryset.model._meta.pk.to_python(cursor['id'])
+            if cursor['v'] is None or cursor['id'] is None:
+                raise ValueError('cursor has no position')
+            return cursor
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError, ValidationError):
+            raise NotFound('Invalid cursor')
+
+    def encode_cursor(self, row, reverse):
+        value = getattr(row, self.field)
+        cursor = {'k': self.key, 'v': value if isinstance(value, (int, str)) else str(value), 'id': row.pk}
+        if reverse:
+            cursor['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or self.last is None:
+            return None
+        return self.encode_cursor(self.last, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first is None:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.first, reverse=True)
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict()
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['next'] = self.get_next_link()
+        payload['previous'] = self.get_previous_link()
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer'},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
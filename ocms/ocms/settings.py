@@ -25,6 +25,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third party apps
     'rest_framework',
@@ -40,6 +41,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'ocms.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -150,6 +152,21 @@ CACHES = {
         'LOCATION': 'redis://127.0.0.1:6379/1',
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            # Fail fast when Redis is down; ocms/cache.py then serves uncached
+            'SOCKET_CONNECT_TIMEOUT': 0.5,
+            'SOCKET_TIMEOUT': 0.5,
         }
     }
-}
\ No newline at end of file
+}
+
+# Per-process L1 in front of Redis (ocms/local_cache.py): size bounds, and
+# the bus that broadcasts invalidations to other workers ('redis' pub/sub or
+# the in-process 'local' stand-in; None picks by cache backend)
+CACHE_L1_MAX_ENTRIES = 5000
+CACHE_L1_MAX_BYTES = 32 * 1024 * 1024
+CACHE_INVALIDATION_BUS = None
+
+# Request metrics (ocms/metrics.py): fraction of requests that collect
+# query/cache/serializer detail, and who may scrape /metrics (None = anyone)
+METRICS_SAMPLE_RATE = float(os.environ.get('METRICS_SAMPLE_RATE', '1.0'))
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
\ No newline at end of file
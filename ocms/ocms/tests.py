@@ -0,0 +1,112 @@
+# ocms/tests.py
+from unittest import mock
+
+from django.core.cache import cache as backend
+from django.test import SimpleTestCase, override_settings
+
+from ocms import cache
+from ocms.local_cache import MISSING, LRUCache, local
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class GetOrComputeTests(SimpleTestCase):
+    """Fills from get_or_compute never outlive a delete and release their lock only once written"""
+
+    def setUp(self):
+        backend.clear()
+
+    def test_fill_is_written_before_the_lock_is_released(self):
+        def check_lock(values, timeout):
+            self.assertIsNotNone(backend.get('lock:answer'))
+            backend.set_many(values, timeout)
+
+        with mock.patch.object(cache, 'set_many', side_effect=check_lock):
+            self.assertEqual(cache.get_or_compute('answer', lambda: 42), 42)
+        self.assertIsNone(backend.get('lock:answer'))
+        self.assertEqual(cache.get_or_compute('answer', lambda: 0), 42)
+
+    def test_delete_while_computing_drops_the_fill(self):
+        def compute():
+            cache.delete('answer')
+            return 'read before the delete'
+
+        self.assertEqual(cache.get_or_compute('answer', compute), 'read before the delete')
+        self.assertIsNone(backend.get('answer'))
+        self.assertIsNone(backend.get('lock:answer'))
+        # Later fills are not held back by the tombstone
+        self.assertEqual(cache.get_or_compute('answer', lambda: 'fresh'), 'fresh')
+        self.assertEqual(cache.get_or_compute('answer', lambda: 'recomputed'), 'fresh')
+
+    def test_delete_many_while_computing_drops_only_those_keys(self):
+        def compute(keys):
+            cache.delete_many(['a'])
+            return {key: key.upper() for key in keys}
+
+        values = cache.get_or_compute_many(['a', 'b'], compute)
+        self.assertEqual(values, {'a': 'A', 'b': 'B'})
+        self.assertIsNone(backend.get('a'))
+        self.assertEqual(backend.get('b')[0], 'B')
+
+    def test_negative_entries_are_guarded_too(self):
+        def compute():
+            cache.delete('missing')
+            return None
+
+        self.assertIsNone(cache.get_or_compute('missing', compute))
+        self.assertIsNone(backend.get('missing'))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class LocalCacheTests(SimpleTestCase):
+    """The per-process L1 serves hot keys and drops them, everywhere, on every invalidation"""
+
+    def setUp(self):
+        backend.clear()
+        local.clear()
+
+    def test_reads_are_served_locally_until_invalidated(self):
+        backend.set('hot', 'v1')
+        self.assertEqual(cache.get('hot', local_timeout=60), 'v1')
+        backend.set('hot', 'v2')
+        self.assertEqual(cache.get('hot', local_timeout=60), 'v1')
+
+        cache.delete('hot')
+        backend.set('hot', 'v3')
+        self.assertEqual(cache.get('hot', local_timeout=60), 'v3')
+
+    def test_broadcast_goes_out_after_the_backend_write(self):
+        backend.set('counter', 1)
+        cache.get('counter', local_timeout=60)
+        published = []
+
+        def publish(keys):
+            # Receivers refilling right away must not find the old value
+            published.append((keys, backend.get('counter')))
+
+        with mock.patch.object(local._bus, 'publish', side_effect=publish):
+            cache.incr('counter')
+            cache.delete_many(['counter'])
+        self.assertEqual(published, [(['counter'], 2), (['counter'], None)])
+        self.assertIs(local.get('counter'), MISSING)
+
+    def test_fill_racing_an_invalidation_is_dropped(self):
+        def compute():
+            value = 'computed'
+            cache.delete('racy')
+            return value
+
+        self.assertEqual(cache.get_or_compute('racy', compute, local_timeout=60), 'computed')
+        self.assertIs(local.get('racy'), MISSING)
+
+    def test_lru_bounds(self):
+        lru = LRUCache(max_entries=2, max_bytes=1024)
+        lru.set('a', 1, 60)
+        lru.set('b', 2, 60)
+        lru.get('a')
+        lru.set('c', 3, 60)
+        self.assertIs(lru.get('b'), MISSING)
+        self.assertEqual((lru.get('a'), lru.get('c')), (1, 3))
+        lru.set('big', 'x' * 2048, 60)
+        self.assertIs(lru.get('big'), MISSING)
@@ -19,6 +19,7 @@ from django.urls import path, include
 from django.views.generic import TemplateView
 from django.conf import settings
 from django.conf.urls.static import static
+from ocms.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -28,6 +29,9 @@ urlpatterns = [
     path('api/', include('reviews.urls')),
     path('api/', include('dashboard.urls')),
     
+    # Prometheus scrape endpoint
+    path('metrics', metrics_view, name='metrics'),
+    
     # Frontend routes
     path('', TemplateView.as_view(template_name='login.html'), name='home'),
     path('login/', TemplateView.as_view(template_name='login.html'), name='login'),
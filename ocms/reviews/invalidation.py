@@ -0,0 +1,19 @@
+# reviews/invalidation.py
+from courses.models import Course
+from ocms.invalidation import rule
+from .models import Review
+from .ratings import rating_cache_key
+
+
+@rule(Review, watch=('rating', 'course_id'))
+def review_targets(change):
+    if change.changed('rating', 'course_id'):
+        yield rating_cache_key(change.instance.course_id)
+        yield rating_cache_key(change.before('course_id'))
+
+
+@rule(Course, watch=('title',))
+def course_rating_targets(change):
+    # Rating payloads repeat the course title
+    if change.changed('title'):
+        yield rating_cache_key(change.instance.pk)
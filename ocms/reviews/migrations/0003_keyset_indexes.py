@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-17 23:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_keyset_indexes'),
+        ('reviews', '0002_course_rating'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['course', 'created_at', 'id'], name='reviews_rev_course__4f54a9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['student', 'created_at', 'id'], name='reviews_rev_student_3a3a83_idx'),
+        ),
+    ]
@@ -17,4 +17,38 @@ class Review(models.Model):
     class Meta:
         db_table = 'reviews_review'
         unique_together = ['student', 'course']  # One review per student per course
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of per-course and per-student review lists
+            models.Index(fields=['course', 'created_at', 'id']),
+            models.Index(fields=['student', 'created_at', 'id']),
+        ]
+
+class CourseRating(models.Model):
+    """
+    Per-course rating aggregates maintained incrementally by review writes
+    (see reviews/ratings.py), so rating reads never aggregate reviews_review.
+    """
+    course = models.OneToOneField('courses.Course', on_delete=models.CASCADE, primary_key=True, related_name='rating_stats')
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    stars_1 = models.PositiveIntegerField(default=0)
+    stars_2 = models.PositiveIntegerField(default=0)
+    stars_3 = models.PositiveIntegerField(default=0)
+    stars_4 = models.PositiveIntegerField(default=0)
+    stars_5 = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.course_id} - {self.average}★ ({self.rating_count})"
+    
+    @property
+    def average(self):
+        return round(self.rating_sum / self.rating_count, 2) if self.rating_count else 0
+    
+    @property
+    def histogram(self):
+        return {str(star): getattr(self, f'stars_{star}') for star in range(1, 6)}
+    
+    class Meta:
+        db_table = 'reviews_courserating'
@@ -0,0 +1,120 @@
+# reviews/ratings.py
+from django.db import transaction
+from django.db.models import Count, F, FloatField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Round
+
+from .models import CourseRating, Review
+from courses.models import Course
+from ocms import cache
+
+RATING_CACHE_TIMEOUT = 900
+# Per-worker L1 lifetime; review writes invalidate every worker immediately
+RATING_LOCAL_TIMEOUT = 60
+
+
+def rating_cache_key(course_id):
+    return f'course_rating_{course_id}'
+
+
+@transaction.atomic
+def apply_rating_change(course_id, added=None, removed=None):
+    """
+    Incrementally apply one review write to the course's rating aggregates.
+    `added`/`removed` are star values (an update passes both). The stats row is
+    locked for the duration so concurrent review writes serialize per course,
+    and the denormalized Course.average_rating/review_count move with it.
+    """
+    ratings = CourseRating.objects.select_for_update()
+    if added is None:
+        # Pure removal: the row exists unless the course itself is being deleted
+        stats = ratings.filter(course_id=course_id).first()
+        if stats is None:
+            return None
+    else:
+        stats, _ = ratings.get_or_create(course_id=course_id)
+    
+    if removed is not None:
+        stats.rating_sum -= removed
+        stats.rating_count -= 1
+        setattr(stats, f'stars_{removed}', getattr(stats, f'stars_{removed}') - 1)
+    if added is not None:
+        stats.rating_sum += added
+        stats.rating_count += 1
+        setattr(stats, f'stars_{added}', getattr(stats, f'stars_{added}') + 1)
+    stats.save()
+    
+    Course.objects.filter(pk=course_id).update(
+        average_rating=stats.average,
+        review_count=stats.rating_count
+    )
+    return stats
+
+
+@transaction.atomic
+def rebuild_course_ratings(course_ids):
+    """
+    Recompute CourseRating rows and the Course rating counters from the
+    review table for many courses, for writers that bypass signals.
+    """
+    rows = Review.objects.filter(course_id__in=course_ids).order_by().values('course_id').annotate(
+        rating_sum=Sum('rating'),
+        rating_count=Count('id'),
+        **{f'stars_{star}': Count('id', filter=Q(rating=star)) for star in range(1, 6)}
+    )
+    stats = [CourseRating(**row) for row in rows]
+    CourseRating.objects.filter(course_id__in=course_ids).delete()
+    CourseRating.objects.bulk_create(stats, batch_size=1000)
+    
+    course_stats = CourseRating.objects.filter(course_id=OuterRef('pk'))
+    average = Round(Cast('rating_sum', FloatField()) / F('rating_count'), 2)
+    Course.objects.filter(pk__in=course_ids).update(
+        review_count=Coalesce(Subquery(course_stats.values('rating_count')[:1]), Value(0)),
+        average_rating=Coalesce(
+            Subquery(course_stats.annotate(value=average).values('value')[:1]), Value(0.0),
+            output_field=FloatField()
+        ),
+    )
+
+
+def rating_summary(stats):
+    """Average, total and histogram from a CourseRating (or None for no reviews)"""
+    if stats is None:
+        stats = CourseRating()
+    return {
+        'average_rating': stats.average,
+        'total_reviews': stats.rating_count,
+        'histogram': stats.histogram
+    }
+
+
+def rating_payload(course, stats=None):
+    """Rating response body from the maintained aggregates"""
+    return {
+        'course_id': course.id,
+        'course_title': course.title,
+        **rating_summary(stats)
+    }
+
+
+def get_ratings(course_ids):
+    """
+    Rating payloads for many courses: one cache get_many, one query for the
+    misses, and one set_many to backfill. Unknown course ids are omitted
+    (and negatively cached).
+    """
+    keys = {rating_cache_key(course_id): course_id for course_id in course_ids}
+    
+    def compute(missing):
+        courses = Course.objects.filter(id__in=[keys[key] for key in missing]).select_related('rating_stats').only(
+            'id', 'title', 'rating_stats'
+        )
+        return {
+            rating_cache_key(course.id): rating_payload(course, getattr(course, 'rating_stats', None))
+            for course in courses
+        }
+    
+    cached = cache.get_or_compute_many(
+        keys, compute, timeout=RATING_CACHE_TIMEOUT, family='course_rating', local_timeout=RATING_LOCAL_TIMEOUT
+    )
+    return {keys[key]: value for key, value in cached.items()}
+
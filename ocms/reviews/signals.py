@@ -0,0 +1,28 @@
+# reviews/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from ocms import invalidation
+from .models import Review
+from .ratings import apply_rating_change
+
+# Updates need the stored rating and course to move it between buckets (and courses)
+invalidation.watch(Review, 'rating', 'course_id')
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    previous = invalidation.previous(instance, 'rating')
+    previous_course_id = invalidation.previous(instance, 'course_id')
+    if created or previous is None:
+        apply_rating_change(instance.course_id, added=instance.rating)
+    elif previous_course_id != instance.course_id:
+        apply_rating_change(previous_course_id, removed=previous)
+        apply_rating_change(instance.course_id, added=instance.rating)
+    elif previous != instance.rating:
+        apply_rating_change(instance.course_id, added=instance.rating, removed=previous)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    apply_rating_change(instance.course_id, removed=instance.rating)
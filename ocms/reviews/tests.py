@@ -1,3 +1,154 @@
-from django.test import TestCase
+# reviews/tests.py
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import User
+from courses.models import Course
+from enrollments.services import enroll_students
+from ocms import invalidation
+from ocms.local_cache import local
+from .models import CourseRating, Review
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class RatingTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor@example.com', None, full_name='Instructor', role='INSTRUCTOR')
+        cls.course = Course.objects.create(
+            title='Course', description='Course', instructor=cls.instructor, price=10, is_published=True
+        )
+        cls.students = User.objects.bulk_create(
+            User(email=f'student{index}@example.com', full_name='Student') for index in range(3)
+        )
+        enroll_students(cls.course, cls.students)
+
+    def setUp(self):
+        # Targets queued by setUpTestData, whose commit never comes
+        invalidation.flush()
+        cache.clear()
+        local.clear()
+        self.client = APIClient()
+
+    def as_student(self, index):
+        client = APIClient()
+        client.force_authenticate(self.students[index])
+        return client
+
+    def write(self, client, method, url, data=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = getattr(client, method)(url, data, format='json')
+        self.assertIn(response.status_code, (200, 201))
+        return response
+
+
+class RatingAggregateTests(RatingTestCase):
+    """Review writes keep the histogram, the course counters and the cached rating in step"""
+
+    def rating(self):
+        response = self.client.get(f'/api/courses/{self.course.id}/rating/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def assert_rating(self, average, total, histogram):
+        data = self.rating()
+        self.assertEqual(data['average_rating'], average)
+        self.assertEqual(data['total_reviews'], total)
+        self.assertEqual(data['histogram'], {str(star): histogram.get(star, 0) for star in range(1, 6)})
+        course = Course.objects.get(pk=self.course.pk)
+        self.assertEqual(float(course.average_rating), average)
+        self.assertEqual(course.review_count, total)
+
+    def test_create_update_delete(self):
+        self.assert_rating(0, 0, {})
+        url = f'/api/courses/{self.course.id}/reviews/create/'
+        first = self.write(self.as_student(0), 'post', url, {'rating': 5, 'comment': 'great'}).data['id']
+        self.write(self.as_student(1), 'post', url, {'rating': 2, 'comment': 'meh'})
+        self.assert_rating(3.5, 2, {5: 1, 2: 1})
+
+        self.write(self.as_student(0), 'put', f'/api/reviews/{first}/', {'rating': 4, 'comment': 'good'})
+        self.assert_rating(3.0, 2, {4: 1, 2: 1})
+
+        # A comment-only edit leaves the aggregates alone
+        self.write(self.as_student(0), 'put', f'/api/reviews/{first}/', {'rating': 4, 'comment': 'fine'})
+        self.assert_rating(3.0, 2, {4: 1, 2: 1})
+
+        self.write(self.as_student(0), 'delete', f'/api/reviews/{first}/')
+        self.assert_rating(2.0, 1, {2: 1})
+
+        stats = CourseRating.objects.get(course=self.course)
+        self.assertEqual((stats.rating_sum, stats.rating_count), (2, 1))
+        self.assertEqual(Review.objects.filter(course=self.course).count(), 1)
+
+    def test_warm_rating_skips_the_database(self):
+        self.rating()
+        with self.assertNumQueries(0):
+            self.rating()
+
+    def test_unknown_course(self):
+        response = self.client.get('/api/courses/999999/rating/')
+        self.assertEqual(response.status_code, 404)
+
+
+class RatingsBulkTests(RatingTestCase):
+    """Catalog cards fetch many ratings in one request, in request order"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other = Course.objects.create(
+            title='Other', description='Course', instructor=cls.instructor, price=10, is_published=True
+        )
+        Review.objects.create(student=cls.students[0], course=cls.course, rating=4, comment='ok')
+
+    def ratings(self, ids):
+        return self.client.get('/api/courses/ratings/', {'ids': ids})
+
+    def test_request_order_duplicates_and_unknown_ids(self):
+        response = self.ratings(f'{self.other.id},999999,{self.course.id},{self.other.id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([rating['course_id'] for rating in response.data], [self.other.id, self.course.id])
+        self.assertEqual(response.data[0]['total_reviews'], 0)
+        self.assertEqual(response.data[1]['average_rating'], 4.0)
+        self.assertEqual(response.data[1]['course_title'], 'Course')
+
+    def test_one_query_for_misses_then_none(self):
+        ids = f'{self.course.id},{self.other.id}'
+        with self.assertNumQueries(1):
+            self.ratings(ids)
+        with self.assertNumQueries(0):
+            self.ratings(ids)
+
+    def test_invalid_ids(self):
+        for ids in ('', 'a,b', ','.join(str(pk) for pk in range(1, 102))):
+            with self.subTest(ids=ids[:20]):
+                self.assertEqual(self.ratings(ids).status_code, 400)
+
+
+class RatingInvalidationTests(RatingTestCase):
+    """Cached rating payloads follow the review and course writes they depend on"""
+
+    def payload(self, course):
+        return self.client.get(f'/api/courses/{course.id}/rating/').data
+
+    def test_course_rename_and_review_move(self):
+        other = Course.objects.create(
+            title='Other', description='Course', instructor=self.instructor, price=10, is_published=True
+        )
+        review = Review.objects.create(student=self.students[0], course=self.course, rating=5, comment='ok')
+        self.payload(self.course)
+        self.payload(other)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.title = 'Renamed'
+            self.course.save()
+        self.assertEqual(self.payload(self.course)['course_title'], 'Renamed')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            review.course = other
+            review.save()
+        self.assertEqual(self.payload(self.course)['total_reviews'], 0)
+        self.assertEqual(self.payload(other)['total_reviews'], 1)
@@ -6,6 +6,7 @@ urlpatterns = [
     # Public endpoints
     path('courses/<int:course_id>/reviews/', views.CourseReviewListView.as_view(), name='course-reviews'),
     path('courses/<int:course_id>/rating/', views.CourseAverageRatingView.as_view(), name='course-rating'),
+    path('courses/ratings/', views.CourseRatingsBulkView.as_view(), name='course-ratings'),
     
     # Student endpoints
     path('courses/<int:course_id>/reviews/create/', views.CreateCourseReviewView.as_view(), name='create-review'),
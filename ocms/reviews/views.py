@@ -3,13 +3,14 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
-from django.db.models import Avg
-from django.core.cache import cache
+from django.db import transaction
 
 from .models import Review
 from courses.models import Course
 from enrollments.models import Enrollment
 from .serializers import ReviewSerializer, CreateReviewSerializer, CourseReviewSerializer
+from .ratings import get_ratings
+from ocms.pagination import KeysetPagination
 
 class IsStudent(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -19,6 +20,7 @@ class CourseReviewListView(generics.ListAPIView):
     """Public API to get all reviews for a course"""
     serializer_class = CourseReviewSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         course_id = self.kwargs['course_id']
@@ -28,6 +30,7 @@ class CreateCourseReviewView(APIView):
     """API for students to create a review for a course they're enrolled in"""
     permission_classes = [permissions.IsAuthenticated, IsStudent]
     
+    @transaction.atomic
     def post(self, request, course_id):
         # Check if course exists
         course = get_object_or_404(Course, id=course_id, is_published=True)
@@ -56,10 +59,6 @@ class CreateCourseReviewView(APIView):
                 comment=serializer.validated_data.get('comment', '')
             )
             
-            # Clear cache for course reviews
-            cache.delete(f'course_reviews_{course_id}')
-            cache.delete(f'course_rating_{course_id}')
-            
             return Response(
                 CourseReviewSerializer(review).data,
                 status=status.HTTP_201_CREATED
@@ -74,6 +73,7 @@ class UpdateDeleteReviewView(APIView):
     def get_object(self, review_id, user):
         return get_object_or_404(Review, id=review_id, student=user)
     
+    @transaction.atomic
     def put(self, request, review_id):
         review = self.get_object(review_id, request.user)
         
@@ -83,23 +83,15 @@ class UpdateDeleteReviewView(APIView):
             review.comment = serializer.validated_data.get('comment', '')
             review.save()
             
-            # Clear cache
-            cache.delete(f'course_reviews_{review.course_id}')
-            cache.delete(f'course_rating_{review.course_id}')
-            
             return Response(CourseReviewSerializer(review).data)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    @transaction.atomic
     def delete(self, request, review_id):
         review = self.get_object(review_id, request.user)
-        course_id = review.course_id
         review.delete()
         
-        # Clear cache
-        cache.delete(f'course_reviews_{course_id}')
-        cache.delete(f'course_rating_{course_id}')
-        
         return Response(
             {"message": "Review deleted successfully"},
             status=status.HTTP_200_OK
@@ -109,36 +101,48 @@ class MyReviewsView(generics.ListAPIView):
     """API for students to see all their reviews"""
     serializer_class = ReviewSerializer
     permission_classes = [permissions.IsAuthenticated, IsStudent]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
-        return Review.objects.filter(student=self.request.user).select_related('course')
+        return Review.objects.filter(student=self.request.user).select_related('student', 'course')
 
 class CourseAverageRatingView(APIView):
-    """Public API to get average rating for a course"""
+    """
+    Public API to get average rating and star histogram for a course
+    Served from CourseRating, which review writes keep current in-transaction
+    """
     permission_classes = [permissions.AllowAny]
     
     def get(self, request, course_id):
-        # Try to get from cache
-        cache_key = f'course_rating_{course_id}'
-        rating_data = cache.get(cache_key)
+        # Cached payload, else a single PK lookup of the maintained aggregates
+        rating_data = get_ratings([course_id]).get(course_id)
+        if rating_data is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
         
-        if not rating_data:
-            course = get_object_or_404(Course, id=course_id)
-            
-            # Calculate average rating
-            avg_rating = Review.objects.filter(course=course).aggregate(
-                average=Avg('rating'),
-                total=Count('id')
+        return Response(rating_data)
+
+class CourseRatingsBulkView(APIView):
+    """
+    Public API to get ratings for many courses at once (catalog cards)
+    ?ids=1,2,3 - resolved with one cache.get_many and one query for misses
+    """
+    permission_classes = [permissions.AllowAny]
+    max_ids = 100
+    
+    def get(self, request):
+        try:
+            course_ids = [int(value) for value in request.query_params.get('ids', '').split(',') if value.strip()]
+        except ValueError:
+            return Response(
+                {"error": "ids must be a comma-separated list of integers"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not course_ids or len(course_ids) > self.max_ids:
+            return Response(
+                {"error": f"Provide between 1 and {self.max_ids} course ids"},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            
-            rating_data = {
-                'course_id': course_id,
-                'course_title': course.title,
-                'average_rating': round(avg_rating['average'] or 0, 2),
-                'total_reviews': avg_rating['total'] or 0
-            }
-            
-            # Cache for 15 minutes
-            cache.set(cache_key, rating_data, timeout=900)
         
-        return Response(rating_data)
\ No newline at end of file
+        course_ids = list(dict.fromkeys(course_ids))  # dedupe, keep request order
+        ratings = get_ratings(course_ids)
+        return Response([ratings[course_id] for course_id in course_ids if course_id in ratings])
\ No newline at end of file